@@ -3,13 +3,29 @@ Top level API (:mod:`uv_workon`)
 ======================================================
 """
 
-from importlib.metadata import PackageNotFoundError
-from importlib.metadata import version as _version
+from time import perf_counter as _perf_counter
 
-try:  # ruff:ignore[non-empty-init-module]
-    __version__ = _version("uv-workon")
-except PackageNotFoundError:  # pragma: no cover
-    __version__ = "999"
+# start of import (used by `uv-workon --timings`)
+_import_start = _perf_counter()  # ruff:ignore[non-empty-init-module]
+
+# set on first access (see __getattr__)
+__version__: str
+
+
+def __getattr__(name: str) -> str:
+    # importing importlib.metadata is slow, so only look up version on access
+    if name != "__version__":
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+
+    from importlib.metadata import PackageNotFoundError, version
+
+    global __version__  # ruff: ignore[global-statement]
+    try:
+        __version__ = version("uv-workon")
+    except PackageNotFoundError:  # pragma: no cover
+        __version__ = "999"
+    return __version__
 
 
 __author__ = """William P. Krekelberg"""
@@ -10,9 +10,11 @@ from __future__ import annotations
 
 import itertools
 import logging
+import os
 import sys
 from collections.abc import Iterator  # ruff:ignore[typing-only-standard-library-import]
 from functools import lru_cache
+from importlib.util import find_spec
 from pathlib import Path
 from typing import TYPE_CHECKING, Annotated, Any, cast
 
@@ -20,14 +22,16 @@ import typer
 
 from .core import (
     VirtualEnvPathAndLink,
+    deduplicate_virtualenv_links,
     generate_shell_config,
     get_invalid_symlinks,
-    get_virtualenv_paths,
     is_fish_shell,
     uv_run,
 )
+from .homes import WorkonHomes
 from .kernels import complete_kernelspec_names
-from .utils import select_option
+from .output import OutputFormat, write_records
+from .utils import iter_delimited, select_options
 from .validate import (
     infer_virtualenv_name,
     infer_virtualenv_path_raise,
@@ -35,9 +39,12 @@ from .validate import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Sequence
     from typing import TypeVar
 
+    from .index import NameIndex
+    from .plan import Plan
+
     R = TypeVar("R")
 
 
@@ -48,33 +55,90 @@ logger: logging.Logger = logging.getLogger(__name__)
 
 
 # * Utils ---------------------------------------------------------------------
+def _read_input_paths(from_file: Path | None, null: bool = False) -> Iterator[Path]:
+    if from_file is None:
+        return
+
+    delimiter = "\0" if null else "\n"
+    if str(from_file) == "-":
+        yield from map(Path, iter_delimited(typer.get_text_stream("stdin"), delimiter))
+    else:
+        with from_file.open(encoding="utf-8") as f:
+            yield from map(Path, iter_delimited(f, delimiter))
+
+
 def _get_input_paths(
-    paths: list[Path] | None, parents: list[Path] | None
+    paths: list[Path] | None,
+    parents: list[Path] | None,
+    from_file: Path | None = None,
+    null: bool = False,
 ) -> Iterable[Path]:
     if paths is None:
         paths = []
     if parents is None:
         parents = []
-    return itertools.chain(paths, *[p.glob("*") for p in parents])
+    return itertools.chain(
+        paths,
+        *[p.glob("*") for p in parents],
+        _read_input_paths(from_file, null),
+    )
+
+
+def _select_virtualenv_name(homes: WorkonHomes, names: Iterable[str]) -> str | None:
+    """
+    Interactively select from ``names`` (streamed to the selector).
+
+    Returns ``None`` without opening the selector if there are no names.
+    """
+    from .selector import interactive_select
+
+    names = iter(names)
+    if (first := next(names, None)) is None:
+        return None
+    return interactive_select(
+        itertools.chain([first], names), title="venv", priority=_mru_scores(homes)
+    )
 
 
 def _select_virtualenv_path(
     venv_path: Path | None,
     venv_name: str | None,
-    workon_home: Path,
+    workon_home: WorkonHomes | Path,
     venv_patterns: list[str],
     resolve: bool = False,
 ) -> Path:
+    from . import mru
+    from .probe import Prober
+
+    homes = WorkonHomes.from_value(workon_home)
+    paths_by_name: dict[str, Path] = {}
+
+    def _discover_names() -> Iterator[str]:
+        for p in homes.iter_virtualenv_paths(prober=Prober.from_env()):
+            paths_by_name[p.name] = p
+            yield p.name
+
     if venv_path:
         path = infer_virtualenv_path_raise(
             venv_path,
             venv_patterns,
         )
     elif venv_name:
-        path = validate_is_virtualenv(workon_home / venv_name)
-
-    elif options := [p.name for p in get_virtualenv_paths(workon_home)]:
-        path = workon_home / select_option(options, title="venv")
+        path = _find_virtualenv(homes, venv_name)
+        mru.record_use(path.parent, path.name)
+
+    elif (
+        name := _select_virtualenv_name(
+            homes,
+            _virtualenv_name_index(homes).names
+            if homes.is_indexed()
+            else _discover_names(),
+        )
+    ) is not None:
+        path = paths_by_name.get(name) or _find_virtualenv(
+            homes, name, abbreviated=False
+        )
+        mru.record_use(path.parent, name)
     else:  # pragma: no cover
         typer.echo("No virtual environment found")
         raise typer.Exit(0)
@@ -88,16 +152,18 @@ def _get_venv_name_path_mapping(
     include_workon_home: bool,
     venv_names: Iterable[str] | None,
     venv_paths: Iterable[Path] | None,
-    workon_home: Path,
+    workon_home: WorkonHomes | Path,
     venv_patterns: list[str],
 ) -> dict[str, Path]:
+    homes = WorkonHomes.from_value(workon_home)
     name_mapping: dict[str, Path] = {}
     if include_workon_home:
-        name_mapping.update({p.name: p for p in get_virtualenv_paths(workon_home)})
+        name_mapping.update({p.name: p for p in homes.iter_virtualenv_paths()})
 
     if venv_names:
         name_mapping.update({
-            name: validate_is_virtualenv(workon_home / name) for name in venv_names
+            name: _find_virtualenv(homes, name, abbreviated=False)
+            for name in venv_names
         })
 
     if venv_paths:
@@ -114,20 +180,87 @@ def _confirm_action(yes: bool | None, msg: str) -> bool:
     return yes
 
 
+def _confirm_batch(yes: bool | None, msg: str, items: Sequence[str]) -> bool:
+    """Show summary of all items and confirm once."""
+    if not items:
+        return False
+    if yes is None:
+        typer.echo("\n".join(items))
+    else:
+        logger.info("%s\n%s", msg, "\n".join(items))
+    return _confirm_action(yes, msg)
+
+
+def _use_checklist() -> bool:
+    return (
+        sys.stdin.isatty()
+        and sys.stdout.isatty()
+        and find_spec("simple_term_menu") is not None
+    )
+
+
+def _select_batch(yes: bool | None, msg: str, items: Sequence[str]) -> list[int]:
+    """
+    Indices of items to act on.
+
+    Interactively (no ``--yes``/``--no``, on a terminal with ``simple-term-menu``
+    installed), shows a checklist of all items, initially all selected.
+    Otherwise, falls back to :func:`_confirm_batch` for all items at once.
+    """
+    if items and yes is None and _use_checklist():
+        return select_options(items, title=msg)
+    return list(range(len(items))) if _confirm_batch(yes, msg, items) else []
+
+
+def _execute_plan(
+    plan: Plan,
+    plan_path: Path | None,
+    dry_run: bool,
+    jobs: int | None = None,
+) -> None:
+    """Save plan to ``plan_path`` and/or execute it (see :mod:`~uv_workon.plan`)."""
+    if plan_path is not None:
+        if str(plan_path) == "-":
+            typer.echo(plan.to_json())
+        else:
+            _ = plan_path.write_text(plan.to_json() + "\n", encoding="utf-8")
+        if dry_run:
+            return
+
+    outcomes = plan.apply(jobs=jobs, dry_run=dry_run)
+    for outcome in outcomes:
+        if outcome.output is not None:
+            typer.echo(outcome.output)
+    if errors := [o for o in outcomes if o.error is not None]:
+        for outcome in errors:
+            logger.error("Failed to %s: %s", outcome.action.describe(), outcome.error)
+        raise typer.Exit(1)
+
+
 # * Callbacks -----------------------------------------------------------------
-def _callback_expand_user(x: Path) -> Path:
-    return x.expanduser()
+def _callback_workon_home(ctx: typer.Context, x: WorkonHomes) -> WorkonHomes:
+    from .timing import span
+
+    with span("callback", "workon_home"):
+        homes = WorkonHomes.from_value(x)
+        # shared with parent context, for recording history
+        ctx.meta["uv_workon.workon_home"] = homes
+        return homes
 
 
 def _callback_venv_patterns(
     ctx: typer.Context,
     venv_patterns: Any,  # NOTE: use Any to fix issue with typer>=0.26.2 and python<3.11
 ) -> list[str]:
-    use_default = cast("bool", ctx.params.get("use_default_venv_patterns"))
-    return list({*venv_patterns, *((".venv", "venv") if use_default else ())})
+    from .timing import span
+
+    with span("callback", "venv_patterns"):
+        use_default = cast("bool", ctx.params.get("use_default_venv_patterns"))
+        return list({*venv_patterns, *((".venv", "venv") if use_default else ())})
 
 
 def _callback_verbose(
+    ctx: typer.Context,
     verbose: int | None,
 ) -> int | None:
     if verbose is None:
@@ -142,21 +275,76 @@ def _callback_verbose(
     else:  # pragma: no cover
         level = logging.DEBUG
 
-    for logger_ in map(logging.getLogger, logging.root.manager.loggerDict):  # pylint: disable=no-member
-        logger_.setLevel(level)
+    from .timing import span
+
+    with span("callback", "verbose"):
+        for logger_ in map(logging.getLogger, logging.root.manager.loggerDict):  # pylint: disable=no-member
+            logger_.setLevel(level)
+
+        if level == logging.DEBUG:
+            _count_fs_operations(ctx)
     return verbose
 
 
+def _count_fs_operations(ctx: typer.Context) -> None:
+    """Count filesystem operations for rest of command, and log them at exit."""
+    from .fsops import count_fs_operations
+
+    counts = ctx.with_resource(count_fs_operations())
+    ctx.call_on_close(
+        lambda: logger.debug("Filesystem operations: %s", dict(sorted(counts.items())))
+    )
+
+
 # * Completions ---------------------------------------------------------------
 @lru_cache
-def _all_virtualenv_names(workon_home: Path) -> list[str]:
-    return [p.name for p in get_virtualenv_paths(workon_home)]
+def _virtualenv_name_index(workon_home: WorkonHomes | Path) -> NameIndex:
+    # latency critical, so use stale index and refresh in background.
+    from .probe import Prober
+
+    return WorkonHomes.from_value(workon_home).name_index(
+        Prober.from_env(), stale_ok=True
+    )
+
+
+def _find_virtualenv(homes: WorkonHomes, name: str, abbreviated: bool = True) -> Path:
+    """
+    Path of virtual environment ``name`` in first home containing it.
+
+    Homes are checked in order. If not found and ``abbreviated``, ``name`` is
+    resolved as an abbreviation using the name index.
+    """
+    if (path := homes.find(name)) is not None:
+        return path
+
+    if (
+        abbreviated
+        and (resolved := _virtualenv_name_index(homes).match(name)) is not None
+        and (path := homes.find(resolved)) is not None
+    ):
+        return path
+    return validate_is_virtualenv(homes.roots[0] / name)
+
+
+def _mru_scores(homes: WorkonHomes) -> dict[str, float]:
+    from .mru import get_scores
+
+    # names in earlier homes shadow later ones
+    return {
+        name: score
+        for root in reversed(homes.roots)
+        for name, score in get_scores(root).items()
+    }
 
 
 def _complete_virtualenv_names(ctx: typer.Context, incomplete: str) -> Iterator[str]:
-    workon_home = ctx.params.get("workon_home")
-    valid_names = _all_virtualenv_names(workon_home)
-    yield from (name for name in valid_names if name.startswith(incomplete))
+    from .mru import order_names
+
+    homes = WorkonHomes.from_value(cast("WorkonHomes", ctx.params.get("workon_home")))
+    yield from order_names(
+        _virtualenv_name_index(homes).prefix(incomplete),
+        _mru_scores(homes),
+    )
 
 
 # this is necessary because typer has a bug where any path typed is considered
@@ -167,16 +355,29 @@ def _complete_path() -> list[str]:
 
 
 # * Main app ------------------------------------------------------------------
-app_typer: typer.Typer = typer.Typer()
+class _Typer(typer.Typer):
+    """Typer app which can be profiled (see :mod:`uv_workon.profiling`)."""
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:  # pyright: ignore[reportImplicitOverride]
+        if os.environ.get("UV_WORKON_PROFILE") or os.environ.get(
+            "UV_WORKON_PROFILE_COLLAPSED"
+        ):
+            from .profiling import run_profiled
+
+            return run_profiled(super().__call__, *args, **kwargs)
+        return super().__call__(*args, **kwargs)
+
+
+app_typer: typer.Typer = _Typer()
 app_kernels: typer.Typer = typer.Typer(help="Jupyter kernel utilities")
 app_typer.add_typer(app_kernels, name="kernels")
 
 
 def version_callback(value: bool) -> None:
     """Versioning call back."""
-    from uv_workon import __version__
-
     if value:
+        from uv_workon import __version__
+
         typer.echo(f"uv-workon, version {__version__}")
         raise typer.Exit
 
@@ -193,28 +394,90 @@ def main(
         callback=version_callback,
         is_eager=True,
     ),
+    timings: Annotated[
+        bool,
+        typer.Option(
+            "--timings",
+            help="""
+            Print a breakdown of time spent in each phase (import, option
+            callbacks, discovery, validation, kernelspec loading, subprocesses,
+            symlink operations) to stderr at exit.
+            """,
+            envvar="UV_WORKON_TIMINGS",
+        ),
+    ] = False,
+    timings_file: Annotated[
+        Path | None,
+        typer.Option(
+            "--timings-file",
+            help="Write timings as JSON to this file at exit.",
+            envvar="UV_WORKON_TIMINGS_FILE",
+        ),
+    ] = None,
 ) -> None:
     """Manage uv virtual environments from central location."""
     if ctx.invoked_subcommand is None:
         typer.echo(ctx.get_help())
 
+    from .history import is_enabled as history_enabled
+
+    record = history_enabled() and ctx.invoked_subcommand != "stats"
+    if timings or timings_file or record:
+        from uv_workon import _import_start
+
+        from .timing import TIMINGS
+
+        TIMINGS.enable(origin=_import_start)
+        TIMINGS.command = ctx.invoked_subcommand
+
+        def _report() -> None:
+            if timings:
+                typer.echo(TIMINGS.report(), err=True)
+            if timings_file:
+                TIMINGS.write_json(timings_file)
+            if record and TIMINGS.command is not None:
+                from .history import Record, append_record
+
+                workon_home = ctx.meta.get("uv_workon.workon_home")
+                append_record(
+                    Record.from_timings(
+                        TIMINGS,
+                        workon_home=None if workon_home is None else str(workon_home),
+                    )
+                )
+
+        ctx.call_on_close(_report)
+
+
+@app_kernels.callback()
+def kernels(ctx: typer.Context) -> None:
+    """Jupyter kernel utilities"""
+    from .timing import TIMINGS
+
+    if TIMINGS.command is not None:
+        TIMINGS.command = f"{TIMINGS.command} {ctx.invoked_subcommand}"
+
 
 # * Options -------------------------------------------------------------------
 WORKON_HOME_CLI = Annotated[
-    Path,
+    WorkonHomes,
     typer.Option(
         "--workon-home",
         "-o",
-        help="""
+        help=f"""
         Directory containing the virtual environments and links to virtual
         environments. If not passed, uses in order, ``WORKON_HOME`` environment
-        variable, then ``~/.virtualenvs`` directory.
+        variable, then ``~/.virtualenvs`` directory. Multiple directories can be
+        separated by ``{os.pathsep}``, with earlier directories taking
+        precedence. New links are created in the first writable directory.
         """,
         envvar="WORKON_HOME",
-        callback=_callback_expand_user,
+        parser=WorkonHomes.from_value,
+        metavar="PATH",
+        callback=_callback_workon_home,
         is_eager=True,  # needed for autocompletion
         autocompletion=_complete_path,
-        default_factory=lambda: Path.home() / ".virtualenvs",
+        default_factory=lambda: WorkonHomes([Path.home() / ".virtualenvs"]),
         show_default=False,
     ),
 ]
@@ -309,6 +572,90 @@ PARENTS_CLI = Annotated[
         autocompletion=_complete_path,
     ),
 ]
+FROM_FILE_CLI = Annotated[
+    Path | None,
+    typer.Option(
+        "--from-file",
+        help="""
+        Read virtual environment paths from file, one per line. Pass ``-`` to
+        read from standard input. Paths are read lazily, so this can be used
+        with output from tools like ``fd`` or ``find`` for very large numbers
+        of paths.
+        """,
+        autocompletion=_complete_path,
+    ),
+]
+NULL_CLI = Annotated[
+    bool,
+    typer.Option(
+        "--null",
+        "-0",
+        help="""
+        Paths read with ``--from-file`` are separated by NUL characters instead
+        of newlines (e.g., output of ``find -print0``).
+        """,
+    ),
+]
+JOBS_CLI = Annotated[
+    int | None,
+    typer.Option(
+        "--jobs",
+        "-j",
+        help="""
+        Number of worker threads used for filesystem operations. Default is to
+        use the Python default for thread pools. Kernel installs run one at a
+        time unless this is passed.
+        """,
+        min=1,
+    ),
+]
+PROBE_TIMEOUT_CLI = Annotated[
+    float | None,
+    typer.Option(
+        "--probe-timeout",
+        help="""
+        Network filesystem mode. Run filesystem probes in worker threads, and
+        report targets that do not respond within this many seconds as
+        unreachable instead of blocking. Unreachable targets are remembered for
+        ``UV_WORKON_UNREACHABLE_TTL`` seconds (default 300), so that subsequent
+        commands skip them immediately. ``0`` disables probing with timeouts.
+        """,
+        envvar="UV_WORKON_PROBE_TIMEOUT",
+        min=0,
+    ),
+]
+FORMAT_CLI = Annotated[
+    OutputFormat,
+    typer.Option(
+        "--format",
+        help="""
+        Output format. ``ndjson`` writes one JSON record per line as soon as it
+        is available. ``null`` writes NUL separated names (for use with
+        ``xargs -0``).
+        """,
+    ),
+]
+UNSORTED_CLI = Annotated[
+    bool,
+    typer.Option(
+        "--unsorted/--sorted",
+        help="""
+        Pass ``--unsorted`` to write results in discovery order, without
+        buffering for sorting.
+        """,
+    ),
+]
+PLAN_CLI = Annotated[
+    Path | None,
+    typer.Option(
+        "--plan",
+        help="""
+        Write the planned actions as JSON to this file (``-`` for standard
+        output). With ``--dry-run``, nothing else is done, and the plan can be
+        executed later with ``uv-workon apply``.
+        """,
+    ),
+]
 YES_CLI = Annotated[
     bool | None,
     typer.Option(
@@ -325,7 +672,10 @@ VENV_NAME_CLI = Annotated[
     typer.Option(
         "--name",
         "-n",
-        help="Use virtual environment located at ${workon_home}/{name}.",
+        help="""
+        Use virtual environment located at ${workon_home}/{name}, in the first
+        workon home containing it. Unambiguous prefixes of names also work.
+        """,
         autocompletion=_complete_virtualenv_names,
     ),
 ]
@@ -383,6 +733,8 @@ def link_virtualenvs_to_workon_home(
     *,
     paths: PATHS_CLI = None,
     parents: PARENTS_CLI = None,
+    from_file: FROM_FILE_CLI = None,
+    null: NULL_CLI = False,
     link_names: LINK_NAMES_CLI = None,
     resolve: RESOLVE_CLI = False,
     workon_home: WORKON_HOME_CLI,
@@ -391,30 +743,59 @@ def link_virtualenvs_to_workon_home(
     dry_run: DRY_RUN_CLI = False,
     verbose: VERBOSE_CLI = None,
     yes: YES_CLI = None,
+    jobs: JOBS_CLI = None,
+    plan_path: PLAN_CLI = None,
 ) -> None:
-    """Create symlink from paths to workon_home."""
-    if not (input_paths := list(_get_input_paths(paths, parents))):
+    """
+    Create symlink from paths to workon_home.
+
+    Virtual environments reachable from multiple input paths are only linked
+    once. Existing links are listed together, and overwriting them is confirmed
+    once for all links.
+    """
+    from .plan import Action, Plan
+
+    input_paths = iter(_get_input_paths(paths, parents, from_file, null))
+    if (first_path := next(input_paths, None)) is None:
         typer.echo("Require input paths")
         sys.exit(2)
 
     logger.debug("params: %s", locals())
 
-    objs = list(
+    objs, rejected = deduplicate_virtualenv_links(
         VirtualEnvPathAndLink.from_paths_and_workon(
-            input_paths,
-            workon_home=workon_home,
+            itertools.chain([first_path], input_paths),
+            workon_home=workon_home.primary,
             venv_patterns=venv_patterns,
             names=link_names,
         )
     )
+    if rejected:
+        logger.warning(
+            "Skipping links claimed by another virtual environment:\n%s",
+            "\n".join(f"  {obj.link} <- {obj.path}" for obj in rejected),
+        )
 
-    for obj in objs:
-        if (not obj.link.exists()) or (
-            obj.link.is_symlink() and _confirm_action(yes, f"Overwrite {obj.link}")
-        ):
-            obj.create_symlink(resolve=resolve, dry_run=dry_run)
-        else:
-            logger.debug("Skipping: %s -> %s", obj.link, obj.path)
+    existing = [obj for obj in objs if obj.link.exists()]
+    selected = set(
+        _select_batch(
+            yes,
+            f"Overwrite {len(existing)} existing link(s)?",
+            [
+                f"{obj.link} -> {obj.link.readlink()} (new: {obj.path})"
+                for obj in existing
+            ],
+        )
+    )
+    if skip := {obj.link for i, obj in enumerate(existing) if i not in selected}:
+        objs = [obj for obj in objs if obj.link not in skip]
+        logger.debug("Skipping: %s", sorted(map(str, skip)))
+
+    plan = Plan(
+        [Action.for_link(obj.link, obj.symlink_target(resolve)) for obj in objs],
+        command="link",
+    )
+    _execute_plan(plan, plan_path, dry_run=dry_run, jobs=jobs)
 
 
 @app_typer.command("list")
@@ -422,13 +803,67 @@ def list_virtualenvs(
     *,
     workon_home: WORKON_HOME_CLI,
     verbose: VERBOSE_CLI = None,
+    jobs: JOBS_CLI = None,
+    probe_timeout: PROBE_TIMEOUT_CLI = None,
+    output_format: FORMAT_CLI = OutputFormat.text,
+    unsorted: UNSORTED_CLI = False,
 ) -> None:
-    """List available central virtual environments"""
-    venv_paths = get_virtualenv_paths(workon_home)
+    """
+    List available central virtual environments
+
+    Virtual environments are validated and resolved concurrently, and output
+    is streamed in sorted order as soon as available.
+    """
+    from .probe import Prober
+
     logger.debug("params: %s", locals())
 
-    for p in sorted(venv_paths, key=lambda x: x.name):
-        typer.echo(f"{p.name:25}  {p.resolve()}")
+    records = (
+        {
+            "name": p.name,
+            "path": str(p),
+            "target": None if target is None else str(target),
+            "reachable": target is not None,
+        }
+        for p, target in workon_home.iter_virtualenv_targets(
+            jobs=jobs,
+            prober=Prober.from_env(probe_timeout),
+            sort=not unsorted,
+        )
+    )
+    write_records(
+        records,
+        output_format,
+        key="name",
+        text=lambda r: f"{r['name']:25}  {r['target'] or '<unreachable>'}",
+    )
+
+
+@app_typer.command("publish")
+def publish_snapshot(
+    *,
+    workon_home: WORKON_HOME_CLI,
+    verbose: VERBOSE_CLI = None,
+    jobs: JOBS_CLI = None,
+) -> None:
+    """
+    Publish read-only snapshot of virtual environments in workon home
+
+    Intended for a shared workon home used by many users. Commands read the
+    snapshot instead of scanning the home, until links in the home change.
+    With multiple homes, the snapshot is published for the first writable
+    home. Republish after adding or removing links.
+    """
+    logger.debug("params: %s", locals())
+
+    from .snapshot import get_snapshot_path
+    from .snapshot import publish_snapshot as _publish_snapshot
+
+    home = workon_home.primary
+    snapshot = _publish_snapshot(home, jobs=jobs)
+    typer.echo(
+        f"Published {len(snapshot.venvs)} virtual environment(s) to {get_snapshot_path(home)}"
+    )
 
 
 @app_typer.command("clean")
@@ -438,15 +873,79 @@ def clean_virtualenvs(
     dry_run: DRY_RUN_CLI = False,
     verbose: VERBOSE_CLI = None,
     yes: YES_CLI = None,
+    jobs: JOBS_CLI = None,
+    probe_timeout: PROBE_TIMEOUT_CLI = None,
+    output_format: Annotated[
+        OutputFormat,
+        typer.Option(
+            "--format",
+            help="""
+            Output format for links that would be removed with ``--dry-run``.
+            ``null`` writes NUL separated link paths.
+            """,
+        ),
+    ] = OutputFormat.text,
+    plan_path: PLAN_CLI = None,
 ) -> None:
-    """Remove missing broken virtual environment symlinks."""
+    """
+    Remove missing broken virtual environment symlinks.
+
+    All symlinks are validated concurrently, and removal of all broken links
+    is confirmed once. With multiple workon homes, only the first writable
+    home is cleaned.
+    """
+    from .plan import Action, ActionKind, Plan
+    from .probe import Prober
+
     logger.debug("params: %s", locals())
 
-    for path in get_invalid_symlinks(workon_home):
-        if _confirm_action(yes, f"Remove {path} -> {path.readlink()}"):
-            logger.info("Remove symlink: %s -> %s", path, path.readlink())
-            if not dry_run:
-                path.unlink()
+    prober = Prober.from_env(probe_timeout)
+    if output_format != OutputFormat.text:
+        if not dry_run:
+            msg = "Only supported with --dry-run"
+            raise typer.BadParameter(msg, param_hint="--format")
+        write_records(
+            (
+                {"name": path.name, "link": str(path), "target": str(path.readlink())}
+                for path in get_invalid_symlinks(
+                    workon_home.primary, jobs=jobs, prober=prober
+                )
+            ),
+            output_format,
+            key="link",
+            text=str,
+        )
+        return
+
+    invalid = [
+        (path, path.readlink())
+        for path in get_invalid_symlinks(workon_home.primary, jobs=jobs, prober=prober)
+    ]
+    if prober.unreachable:
+        logger.warning(
+            "Skipping unreachable links: %s",
+            ", ".join(sorted(p.name for p in prober.unreachable)),
+        )
+    width = max((len(path.name) for path, _ in invalid), default=0)
+    invalid = [
+        invalid[i]
+        for i in _select_batch(
+            yes,
+            f"Remove {len(invalid)} broken link(s)?",
+            [f"{path.name:{width}}  -> {target}" for path, target in invalid],
+        )
+    ]
+    if not invalid:
+        return
+
+    plan = Plan(
+        [
+            Action(ActionKind.unlink, path=str(path.absolute()), previous=str(target))
+            for path, target in invalid
+        ],
+        command="clean",
+    )
+    _execute_plan(plan, plan_path, dry_run=dry_run, jobs=jobs)
 
 
 @app_typer.command(
@@ -520,6 +1019,7 @@ def link_workon_home_to_venv(
     dry_run: DRY_RUN_CLI = False,
     verbose: VERBOSE_CLI = None,
     yes: YES_CLI = None,
+    plan_path: PLAN_CLI = None,
 ) -> None:
     """
     Create symlink from virtual environment to a local ``.venv``
@@ -530,6 +1030,8 @@ def link_workon_home_to_venv(
 
     Note that this is experimental and subject to change.
     """
+    from .plan import Action, Plan
+
     if destination.exists():
         if not destination.is_symlink():
             typer.echo(f"{destination} exists and is not a virtualenv.  Exiting")
@@ -545,11 +1047,194 @@ def link_workon_home_to_venv(
         resolve=resolve,
     )
 
-    logger.info("Create symlink %s -> %s", destination, path)
+    plan = Plan(
+        [Action.for_link(destination.absolute(), str(path))], command="venv-link"
+    )
+    _execute_plan(plan, plan_path, dry_run=dry_run)
 
-    if not dry_run:
-        destination.unlink(missing_ok=True)
-        destination.symlink_to(path)
+
+def _switch(
+    link: Path,
+    path: Path | None,
+    rollback: bool,
+    resolve: bool,
+    venv_patterns: list[str],
+    dry_run: bool,
+) -> tuple[str, str | None]:
+    """Switch (or roll back) ``link``, returning new and previous targets."""
+    from . import switch
+
+    if rollback:
+        return switch.rollback(link, dry_run=dry_run), None
+    assert path is not None  # ruff: ignore[assert]
+    target = VirtualEnvPathAndLink(  # pyrefly: ignore[unexpected-keyword]
+        path=infer_virtualenv_path_raise(path, venv_patterns), link=link
+    ).symlink_target(resolve)
+    return target, switch.switch(link, target, dry_run=dry_run)
+
+
+@app_typer.command("switch")
+def switch_virtualenv(
+    *,
+    name: Annotated[
+        str,
+        typer.Argument(
+            help="Name of link in workon home.",
+            autocompletion=_complete_virtualenv_names,
+        ),
+    ],
+    path: Annotated[
+        Path | None,
+        typer.Argument(
+            help="New virtual environment (or project directory containing it).",
+            autocompletion=_complete_path,
+        ),
+    ] = None,
+    rollback: Annotated[
+        bool,
+        typer.Option("--rollback", help="Switch back to previous target."),
+    ] = False,
+    history: Annotated[
+        bool,
+        typer.Option("--history", help="Show previous targets, most recent first."),
+    ] = False,
+    resolve: RESOLVE_CLI = False,
+    workon_home: WORKON_HOME_CLI,
+    venv_patterns: VENV_PATTERNS_CLI,
+    use_default_venv_patterns: USE_DEFAULT_VENV_PATTERNS_CLI = True,
+    dry_run: DRY_RUN_CLI = False,
+    verbose: VERBOSE_CLI = None,
+) -> None:
+    """
+    Atomically switch a link to another virtual environment (blue/green).
+
+    The link is replaced with a single rename, so it never disappears, and
+    the previous target is remembered so that ``--rollback`` switches back
+    instantly. The link is in the first writable workon home.
+    """
+    from . import switch
+
+    logger.debug("params: %s", locals())
+
+    if sum((path is not None, rollback, history)) != 1:
+        msg = "Pass exactly one of PATH, --rollback, or --history"
+        raise typer.BadParameter(msg)
+
+    link = workon_home.primary / name
+    if history:
+        for target in switch.read_history(link):
+            typer.echo(target)
+        return
+
+    try:
+        target, previous = _switch(
+            link, path, rollback, resolve, venv_patterns, dry_run
+        )
+    except ValueError as e:
+        raise typer.BadParameter(str(e)) from e
+    typer.echo(f"{name} -> {target}" + (f" (was {previous})" if previous else ""))
+
+
+@app_typer.command("apply")
+def apply_plan(
+    *,
+    plan_path: Annotated[
+        Path,
+        typer.Argument(
+            help="Plan file written with ``--plan`` (``-`` for standard input).",
+        ),
+    ],
+    dry_run: DRY_RUN_CLI = False,
+    verbose: VERBOSE_CLI = None,
+    yes: YES_CLI = None,
+    jobs: JOBS_CLI = None,
+) -> None:
+    """
+    Execute a plan of actions saved with ``--plan``.
+
+    The plan may have been computed on another host. Links which changed since
+    the plan was computed are not modified, and reported as errors.
+    """
+    from .plan import Plan
+
+    text = (
+        typer.get_text_stream("stdin").read()
+        if str(plan_path) == "-"
+        else plan_path.read_text(encoding="utf-8")
+    )
+    try:
+        plan = Plan.from_json(text)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="PLAN_PATH") from e
+    if _confirm_batch(yes, f"Apply {len(plan)} action(s)?", plan.describe()):
+        _execute_plan(plan, None, dry_run=dry_run, jobs=jobs)
+
+
+@app_typer.command("watch")
+def watch_parents(
+    *,
+    parents: PARENTS_CLI = None,
+    resolve: RESOLVE_CLI = False,
+    workon_home: WORKON_HOME_CLI,
+    venv_patterns: VENV_PATTERNS_CLI,
+    use_default_venv_patterns: USE_DEFAULT_VENV_PATTERNS_CLI = True,
+    dry_run: DRY_RUN_CLI = False,
+    verbose: VERBOSE_CLI = None,
+    debounce: Annotated[
+        float,
+        typer.Option(
+            "--debounce",
+            help="Seconds without further changes before links of a project are updated.",
+        ),
+    ] = 1.0,
+    poll: Annotated[
+        float | None,
+        typer.Option(
+            "--poll",
+            help="Rescan parents every ``poll`` seconds instead of using inotify.",
+        ),
+    ] = None,
+    once: Annotated[
+        bool,
+        typer.Option("--once", help="Update links for all projects once and exit."),
+    ] = False,
+) -> None:
+    """
+    Watch parent directories and link virtual environments as they appear.
+
+    Links are created when ``pyvenv.cfg`` appears in a project under a parent
+    (matching a virtual environment pattern), and removed when it disappears.
+    Existing links to other virtual environments are never modified. Links
+    are created in the first writable workon home. Uses inotify on Linux, and
+    polling otherwise.
+    """
+    from .watch import LinkSync, get_watcher, iter_projects, watch
+
+    if not parents:
+        typer.echo("Require at least one --parent")
+        sys.exit(2)
+
+    logger.debug("params: %s", locals())
+
+    sync = LinkSync(
+        workon_home=workon_home.primary,
+        venv_patterns=venv_patterns,
+        resolve=resolve,
+        dry_run=dry_run,
+    )
+    watcher = None if once else get_watcher(parents, venv_patterns, poll=poll)
+    # initial update, after starting watcher so no changes are missed.
+    _ = sync.sync(iter_projects(parents))
+    if watcher is None:
+        return
+
+    logger.info("Watching %s", ", ".join(map(str, parents)))
+    try:
+        watch(sync, watcher, debounce=debounce)
+    except KeyboardInterrupt:  # pragma: no cover
+        pass
+    finally:
+        watcher.close()
 
 
 # ** Shell commands
@@ -617,13 +1302,59 @@ def shell_cd(
     typer.echo(str(path) if no_command else f"cd {path}")
 
 
+# ** Stats
+@app_typer.command("stats")
+def show_stats(
+    *,
+    commands: Annotated[
+        list[str] | None,
+        typer.Option(
+            "-c",
+            "--command",
+            help="Only show these commands (e.g., ``list`` or ``kernels list``).",
+        ),
+    ] = None,
+    output_format: FORMAT_CLI = OutputFormat.text,
+    clear: Annotated[
+        bool, typer.Option("--clear", help="Remove recorded history.")
+    ] = False,
+) -> None:
+    """
+    Show latency percentiles and histograms of recorded commands.
+
+    Recording is opt-in. Set ``UV_WORKON_HISTORY=1`` to record each command to
+    the cache directory.
+    """
+    from .history import clear_history, format_summary, read_records, summarize
+
+    if clear:
+        clear_history()
+        return
+
+    summaries = summarize(
+        r for r in read_records() if commands is None or r.command in commands
+    )
+    if not summaries and output_format == OutputFormat.text:
+        typer.echo("No recorded history. Set UV_WORKON_HISTORY=1 to record.", err=True)
+        return
+
+    write_records(
+        summaries,
+        output_format,
+        key="command",
+        text=format_summary,
+    )
+
+
 # ** Kernels
 @app_kernels.command("install")
-def install_ipykernels(
+def install_ipykernels(  # ruff: ignore[too-many-arguments]
     ctx: typer.Context,
     *,
     venv_names: VENV_NAMES_CLI = None,
     venv_paths: VENV_PATHS_CLI = None,
+    from_file: FROM_FILE_CLI = None,
+    null: NULL_CLI = False,
     all_venvs: Annotated[
         bool, typer.Option("--all", help="If passed, install for all environments")
     ] = False,
@@ -651,40 +1382,60 @@ def install_ipykernels(
     dry_run: DRY_RUN_CLI = False,
     verbose: VERBOSE_CLI = None,
     yes: YES_CLI = None,
+    jobs: JOBS_CLI = None,
+    plan_path: PLAN_CLI = None,
 ) -> None:
     """Install ipykernels for virtual environment(s) that contain ``ipykernel`` module."""
-    from .kernels import get_ipykernel_install_script_path, get_kernelspecs
+    from .kernels import get_kernelspecs
+    from .plan import Action, ActionKind, Plan
 
-    script = get_ipykernel_install_script_path()
     kernelspecs = get_kernelspecs()
 
-    for name, path in _get_venv_name_path_mapping(
-        all_venvs,
-        venv_names=venv_names,
-        venv_paths=venv_paths,
-        workon_home=workon_home,
-        venv_patterns=venv_patterns,
-    ).items():
-        if (name not in kernelspecs) or _confirm_action(yes, f"Reinstall {name}?"):
-            display_name = display_format.format(name=name)
-            command = uv_run(
-                path.resolve() if resolve else path,
-                "python",
-                script,
-                *(["--dry-run"] if dry_run else []),
+    actions = [
+        Action(
+            ActionKind.install_kernel,
+            path=str(path.resolve() if resolve else path.absolute()),
+            name=name,
+            args=[
                 *(["--verbose"] if verbose is not None and verbose > 0 else []),
                 "--",
                 *ctx.args,
                 "--name",
                 name,
                 "--display-name",
-                display_name,
+                display_format.format(name=name),
                 *([] if no_user else ["--user"]),
-                dry_run=dry_run,
-            )
-
-            if dry_run:
-                typer.echo(command)
+            ],
+        )
+        for name, path in _get_venv_name_path_mapping(
+            all_venvs,
+            venv_names=venv_names,
+            venv_paths=itertools.chain(
+                venv_paths or [], _read_input_paths(from_file, null)
+            ),
+            workon_home=workon_home,
+            venv_patterns=venv_patterns,
+        ).items()
+    ]
+
+    existing = [action for action in actions if action.name in kernelspecs]
+    selected = set(
+        _select_batch(
+            yes,
+            f"Reinstall {len(existing)} existing kernel(s)?",
+            [action.describe() for action in existing],
+        )
+    )
+    if skip := {a.name for i, a in enumerate(existing) if i not in selected}:
+        actions = [action for action in actions if action.name not in skip]
+        logger.debug("Skipping: %s", sorted(map(str, skip)))
+
+    _execute_plan(
+        Plan(actions, command="kernels install"),
+        plan_path,
+        dry_run=dry_run,
+        jobs=jobs,
+    )
 
 
 @app_kernels.command("remove")
@@ -700,6 +1451,8 @@ def remove_kernels(
         ),
     ] = None,
     venv_paths: VENV_PATHS_CLI = None,
+    from_file: FROM_FILE_CLI = None,
+    null: NULL_CLI = False,
     missing: Annotated[
         bool,
         typer.Option("--missing", help="Remove kernelspecs that are missing/broken."),
@@ -710,14 +1463,11 @@ def remove_kernels(
     dry_run: DRY_RUN_CLI = False,
     verbose: VERBOSE_CLI = None,
     yes: YES_CLI = None,
+    plan_path: PLAN_CLI = None,
 ) -> None:
     """Remove installed kernels"""
-    from .kernels import (
-        get_broken_kernelspecs,
-        get_kernelspecs,
-        has_jupyter_client,
-        remove_kernelspecs,
-    )
+    from .kernels import get_broken_kernelspecs, get_kernelspecs, has_jupyter_client
+    from .plan import Action, ActionKind, Plan
 
     has_jupyter_client()
 
@@ -725,7 +1475,9 @@ def remove_kernels(
         _get_venv_name_path_mapping(
             include_workon_home=False,
             venv_names=None,
-            venv_paths=venv_paths,
+            venv_paths=itertools.chain(
+                venv_paths or [], _read_input_paths(from_file, null)
+            ),
             workon_home=workon_home,
             venv_patterns=venv_patterns,
         )
@@ -736,26 +1488,56 @@ def remove_kernels(
     if missing:
         to_remove.update(set(get_broken_kernelspecs()))
 
-    to_remove = to_remove.intersection(get_kernelspecs())
-
-    to_remove_filtered = sorted(
-        name for name in to_remove if _confirm_action(yes, f"Remove {name}")
-    )
+    candidates = sorted(to_remove.intersection(get_kernelspecs()))
+    to_remove_filtered = [
+        candidates[i]
+        for i in _select_batch(yes, f"Remove {len(candidates)} kernel(s)?", candidates)
+    ]
 
     if not to_remove_filtered:
         return
 
-    if not dry_run:
-        remove_kernelspecs(to_remove_filtered)
+    plan = Plan(
+        [Action(ActionKind.remove_kernel, name=name) for name in to_remove_filtered],
+        command="kernels remove",
+    )
+    _execute_plan(plan, plan_path, dry_run=dry_run)
 
 
 @app_kernels.command("list")
-def list_kernels() -> None:
-    """List installed kernels.  Interface to jupyter kernelspec list."""
-    from .kernels import has_jupyter_client
+def list_kernels(
+    *,
+    output_format: FORMAT_CLI = OutputFormat.text,
+    unsorted: UNSORTED_CLI = False,
+) -> None:
+    """
+    List installed kernels.  Interface to jupyter kernelspec list.
+
+    With ``--format ndjson``, each kernel is written as soon as its kernelspec
+    is loaded.
+    """
+    from .kernels import has_jupyter_client, is_broken_kernelspec, iter_kernelspecs
 
     has_jupyter_client()
 
+    if output_format != OutputFormat.text:
+        write_records(
+            (
+                {
+                    "name": name,
+                    "resource_dir": data["resource_dir"],
+                    "display_name": data["spec"].get("display_name"),
+                    "argv": data["spec"]["argv"],
+                    "broken": is_broken_kernelspec(data),
+                }
+                for name, data in iter_kernelspecs(sort=not unsorted)
+            ),
+            output_format,
+            key="name",
+            text=str,
+        )
+        return
+
     from jupyter_client.kernelspecapp import ListKernelSpecs
 
     ListKernelSpecs(log_level="ERROR").start()  # ty: ignore[missing-argument]  # pyright: ignore[reportUnusedCallResult]
@@ -7,11 +7,15 @@ from __future__ import annotations
 
 import logging
 import os
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING, cast
 
 import attrs
 
+from .probe import UnreachableError
+from .timing import span, timed_iter
+from .utils import map_concurrent
 from .validate import (
     infer_virtualenv_name,
     infer_virtualenv_path,
@@ -26,6 +30,7 @@ if TYPE_CHECKING:
 
     from ._typing import PathLike, VirtualEnvPattern
     from ._typing_compat import Self
+    from .probe import Prober
 
 logger: logging.Logger = logging.getLogger(__name__)
 
@@ -38,6 +43,53 @@ def _converter_pathlike_absolute(path: PathLike) -> Path:
     return Path(path).absolute()
 
 
+#: Prefix of temporary links created by :func:`replace_symlink`. Discovery
+#: skips these, and ``clean`` removes ones left behind (older than
+#: :data:`TMP_LINK_MAX_AGE` seconds).
+TMP_LINK_PREFIX = ".uv-workon-tmp."
+TMP_LINK_MAX_AGE = 60.0
+
+
+def is_tmp_link(path: Path) -> bool:
+    """Whether ``path`` is a temporary link of :func:`replace_symlink`."""
+    return path.name.startswith(TMP_LINK_PREFIX)
+
+
+def _iter_workon_home(workon_home: Path) -> Iterator[Path]:
+    """Entries of ``workon_home``, skipping temporary links."""
+    return (path for path in workon_home.glob("*") if not is_tmp_link(path))
+
+
+def _is_recent_tmp_link(path: Path) -> bool:
+    try:
+        return time.time() - path.lstat().st_mtime < TMP_LINK_MAX_AGE
+    except FileNotFoundError:
+        # already renamed into place
+        return True
+
+
+def replace_symlink(link: Path, target: str) -> None:
+    """
+    Atomically point symlink ``link`` to ``target``.
+
+    A temporary symlink (named with :data:`TMP_LINK_PREFIX`) is created next
+    to ``link`` and renamed over it, so ``link`` always exists (pointing
+    either to the old or the new target).
+    """
+    import threading
+
+    tmp = link.with_name(
+        f"{TMP_LINK_PREFIX}{link.name}.{os.getpid()}.{threading.get_ident()}"
+    )
+    tmp.unlink(missing_ok=True)
+    tmp.symlink_to(target)
+    try:
+        _ = tmp.replace(link)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
 @attrs.define()
 class VirtualEnvPathAndLink:
     """Class to handle virtual environment with link"""
@@ -45,21 +97,27 @@ class VirtualEnvPathAndLink:
     path: Path = attrs.field(converter=_converter_pathlike)
     link: Path = attrs.field(converter=_converter_pathlike_absolute)
 
+    def symlink_target(self, resolve: bool = False) -> str:
+        """Target of symlink, either resolved or relative to the link directory."""
+        return (
+            str(self.path.resolve())
+            if resolve
+            else os.path.relpath(self.path.absolute(), self.link.parent)
+        )
+
     def create_symlink(
         self,
         resolve: bool = False,
         dry_run: bool = False,
     ) -> None:
         """Create the symlink."""
-        path = (
-            self.path.resolve()
-            if resolve
-            else os.path.relpath(self.path.absolute(), self.link.parent)
-        )
+        path = self.symlink_target(resolve)
         logger.info("Creating symlink %s -> %s", self.link, path)
         if not dry_run:
-            self.link.unlink(missing_ok=True)
-            self.link.symlink_to(path)
+            from .locks import link_lock
+
+            with link_lock(self.link), span("symlink", str(self.link)):
+                replace_symlink(self.link, path)
 
     @classmethod
     def from_paths_and_workon(
@@ -95,18 +153,133 @@ class VirtualEnvPathAndLink:
                 yield cls(path=path, link=link)  # pyrefly: ignore[unexpected-keyword]
 
 
-def get_invalid_symlinks(workon_home: Path) -> Iterator[Path]:
-    """Get iterator of paths to invalid symlinks under a given path"""  # ruff: ignore[docstring-missing-yields]
-    for path in workon_home.glob("*"):
-        if path.is_symlink() and not is_valid_virtualenv(path):
+def deduplicate_virtualenv_links(
+    objs: Iterable[VirtualEnvPathAndLink],
+) -> tuple[list[VirtualEnvPathAndLink], list[VirtualEnvPathAndLink]]:
+    """
+    Remove duplicate virtual environments and links.
+
+    Virtual environments are identified by ``(st_dev, st_ino)`` of the
+    resolved virtual environment directory, so an environment reachable from
+    several input paths (symlinked checkouts, overlapping parents, etc) is only
+    processed once. If different virtual environments map to the same link,
+    the first one wins.
+
+    Returns
+    -------
+    unique : list of VirtualEnvPathAndLink
+        Objects to process.
+    rejected : list of VirtualEnvPathAndLink
+        Objects with a link already claimed by a different virtual environment.
+    """
+    seen_inodes: set[tuple[int, int]] = set()
+    seen_links: dict[Path, VirtualEnvPathAndLink] = {}
+    unique: list[VirtualEnvPathAndLink] = []
+    rejected: list[VirtualEnvPathAndLink] = []
+    for obj in objs:
+        stat = obj.path.stat()
+        if (key := (stat.st_dev, stat.st_ino)) in seen_inodes:
+            logger.debug("Skipping duplicate: %s", obj.path)
+        elif obj.link in seen_links:
+            rejected.append(obj)
+        else:
+            seen_inodes.add(key)
+            seen_links[obj.link] = obj
+            unique.append(obj)
+    return unique, rejected
+
+
+def get_invalid_symlinks(
+    workon_home: Path,
+    jobs: int | None = None,
+    prober: Prober | None = None,
+) -> Iterator[Path]:
+    """
+    Get iterator of paths to invalid symlinks under a given path
+
+    Symlinks are validated concurrently using ``jobs`` worker threads. If
+    ``prober`` is passed, validation is subject to its timeout, and
+    unreachable symlinks are not considered invalid. Temporary links left
+    behind by :func:`replace_symlink` are invalid once older than
+    :data:`TMP_LINK_MAX_AGE` seconds.
+    """  # ruff: ignore[docstring-missing-yields]
+    paths = [path for path in workon_home.glob("*") if path.is_symlink()]
+
+    def _is_valid(path: Path) -> bool:
+        if is_tmp_link(path):
+            return _is_recent_tmp_link(path)
+        if prober is None:
+            return is_valid_virtualenv(path)
+        return prober.try_call(is_valid_virtualenv, path, True)
+
+    results = timed_iter("discovery", map_concurrent(_is_valid, paths, jobs=jobs))
+    for path, valid in zip(paths, results, strict=True):
+        if not valid:
             yield path
 
 
 def get_virtualenv_paths(
     workon_home: Path,
+    prober: Prober | None = None,
 ) -> Iterator[Path]:
-    """Get iterator of virtual environment paths under a given path."""
-    return (path for path in workon_home.glob("*") if is_valid_virtualenv(path))
+    """
+    Get iterator of virtual environment paths under a given path.
+
+    If ``prober`` is passed, validation is subject to its timeout, and
+    unreachable paths are skipped (and recorded in ``prober.unreachable``).
+    """
+    if prober is None:
+        paths = (
+            path for path in _iter_workon_home(workon_home) if is_valid_virtualenv(path)
+        )
+    else:
+        paths = (
+            path
+            for path in _iter_workon_home(workon_home)
+            if prober.try_call(is_valid_virtualenv, path, False)
+        )
+    return timed_iter("discovery", paths)
+
+
+def get_virtualenv_targets(
+    workon_home: Path,
+    jobs: int | None = None,
+    prober: Prober | None = None,
+    sort: bool = True,
+) -> Iterator[tuple[Path, Path | None]]:
+    """
+    Get iterator of virtual environment paths and resolved targets, sorted by name.
+
+    Validation and resolution of all paths run concurrently using ``jobs``
+    worker threads, and results are yielded in order as soon as they are
+    available. The resolved target is ``None`` for unreachable paths (see
+    :class:`~uv_workon.probe.Prober`). If ``sort`` is ``False``, results are
+    yielded in directory order, and each path is processed as soon as it is
+    discovered (see :func:`~uv_workon.utils.map_concurrent`).
+    """  # ruff: ignore[docstring-missing-yields]
+
+    def _resolve(path: Path) -> tuple[Path, bool, Path | None]:
+        if prober is None:
+            if not is_valid_virtualenv(path):
+                return path, False, None
+            return path, True, path.resolve()
+        try:
+            if not prober(is_valid_virtualenv, path):
+                return path, False, None
+            return path, True, prober(Path.resolve, path)
+        except UnreachableError:
+            return path, True, None
+
+    paths: Iterable[Path] = (
+        sorted(_iter_workon_home(workon_home), key=lambda x: x.name)
+        if sort
+        else _iter_workon_home(workon_home)
+    )
+    for path, valid, target in timed_iter(
+        "discovery", map_concurrent(_resolve, paths, jobs=jobs)
+    ):
+        if valid:
+            yield path, target
 
 
 def uv_run(
@@ -126,15 +299,16 @@ def uv_run(
     if not dry_run:
         import subprocess
 
-        _ = subprocess.run(
-            args,
-            check=True,
-            env={
-                **os.environ,
-                "VIRTUAL_ENV": str(venv_path),
-                "UV_PROJECT_ENVIRONMENT": str(venv_path),
-            },
-        )
+        with span("subprocess", command):
+            _ = subprocess.run(
+                args,
+                check=True,
+                env={
+                    **os.environ,
+                    "VIRTUAL_ENV": str(venv_path),
+                    "UV_PROJECT_ENVIRONMENT": str(venv_path),
+                },
+            )
     return command
 
 
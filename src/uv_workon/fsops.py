@@ -0,0 +1,119 @@
+"""
+Filesystem operation accounting (:mod:`~uv_workon.fsops`)
+=========================================================
+
+Most of the cost of discovery and validation is in ``stat``, ``readlink`` and
+``readdir`` calls made through :mod:`pathlib`. This module intercepts the
+underlying :mod:`os` primitives so that these operations can be counted (in
+tests, or with ``-vv`` on the command line) or otherwise wrapped (e.g., to
+inject latency in benchmarks).
+
+Interception patches attributes of :mod:`os`, so it applies to all threads
+while active, and is not safe to nest with other code patching :mod:`os`.
+:meth:`pathlib.Path.glob` on Python 3.13+ binds :func:`os.scandir` and
+:func:`os.lstat` at import (on a private class of :mod:`glob`), so these
+references are patched as well. Other code holding its own reference to a
+primitive is not intercepted.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from functools import wraps
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+
+    #: Hook called as ``hook(category, func, args, kwargs)``, returning ``func(*args, **kwargs)``.
+    FsHook = Callable[[str, Callable[..., Any], tuple[Any, ...], dict[str, Any]], Any]
+
+
+#: Intercepted :mod:`os` functions, by category. ``os.stat(...,
+#: follow_symlinks=False)`` is counted as ``lstat``.
+FS_OPERATIONS: dict[str, tuple[str, ...]] = {
+    "stat": ("stat",),
+    "lstat": ("lstat",),
+    "readlink": ("readlink",),
+    "readdir": ("scandir", "listdir"),
+    "symlink": ("symlink",),
+    "unlink": ("unlink",),
+    "rename": ("rename", "replace"),
+}
+
+
+def _wrap(hook: FsHook, category: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if category == "stat" and kwargs.get("follow_symlinks") is False:
+            return hook("lstat", func, args, kwargs)
+        return hook(category, func, args, kwargs)
+
+    return wrapper
+
+
+def _get_globber() -> type | None:
+    """Class used by :meth:`pathlib.Path.glob` holding its own primitives (Python 3.13+)."""
+    import glob
+
+    return getattr(glob, "_StringGlobber", None)
+
+
+@contextmanager
+def patch_fs_operations(hook: FsHook) -> Generator[None]:
+    """Route all filesystem primitives in :data:`FS_OPERATIONS` through ``hook``."""
+    originals: dict[str, Callable[..., Any]] = {}
+    globber = _get_globber()
+    globber_originals: dict[str, Any] = {}
+    try:
+        for category, names in FS_OPERATIONS.items():
+            for name in names:
+                originals[name] = func = getattr(os, name)
+                setattr(os, name, _wrap(hook, category, func))
+                if globber is not None and name in vars(globber):
+                    globber_originals[name] = vars(globber)[name]
+                    setattr(globber, name, staticmethod(_wrap(hook, category, func)))
+        yield
+    finally:
+        for name, func in originals.items():
+            setattr(os, name, func)
+        for name, value in globber_originals.items():
+            setattr(globber, name, value)
+
+
+@contextmanager
+def count_fs_operations() -> Generator[Counter[str]]:
+    """
+    Count filesystem operations by category while active.
+
+    Yields
+    ------
+    Counter
+        Number of operations by category (see :data:`FS_OPERATIONS`).
+
+    Examples
+    --------
+    >>> from pathlib import Path
+    >>> with count_fs_operations() as counts:
+    ...     _ = Path(".").exists()
+    >>> counts["stat"]
+    1
+    """
+    counts: Counter[str] = Counter()
+    lock = threading.Lock()
+
+    def hook(
+        category: str,
+        func: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> Any:
+        with lock:
+            counts[category] += 1
+        return func(*args, **kwargs)
+
+    with patch_fs_operations(hook):
+        yield counts
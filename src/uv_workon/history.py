@@ -0,0 +1,238 @@
+"""
+Command latency history (:mod:`~uv_workon.history`)
+===================================================
+
+Opt-in recording of per-invocation latency. If ``UV_WORKON_HISTORY`` is set
+(to ``1``, ``true``, ...), each command appends a compact record to
+``history.ndjson`` in the cache directory (see
+:func:`~uv_workon.utils.get_cache_dir`). Once the log exceeds
+``UV_WORKON_HISTORY_MAX_BYTES`` (default 1 MB), it is rotated to
+``history.ndjson.1``, replacing any previous rotated log, so that at most
+about twice that size is kept. Summarize the history with ``uv-workon stats``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import time
+from typing import TYPE_CHECKING, Any
+
+import attrs
+
+from .utils import get_cache_dir
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+    from .timing import Timings
+
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+HISTORY_ENV = "UV_WORKON_HISTORY"
+HISTORY_MAX_BYTES_ENV = "UV_WORKON_HISTORY_MAX_BYTES"
+DEFAULT_MAX_BYTES = 1_000_000
+
+#: Upper bounds (in seconds) of histogram buckets.
+BUCKETS: tuple[float, ...] = (
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    math.inf,
+)
+
+
+@attrs.frozen
+class Record:
+    """Single command invocation."""
+
+    command: str
+    #: Wall time in seconds, from start of import.
+    duration: float
+    #: Time of invocation (seconds since the epoch).
+    time: float = attrs.field(factory=lambda: round(time.time(), 3))
+    workon_home: str | None = None
+    #: Number of paths validated as virtual environments.
+    venvs: int = 0
+    #: ``"hit"``, ``"stale"`` (stale cache served, see
+    #: :mod:`~uv_workon.refresh`), or ``"miss"`` if a cache was consulted.
+    cache: str | None = None
+
+    @classmethod
+    def from_timings(cls, timings: Timings, workon_home: str | None = None) -> Record:
+        """Create record from (enabled) :class:`~uv_workon.timing.Timings`."""
+        summary = timings.summary()
+        counts = timings.counts
+        cache = next(
+            (
+                outcome
+                for outcome in ("miss", "stale", "hit")
+                if counts.get(f"cache_{outcome}")
+            ),
+            None,
+        )
+        return cls(
+            command=timings.command or "",
+            duration=round(timings.elapsed(), 6),
+            workon_home=workon_home,
+            venvs=int(summary.get("validate", {}).get("count", 0)),
+            cache=cache,
+        )
+
+    def to_json(self) -> str:
+        """Compact JSON representation."""
+        return json.dumps(attrs.asdict(self), separators=(",", ":"))
+
+
+def is_enabled() -> bool:
+    """Whether history recording is enabled."""
+    return os.environ.get(HISTORY_ENV, "").lower() in {"1", "true", "yes", "on"}
+
+
+def get_history_path() -> Path:
+    """Path to history log."""
+    return get_cache_dir() / "history.ndjson"
+
+
+def _rotated(path: Path) -> Path:
+    return path.with_name(f"{path.name}.1")
+
+
+def append_record(
+    record: Record, path: Path | None = None, max_bytes: int | None = None
+) -> None:
+    """
+    Append ``record`` to history log, rotating the log if it exceeds ``max_bytes``.
+
+    Errors are logged and otherwise ignored, so recording never fails a command.
+    """
+    if path is None:
+        path = get_history_path()
+    if max_bytes is None:
+        max_bytes = int(os.environ.get(HISTORY_MAX_BYTES_ENV, DEFAULT_MAX_BYTES))
+
+    try:
+        if _append_line(path, record.to_json()) > max_bytes:
+            _ = path.replace(_rotated(path))
+    except OSError as e:
+        logger.debug("Could not record history to %s: %s", path, e)
+
+
+def _append_line(path: Path, line: str) -> int:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # NOTE: single write of a short line in append mode, so concurrent
+    # commands don't interleave records.
+    with path.open("a", encoding="utf-8") as f:
+        _ = f.write(line + "\n")
+        return f.tell()
+
+
+def _parse_record(line: str) -> Record | None:
+    try:
+        return Record(**json.loads(line))
+    except (ValueError, TypeError):
+        logger.debug("Skipping malformed history record %r", line)
+        return None
+
+
+def read_records(path: Path | None = None) -> Iterator[Record]:
+    """Iterate over records, oldest first, skipping malformed lines."""  # ruff: ignore[docstring-missing-yields]
+    if path is None:
+        path = get_history_path()
+
+    for p in (_rotated(path), path):
+        try:
+            lines = p.read_text(encoding="utf-8").splitlines()
+        except OSError:
+            continue
+        yield from filter(None, map(_parse_record, lines))
+
+
+def clear_history(path: Path | None = None) -> None:
+    """Remove history logs."""
+    if path is None:
+        path = get_history_path()
+    for p in (path, _rotated(path)):
+        p.unlink(missing_ok=True)
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    index = round(q / 100 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(len(sorted_values) - 1, index))]
+
+
+def summarize(records: Iterable[Record]) -> list[dict[str, Any]]:
+    """
+    Latency percentiles (in seconds) and histogram by command.
+
+    Examples
+    --------
+    >>> out = summarize([Record("list", 0.02), Record("list", 0.2), Record("cd", 0.03)])
+    >>> [(d["command"], d["count"], d["p50"]) for d in out]
+    [('cd', 1, 0.03), ('list', 2, 0.02)]
+    >>> out[1]["histogram"][:5]
+    [0, 1, 0, 0, 1]
+    """
+    by_command: dict[str, list[Record]] = {}
+    for record in records:
+        by_command.setdefault(record.command, []).append(record)
+
+    out: list[dict[str, Any]] = []
+    for command, group in sorted(by_command.items()):
+        durations = sorted(r.duration for r in group)
+        histogram = [0] * len(BUCKETS)
+        for d in durations:
+            histogram[next(i for i, b in enumerate(BUCKETS) if d < b)] += 1
+        out.append({
+            "command": command,
+            "count": len(durations),
+            "p50": _percentile(durations, 50),
+            "p90": _percentile(durations, 90),
+            "p99": _percentile(durations, 99),
+            "max": durations[-1],
+            "venvs": max(r.venvs for r in group),
+            "cache_hits": sum(r.cache == "hit" for r in group),
+            "cache_stale": sum(r.cache == "stale" for r in group),
+            "cache_misses": sum(r.cache == "miss" for r in group),
+            "histogram": histogram,
+        })
+    return out
+
+
+def _bucket_label(index: int) -> str:
+    if math.isinf(upper := BUCKETS[index]):
+        return f">= {BUCKETS[index - 1] * 1000:g} ms"
+    return f"< {upper * 1000:g} ms"
+
+
+def format_summary(summary: dict[str, Any], width: int = 40) -> str:
+    """Text report of single command from :func:`summarize`."""
+    cache_total = sum(
+        summary[key] for key in ("cache_hits", "cache_stale", "cache_misses")
+    )
+    lines = [
+        f"{summary['command']}: n={summary['count']}"
+        + "".join(
+            f" {key}={summary[key] * 1000:.1f}ms"
+            for key in ("p50", "p90", "p99", "max")
+        )
+        + (f" cache={summary['cache_hits']}/{cache_total}" if cache_total else "")
+        + (f" stale={summary['cache_stale']}" if summary["cache_stale"] else "")
+    ]
+    peak = max(summary["histogram"])
+    lines.extend(
+        f"  {_bucket_label(i):>12} | {'#' * math.ceil(n / peak * width):<{width}} {n}"
+        for i, n in enumerate(summary["histogram"])
+        if n
+    )
+    return "\n".join(lines)
@@ -0,0 +1,176 @@
+"""
+Multiple workon homes (:mod:`~uv_workon.homes`)
+===============================================
+
+``WORKON_HOME`` (or ``--workon-home``) may be a list of directories separated
+by :data:`os.pathsep` (``:`` on unix), for example a personal home followed by
+a team-wide, read-only home on shared storage::
+
+    export WORKON_HOME=~/.virtualenvs:/shared/team/venvs
+
+The homes are merged into a single view. As with ``PATH``, a name in an
+earlier home shadows the same name in later homes. Lookups by name check homes
+in order and stop at the first match, so a slow shared home is not touched if
+a name is found locally. Each home has its own cached name index (see
+:mod:`~uv_workon.index`). New links are created in (and ``clean`` only
+modifies) the first writable home, :attr:`WorkonHomes.primary`.
+
+Homes with a current published snapshot (see :mod:`~uv_workon.snapshot`) are
+read from the snapshot instead of being scanned.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import attrs
+
+from .core import get_virtualenv_paths, get_virtualenv_targets
+from .validate import is_valid_virtualenv
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from ._typing import PathLike
+    from .index import NameIndex
+    from .probe import Prober
+    from .snapshot import Snapshot
+
+
+def _converter_roots(roots: Iterable[PathLike]) -> tuple[Path, ...]:
+    return tuple(dict.fromkeys(Path(root).expanduser() for root in roots))
+
+
+def _load_snapshot(root: Path, prober: Prober | None) -> Snapshot | None:
+    from .snapshot import load_snapshot
+
+    if prober is None:
+        return load_snapshot(root)
+    # never remember the home itself as unreachable
+    return prober.try_call(load_snapshot, root, None, remember=False)
+
+
+@attrs.frozen
+class WorkonHomes:
+    """Ordered workon home directories."""
+
+    roots: tuple[Path, ...] = attrs.field(
+        converter=_converter_roots, validator=attrs.validators.min_len(1)
+    )
+
+    @classmethod
+    def from_value(cls, value: PathLike | WorkonHomes) -> WorkonHomes:
+        """
+        Create from :data:`os.pathsep` separated string or single path.
+
+        Examples
+        --------
+        >>> WorkonHomes.from_value(os.pathsep.join(["/a", "", "/b", "/a"])).roots
+        (PosixPath('/a'), PosixPath('/b'))
+        """
+        if isinstance(value, WorkonHomes):
+            return value
+        return cls(p for p in str(value).split(os.pathsep) if p)
+
+    def __str__(self) -> str:
+        return os.pathsep.join(map(str, self.roots))
+
+    def __len__(self) -> int:
+        return len(self.roots)
+
+    @property
+    def primary(self) -> Path:
+        """First writable home (or first home, if none is writable)."""
+        return next(
+            (root for root in self.roots if os.access(root, os.W_OK)),
+            self.roots[0],
+        )
+
+    def find(self, name: str) -> Path | None:
+        """Path of virtual environment ``name`` in first home containing it."""
+        return next(
+            (path for root in self.roots if is_valid_virtualenv(path := root / name)),
+            None,
+        )
+
+    def iter_virtualenv_paths(self, prober: Prober | None = None) -> Iterator[Path]:
+        """
+        Iterate over virtual environment paths in all homes, skipping shadowed names.
+
+        Homes are discovered in order, one at a time.
+        """  # ruff: ignore[docstring-missing-yields]
+        seen: set[str] = set()
+        for root in self.roots:
+            snapshot = _load_snapshot(root, prober)
+            paths = (
+                get_virtualenv_paths(root, prober=prober)
+                if snapshot is None
+                else (path for path, _ in snapshot.iter_targets())
+            )
+            for path in paths:
+                if path.name not in seen:
+                    seen.add(path.name)
+                    yield path
+
+    def iter_virtualenv_targets(
+        self,
+        jobs: int | None = None,
+        prober: Prober | None = None,
+        sort: bool = True,
+    ) -> Iterator[tuple[Path, Path | None]]:
+        """
+        Merged :func:`~uv_workon.core.get_virtualenv_targets` of all homes.
+
+        With ``sort``, results are merged in order of name.
+        """  # ruff: ignore[docstring-missing-yields]
+
+        def _targets(root: Path) -> Iterable[tuple[Path, Path | None]]:
+            if (snapshot := _load_snapshot(root, prober)) is not None:
+                return snapshot.iter_targets()
+            return get_virtualenv_targets(root, jobs=jobs, prober=prober, sort=sort)
+
+        per_root = [
+            ((path.name, i, path, target) for path, target in _targets(root))
+            for i, root in enumerate(self.roots)
+        ]
+        merged = heapq.merge(*per_root) if sort else (x for it in per_root for x in it)
+        seen: set[str] = set()
+        for name, _, path, target in merged:
+            if name not in seen:
+                seen.add(name)
+                yield path, target
+
+    def is_indexed(self) -> bool:
+        """Whether all homes have a published snapshot or cached name index."""
+        from .index import get_index_path
+        from .snapshot import get_snapshot_path
+
+        return all(
+            get_snapshot_path(root).exists() or get_index_path(root).exists()
+            for root in self.roots
+        )
+
+    def name_index(
+        self, prober: Prober | None = None, stale_ok: bool = False
+    ) -> NameIndex:
+        """
+        Merged name index of all homes.
+
+        Uses published snapshots where available, and otherwise
+        :func:`~uv_workon.index.load_name_index` (passing ``stale_ok``).
+        """
+        from .index import NameIndex, load_name_index
+
+        def _names(root: Path) -> tuple[str, ...]:
+            if (snapshot := _load_snapshot(root, prober)) is not None:
+                return snapshot.names
+            return load_name_index(root, prober, stale_ok=stale_ok).names
+
+        if len(self.roots) == 1:
+            return NameIndex(_names(self.roots[0]))
+        return NameIndex.from_names(
+            name for root in self.roots for name in _names(root)
+        )
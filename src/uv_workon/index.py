@@ -0,0 +1,278 @@
+"""
+Name index (:mod:`~uv_workon.index`)
+====================================
+
+Sorted index of virtual environment names in ``WORKON_HOME``, for fast prefix
+queries (completion) and name resolution (``-n``) without checking each entry.
+The index is persisted in the cache directory (see
+:func:`~uv_workon.utils.get_cache_dir`) and is rebuilt when the modification
+time of ``WORKON_HOME`` changes, which happens whenever links are added,
+removed, or renamed. Loading a current index costs a single ``stat`` of
+``WORKON_HOME`` and reading the index file.
+
+Latency critical callers load with ``stale_ok=True``, which returns a stale
+index immediately and rebuilds it in the background (see
+:mod:`~uv_workon.refresh`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+from bisect import bisect_left
+from typing import TYPE_CHECKING
+
+import attrs
+
+from .timing import count, span
+from .utils import get_cache_dir
+from .validate import NoVirtualEnvError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from .probe import Prober
+
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+
+class AmbiguousNameError(NoVirtualEnvError):
+    """Error to raise if a name matches multiple virtual environments."""
+
+
+def _prefix_slice(sorted_values: tuple[str, ...], prefix: str) -> slice:
+    start = bisect_left(sorted_values, prefix)
+    # every string with ``prefix`` sorts before ``prefix`` + max code point
+    stop = bisect_left(sorted_values, prefix + "\U0010ffff", lo=start)
+    return slice(start, stop)
+
+
+@attrs.frozen
+class NameIndex:
+    """
+    Sorted array of names supporting prefix queries with :mod:`bisect`.
+
+    Examples
+    --------
+    >>> index = NameIndex.from_names(["numpy-dev", "Pandas", "numba", "pandas2"])
+    >>> index.prefix("num")
+    ['numba', 'numpy-dev']
+    >>> index.prefix("pan", ignore_case=True)
+    ['Pandas', 'pandas2']
+    >>> index.resolve("numpy")
+    'numpy-dev'
+    >>> index.resolve("PANDAS")
+    'Pandas'
+    """
+
+    #: Sorted names.
+    names: tuple[str, ...]
+    #: Sorted case folded names.
+    _folded: tuple[str, ...] = attrs.field(
+        init=False,
+        default=attrs.Factory(
+            lambda self: tuple(sorted(name.casefold() for name in self.names)),
+            takes_self=True,
+        ),
+    )
+    #: Names in order of :attr:`_folded`.
+    _folded_names: tuple[str, ...] = attrs.field(
+        init=False,
+        default=attrs.Factory(
+            lambda self: tuple(sorted(self.names, key=lambda n: (n.casefold(), n))),
+            takes_self=True,
+        ),
+    )
+
+    @classmethod
+    def from_names(cls, names: Iterable[str]) -> NameIndex:
+        """Create index from unsorted names."""
+        return cls(tuple(sorted(set(names))))
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str):
+            return False
+        i = bisect_left(self.names, name)
+        return i < len(self.names) and self.names[i] == name
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def prefix(self, prefix: str, ignore_case: bool = False) -> list[str]:
+        """Names starting with ``prefix``, sorted."""
+        if not ignore_case:
+            return list(self.names[_prefix_slice(self.names, prefix)])
+        return list(self._folded_names[_prefix_slice(self._folded, prefix.casefold())])
+
+    def match(self, name: str) -> str | None:
+        """
+        Single indexed name matching ``name``, or ``None`` if nothing matches.
+
+        In order, tries an exact match, a case-insensitive match, a unique
+        prefix, and a unique case-insensitive prefix.
+
+        Raises
+        ------
+        AmbiguousNameError
+            If ``name`` is a prefix of multiple names.
+        """
+        if name in self:
+            return name
+        for candidates in (
+            [
+                n
+                for n in self.prefix(name, ignore_case=True)
+                if n.casefold() == name.casefold()
+            ],
+            self.prefix(name),
+            self.prefix(name, ignore_case=True),
+        ):
+            if len(candidates) == 1:
+                return candidates[0]
+            if candidates:
+                msg = f"{name} is ambiguous: {', '.join(candidates)}"
+                raise AmbiguousNameError(msg)
+        return None
+
+    def resolve(self, name: str) -> str:
+        """
+        Resolve ``name`` to a single indexed name (see :meth:`match`).
+
+        Raises
+        ------
+        NoVirtualEnvError
+            If nothing matches, or (as :class:`AmbiguousNameError`) if
+            ``name`` is a prefix of multiple names.
+        """
+        if (resolved := self.match(name)) is None:
+            msg = f"No virtual environment matching {name}"
+            raise NoVirtualEnvError(msg)
+        return resolved
+
+
+def get_index_path(workon_home: Path) -> Path:
+    """Path to persisted index of ``workon_home``."""
+    digest = hashlib.sha256(str(workon_home.absolute()).encode()).hexdigest()
+    return get_cache_dir() / "index" / f"{digest[:16]}.json"
+
+
+@attrs.frozen
+class _CachedIndex:
+    index: NameIndex
+    mtime_ns: int
+    #: Time index was built (seconds since the epoch).
+    built: float
+
+
+def _read_index(path: Path, workon_home: Path) -> _CachedIndex | None:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != INDEX_VERSION
+        or data.get("workon_home") != str(workon_home.absolute())
+    ):
+        return None
+    return _CachedIndex(
+        NameIndex(tuple(data["names"])), data["mtime_ns"], data.get("built", 0.0)
+    )
+
+
+def _write_index(
+    path: Path, workon_home: Path, mtime_ns: int, index: NameIndex
+) -> None:
+    from .locks import index_lock
+
+    text = json.dumps({
+        "version": INDEX_VERSION,
+        "workon_home": str(workon_home.absolute()),
+        "mtime_ns": mtime_ns,
+        "built": time.time(),
+        "names": index.names,
+    })
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}")
+        with index_lock():
+            _ = tmp.write_text(text, encoding="utf-8")
+            _ = tmp.replace(path)
+    except OSError as e:
+        logger.debug("Could not write index %s: %s", path, e)
+
+
+def build_name_index(
+    workon_home: Path,
+    prober: Prober | None = None,
+    mtime_ns: int | None = None,
+) -> NameIndex:
+    """
+    Build and persist index of virtual environment names in ``workon_home``.
+
+    An index is not persisted if any entry was unreachable (see
+    :class:`~uv_workon.probe.Prober`), so it is rebuilt on next use.
+    ``mtime_ns`` is the modification time of ``workon_home``, if known.
+    """
+    from .core import get_virtualenv_paths
+
+    if mtime_ns is None:
+        try:
+            mtime_ns = workon_home.stat().st_mtime_ns
+        except OSError:
+            return NameIndex(())
+
+    with span("index", "build"):
+        index = NameIndex.from_names(
+            p.name for p in get_virtualenv_paths(workon_home, prober=prober)
+        )
+    if prober is None or not prober.unreachable:
+        _write_index(get_index_path(workon_home), workon_home, mtime_ns, index)
+    return index
+
+
+def load_name_index(
+    workon_home: Path,
+    prober: Prober | None = None,
+    stale_ok: bool = False,
+) -> NameIndex:
+    """
+    Load index of virtual environment names in ``workon_home``, rebuilding if stale.
+
+    With ``stale_ok`` (and background refresh enabled, see
+    :func:`~uv_workon.refresh.is_enabled`), a stale or old index is returned
+    as is, and rebuilt in the background. Otherwise, a stale index is rebuilt
+    with :func:`build_name_index`.
+    """
+    from . import refresh
+
+    try:
+        mtime_ns = workon_home.stat().st_mtime_ns
+    except OSError:
+        return NameIndex(())
+
+    with span("index", "load"):
+        cached = _read_index(get_index_path(workon_home), workon_home)
+
+    if cached is not None:
+        stale = cached.mtime_ns != mtime_ns
+        if stale_ok and refresh.is_enabled():
+            if stale or time.time() - cached.built > refresh.get_refresh_after():
+                count("cache_stale")
+                _ = refresh.schedule_refresh(workon_home)
+            else:
+                count("cache_hit")
+            return cached.index
+        if not stale:
+            count("cache_hit")
+            return cached.index
+
+    count("cache_miss")
+    return build_name_index(workon_home, prober, mtime_ns)
@@ -11,6 +11,8 @@ from importlib.util import find_spec
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from .timing import timed, timed_iter
+
 if TYPE_CHECKING:
     from typing import Any
 
@@ -32,6 +34,7 @@ def get_ipykernel_install_script_path() -> str:
 
 
 @lru_cache
+@timed("kernelspecs")
 def get_kernelspecs() -> dict[str, Any]:
     """Get all kernelspecs"""
     has_jupyter_client()
@@ -40,17 +43,46 @@ def get_kernelspecs() -> dict[str, Any]:
     return ListKernelSpecs(log_level="ERROR").kernel_spec_manager.get_all_specs()
 
 
-def get_broken_kernelspecs() -> dict[str, Any]:
-    """Get list of broken kernels"""
+def iter_kernelspecs(sort: bool = True) -> Iterator[tuple[str, dict[str, Any]]]:
+    """
+    Iterate over kernelspecs, loading each one as it is discovered.
+
+    Unlike :func:`get_kernelspecs`, this does not load all kernelspecs up
+    front. Values have the same form as :func:`get_kernelspecs`.
+    """  # ruff: ignore[docstring-missing-yields]
+    has_jupyter_client()
+    from jupyter_client.kernelspec import KernelSpecManager
+
+    def _iter() -> Iterator[tuple[str, dict[str, Any]]]:
+        manager = KernelSpecManager()
+        resource_dirs: dict[str, str] = manager.find_kernel_specs()
+        for name in sorted(resource_dirs) if sort else resource_dirs:
+            # load from already found directory (``get_kernel_spec`` searches
+            # all kernel directories again for each name)
+            try:
+                spec = manager.kernel_spec_class.from_resource_dir(resource_dirs[name])
+            except (OSError, ValueError):  # pragma: no cover
+                continue
+            yield name, {"resource_dir": resource_dirs[name], "spec": spec.to_dict()}
+
+    yield from timed_iter("kernelspecs", _iter())
+
+
+def is_broken_kernelspec(data: dict[str, Any]) -> bool:
+    """Whether kernelspec (as returned by :func:`get_kernelspecs`) is broken."""
     from shutil import which
 
-    broken: dict[str, Any] = {}
-    for name, data in get_kernelspecs().items():
-        exe: str = data["spec"]["argv"][0]
-        if Path(exe).exists() or which(exe):
-            continue
-        broken[name] = data
-    return broken
+    exe: str = data["spec"]["argv"][0]
+    return not (Path(exe).exists() or which(exe))
+
+
+def get_broken_kernelspecs() -> dict[str, Any]:
+    """Get list of broken kernels"""
+    return {
+        name: data
+        for name, data in get_kernelspecs().items()
+        if is_broken_kernelspec(data)
+    }
 
 
 def remove_kernelspecs(names: list[str]) -> None:
@@ -0,0 +1,142 @@
+"""
+Cross-process locks (:mod:`~uv_workon.locks`)
+=============================================
+
+Several ``uv-workon`` processes (e.g., parallel CI jobs, or users on a shared
+host) may modify the same ``WORKON_HOME`` at once. While replacing a link is
+atomic (see :func:`~uv_workon.core.replace_symlink`), checking a link and then
+changing it is not, so concurrent changes to the same link can race. Each link
+change holds an exclusive :func:`fcntl.flock` lock on a
+lock file for that name (see :func:`link_lock`), so changes to the same name
+are serialized while changes to different names proceed in parallel.
+
+Lock files of links are kept in ``uv-workon-locks`` in the system temporary
+directory (see :func:`get_lock_dir`), in a subdirectory keyed by the path of
+the workon home, so all users of a host sharing a workon home lock the same
+files. Lock directories and files are created readable and writable by all
+users (independent of the umask). Set ``UV_WORKON_LOCK_DIR`` to use another
+directory (e.g., on storage shared between hosts). Lock files are never
+removed (removing a lock file would race with processes waiting on it).
+
+Writes of cached name indices (which are per user) hold a short, global lock
+in the user cache directory (see :func:`index_lock`).
+
+Time spent waiting for a held lock is logged at debug level, and counted in
+:data:`~uv_workon.timing.TIMINGS`. On platforms without :mod:`fcntl`, locks
+are no-ops (on Windows).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .timing import count
+from .utils import get_cache_dir
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from contextlib import AbstractContextManager
+
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+LOCK_DIR_ENV = "UV_WORKON_LOCK_DIR"
+
+
+_FLAGS = os.O_RDWR | getattr(os, "O_NOFOLLOW", 0)
+
+
+def _make_shared_dirs(path: Path) -> None:
+    """Create directory ``path`` and missing parents, writable by all users."""
+    if path.is_dir():
+        return
+    _make_shared_dirs(path.parent)
+    try:
+        path.mkdir()
+    except FileExistsError:
+        return
+    # sticky, so users cannot remove lock files of others
+    path.chmod(0o1777)
+
+
+def _open_lock_file(path: Path, shared: bool) -> int:
+    # shared lock files are created exclusively below, to set their mode
+    try:
+        return os.open(path, _FLAGS if shared else _FLAGS | os.O_CREAT, 0o666)
+    except FileNotFoundError:
+        pass
+    if not shared:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return os.open(path, _FLAGS | os.O_CREAT, 0o666)
+
+    _make_shared_dirs(path.parent)
+    try:
+        fd = os.open(path, _FLAGS | os.O_CREAT | os.O_EXCL, 0o666)
+    except FileExistsError:
+        return os.open(path, _FLAGS)
+    # not restricted by umask, so other users can open it
+    os.fchmod(fd, 0o666)
+    return fd
+
+
+@contextmanager
+def file_lock(path: Path, shared: bool = False) -> Generator[None]:
+    """
+    Hold exclusive lock on ``path`` (created if needed) while active.
+
+    Waits for the lock if it is held by another process. With ``shared``,
+    the lock file (and its directories) are created accessible to all users.
+    """
+    if sys.platform == "win32":  # pragma: no cover
+        yield
+        return
+
+    import fcntl
+
+    fd = _open_lock_file(path, shared)
+    try:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            start = time.perf_counter()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            waited = time.perf_counter() - start
+            count("lock_contended")
+            count("lock_wait_us", round(waited * 1e6))
+            logger.debug("Waited %.3f s for lock %s", waited, path)
+        yield
+    finally:
+        os.close(fd)
+
+
+def get_lock_dir() -> Path:
+    """Directory of lock files of links (``UV_WORKON_LOCK_DIR``, or shared default)."""
+    if path := os.environ.get(LOCK_DIR_ENV):
+        return Path(path).expanduser()
+    import tempfile
+
+    return Path(tempfile.gettempdir()) / "uv-workon-locks"
+
+
+def get_link_lock_path(link: Path) -> Path:
+    """Path to lock file for ``link`` (by workon home and name)."""
+    import hashlib
+
+    digest = hashlib.sha256(str(link.parent.absolute()).encode()).hexdigest()
+    return get_lock_dir() / digest[:16] / f"{link.name}.lock"
+
+
+def link_lock(link: Path) -> AbstractContextManager[None]:
+    """Lock for changes to ``link`` (shared by all users)."""
+    return file_lock(get_link_lock_path(link), shared=True)
+
+
+def index_lock() -> AbstractContextManager[None]:
+    """Global lock for writing cached name indices."""
+    return file_lock(get_cache_dir() / "index" / "index.lock")
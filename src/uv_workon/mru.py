@@ -0,0 +1,200 @@
+"""
+Most recently used virtual environments (:mod:`~uv_workon.mru`)
+===============================================================
+
+Commands which resolve a virtual environment by name (``activate``, ``cd``,
+``run`` and ``venv-link``) append a line to ``mru.log`` in the cache directory
+(see :func:`~uv_workon.utils.get_cache_dir`). This is a single short append,
+so it adds no measurable latency. Once the log exceeds
+``UV_WORKON_MRU_MAX_BYTES`` (default 64 kB), it is compacted to one line per
+virtual environment, holding the time of last use and the number of uses.
+Appends and compaction hold a lock (``mru.log.lock``), so that uses recorded
+by concurrent processes are not lost while the log is rewritten.
+
+Completion candidates and interactive selection are ordered by
+:func:`frecency`, combining recency and frequency of use. Set
+``UV_WORKON_MRU=0`` to disable recording.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from typing import TYPE_CHECKING
+
+import attrs
+
+from .locks import file_lock
+from .utils import get_cache_dir
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from contextlib import AbstractContextManager
+    from pathlib import Path
+
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+MRU_ENV = "UV_WORKON_MRU"
+MRU_MAX_BYTES_ENV = "UV_WORKON_MRU_MAX_BYTES"
+DEFAULT_MAX_BYTES = 64_000
+
+#: Weight of uses by age in seconds (first matching bound).
+_AGE_WEIGHTS: tuple[tuple[float, float], ...] = (
+    (3600.0, 4.0),
+    (86400.0, 2.0),
+    (7 * 86400.0, 1.0),
+)
+_OLD_WEIGHT = 0.25
+
+
+@attrs.frozen
+class Usage:
+    """Usage of a virtual environment."""
+
+    #: Time of last use (seconds since the epoch).
+    last: float
+    count: int = 1
+
+
+def is_enabled() -> bool:
+    """Whether recording is enabled."""
+    return os.environ.get(MRU_ENV, "1").lower() not in {"0", "false", "no", "off"}
+
+
+def get_mru_path() -> Path:
+    """Path to usage log."""
+    return get_cache_dir() / "mru.log"
+
+
+def _lock(path: Path) -> AbstractContextManager[None]:
+    return file_lock(path.with_name(f"{path.name}.lock"))
+
+
+def _key(workon_home: Path | str, name: str) -> str:
+    return f"{workon_home}\t{name}"
+
+
+def record_use(
+    workon_home: Path,
+    name: str,
+    path: Path | None = None,
+    max_bytes: int | None = None,
+) -> None:
+    """
+    Append use of ``name`` in ``workon_home`` to the log, compacting the log if needed.
+
+    Errors are logged and otherwise ignored.
+    """
+    if not is_enabled():
+        return
+    if path is None:
+        path = get_mru_path()
+    if max_bytes is None:
+        max_bytes = int(os.environ.get(MRU_MAX_BYTES_ENV, DEFAULT_MAX_BYTES))
+
+    line = f"{time.time():.0f}\t{_key(workon_home.absolute(), name)}\t1\n"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _lock(path):
+            if _append(path, line) > max_bytes:
+                _compact(path)
+    except OSError as e:
+        logger.debug("Could not record use to %s: %s", path, e)
+
+
+def _append(path: Path, line: str) -> int:
+    with path.open("a", encoding="utf-8") as f:
+        _ = f.write(line)
+        return f.tell()
+
+
+def _parse(lines: Iterable[str]) -> dict[str, Usage]:
+    usage: dict[str, Usage] = {}
+    for line in lines:
+        try:
+            last, workon_home, name, count = line.split("\t")
+            new = Usage(float(last), int(count))
+        except ValueError:
+            continue
+        key = _key(workon_home, name)
+        if (old := usage.get(key)) is not None:
+            new = Usage(max(old.last, new.last), old.count + new.count)
+        usage[key] = new
+    return usage
+
+
+def read_usage(path: Path | None = None) -> dict[str, Usage]:
+    """Usage keyed by tab separated workon home and name, skipping malformed lines."""
+    if path is None:
+        path = get_mru_path()
+    try:
+        text = path.read_text(encoding="utf-8")
+    except OSError:
+        return {}
+    return _parse(text.splitlines())
+
+
+def compact(path: Path | None = None) -> None:
+    """
+    Rewrite log with a single line per virtual environment.
+
+    Holds the lock used by :func:`record_use`, and atomically replaces the log.
+    """
+    if path is None:
+        path = get_mru_path()
+    with _lock(path):
+        _compact(path)
+
+
+def _compact(path: Path) -> None:
+    usage = read_usage(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    _ = tmp.write_text(
+        "".join(
+            f"{u.last:.0f}\t{key}\t{u.count}\n"
+            for key, u in sorted(usage.items(), key=lambda x: x[1].last)
+        ),
+        encoding="utf-8",
+    )
+    _ = tmp.replace(path)
+
+
+def frecency(usage: Usage, now: float | None = None) -> float:
+    """
+    Score combining number of uses and time since last use.
+
+    Examples
+    --------
+    >>> frecency(Usage(last=0, count=3), now=60)
+    12.0
+    >>> frecency(Usage(last=0, count=3), now=30 * 86400)
+    0.75
+    """
+    age = (time.time() if now is None else now) - usage.last
+    weight = next((w for bound, w in _AGE_WEIGHTS if age < bound), _OLD_WEIGHT)
+    return usage.count * weight
+
+
+def get_scores(workon_home: Path, path: Path | None = None) -> dict[str, float]:
+    """Frecency of used virtual environment names in ``workon_home``."""
+    prefix = _key(workon_home.absolute(), "")
+    now = time.time()
+    return {
+        key[len(prefix) :]: frecency(usage, now)
+        for key, usage in read_usage(path).items()
+        if key.startswith(prefix)
+    }
+
+
+def order_names(names: Iterable[str], scores: dict[str, float]) -> list[str]:
+    """
+    Order ``names`` by descending score, keeping order of names without a score.
+
+    Examples
+    --------
+    >>> order_names(["a", "b", "c", "d"], {"c": 1.0, "d": 2.0})
+    ['d', 'c', 'a', 'b']
+    """
+    return sorted(names, key=lambda name: -scores.get(name, 0.0))
@@ -0,0 +1,65 @@
+"""
+Output formatting (:mod:`~uv_workon.output`)
+============================================
+"""
+
+from __future__ import annotations
+
+import json
+from enum import Enum
+from typing import TYPE_CHECKING
+
+import typer
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from typing import Any
+
+
+class OutputFormat(str, Enum):
+    """Output formats."""
+
+    #: Human readable text.
+    text = "text"
+    #: Single JSON array.
+    json = "json"
+    #: Newline delimited JSON, one record per line.
+    ndjson = "ndjson"
+    #: NUL delimited values of a single field (for ``xargs -0``).
+    null = "null"
+
+
+def write_records(
+    records: Iterable[dict[str, Any]],
+    fmt: OutputFormat,
+    key: str,
+    text: Callable[[dict[str, Any]], str],
+) -> None:
+    """
+    Write records in format ``fmt``.
+
+    Records are written as soon as they are available, except for ``json``
+    output which must collect all records first.
+
+    Parameters
+    ----------
+    records : iterable of dict
+        Records to write.
+    fmt : OutputFormat
+        Output format.
+    key : str
+        Field written for ``null`` output.
+    text : callable
+        Function converting a record to a line of ``text`` output.
+    """
+    if fmt == OutputFormat.json:
+        typer.echo(json.dumps(list(records), indent=2))
+        return
+
+    for record in records:
+        if fmt == OutputFormat.ndjson:
+            typer.echo(json.dumps(record))
+        elif fmt == OutputFormat.null:
+            typer.echo(f"{record[key]}\0", nl=False)
+        else:
+            typer.echo(text(record))
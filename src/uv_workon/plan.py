@@ -0,0 +1,343 @@
+"""
+Plans of batch operations (:mod:`~uv_workon.plan`)
+===================================================
+
+Batch commands (``link``, ``clean``, ``venv-link``, ``kernels install`` and
+``kernels remove``) first compute the complete list of intended
+:class:`Action` objects as a :class:`Plan`, which is then printed, saved as
+JSON, and/or executed as a batch. Plans only contain plain paths and names,
+so they can be computed on one host and applied later (``uv-workon apply``).
+Paths in plans are absolute, so applying a plan does not depend on the current
+directory. Actions check at execution that links are still in the state they were in when
+the plan was computed, and are otherwise skipped with an error. The check and
+the change hold a per-link lock (see :mod:`~uv_workon.locks`), so concurrent
+processes cannot change the link in between.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import platform
+import subprocess
+from contextlib import nullcontext
+from datetime import datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import attrs
+
+from .core import replace_symlink, uv_run
+from .locks import link_lock
+from .timing import span
+from .utils import map_concurrent
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from contextlib import AbstractContextManager
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+PLAN_VERSION = 1
+
+
+class PlanConflictError(RuntimeError):
+    """Raised if state changed since a plan was computed."""
+
+
+def _to_tuple(value: Iterable[str]) -> tuple[str, ...]:
+    return tuple(value)
+
+
+def _require(value: str | None, field: str, action: Action) -> str:
+    if value is None:
+        msg = f"{action.kind.value} action requires {field!r}"
+        raise ValueError(msg)
+    return value
+
+
+class ActionKind(str, Enum):
+    """Kind of :class:`Action`."""
+
+    create_link = "create_link"
+    replace_link = "replace_link"
+    unlink = "unlink"
+    install_kernel = "install_kernel"
+    remove_kernel = "remove_kernel"
+
+
+@attrs.frozen
+class Action:
+    """Single intended operation."""
+
+    kind: ActionKind = attrs.field(converter=ActionKind)
+    #: Link path (link actions), or virtual environment path (``install_kernel``).
+    path: str | None = None
+    #: New link target.
+    target: str | None = None
+    #: Link target when the plan was computed (``replace_link`` and ``unlink``).
+    previous: str | None = None
+    #: Kernel name.
+    name: str | None = None
+    #: Arguments to ipykernel install script (``install_kernel``).
+    args: tuple[str, ...] = attrs.field(default=(), converter=_to_tuple)
+
+    def __attrs_post_init__(self) -> None:
+        for field in _REQUIRED_FIELDS[self.kind]:
+            _ = _require(getattr(self, field), field, self)
+
+    @classmethod
+    def for_link(cls, link: Path, target: str) -> Action:
+        """Action to create (or replace existing) ``link`` pointing to ``target``."""
+        path = str(link.absolute())
+        if link.is_symlink():
+            return cls(
+                ActionKind.replace_link,
+                path=path,
+                target=target,
+                previous=str(link.readlink()),
+            )
+        return cls(ActionKind.create_link, path=path, target=target)
+
+    def describe(self) -> str:
+        """
+        Short description.
+
+        Examples
+        --------
+        >>> Action("replace_link", path="a", target="b", previous="c").describe()
+        'replace link a -> b (was c)'
+        """
+        if self.kind == ActionKind.create_link:
+            return f"create link {self.path} -> {self.target}"
+        if self.kind == ActionKind.replace_link:
+            return f"replace link {self.path} -> {self.target} (was {self.previous})"
+        if self.kind == ActionKind.unlink:
+            return f"remove link {self.path} -> {self.previous}"
+        if self.kind == ActionKind.install_kernel:
+            return f"install kernel {self.name} ({self.path})"
+        return f"remove kernel {self.name}"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary, excluding unset fields."""
+        return {
+            "kind": self.kind.value,
+            **attrs.asdict(
+                self,
+                filter=lambda a, v: a.name != "kind" and v is not None and v != (),  # pyright: ignore[reportUnknownLambdaType]
+                value_serializer=lambda _, __, v: (
+                    list(v) if isinstance(v, tuple) else v
+                ),  # pyright: ignore[reportUnknownLambdaType, reportUnknownArgumentType]
+            ),
+        }
+
+
+#: Fields which must be set, by kind of action.
+_REQUIRED_FIELDS: dict[ActionKind, tuple[str, ...]] = {
+    ActionKind.create_link: ("path", "target"),
+    ActionKind.replace_link: ("path", "target", "previous"),
+    ActionKind.unlink: ("path", "previous"),
+    ActionKind.install_kernel: ("path", "name"),
+    ActionKind.remove_kernel: ("name",),
+}
+
+
+@attrs.frozen
+class Outcome:
+    """Result of executing an :class:`Action`."""
+
+    action: Action
+    #: Output to show (e.g., command for dry run).
+    output: str | None = None
+    error: Exception | None = None
+
+
+@attrs.define
+class Plan:
+    """List of actions to execute as a batch."""
+
+    actions: list[Action] = attrs.field(factory=list)
+    #: Command which created the plan.
+    command: str | None = None
+    host: str = attrs.field(factory=platform.node)
+    created: str = attrs.field(
+        factory=lambda: datetime.now(timezone.utc).isoformat(timespec="seconds")
+    )
+
+    def __len__(self) -> int:
+        return len(self.actions)
+
+    def __iter__(self) -> Iterator[Action]:
+        return iter(self.actions)
+
+    def filter(self, func: Callable[[Action], bool]) -> Plan:
+        """New plan with actions for which ``func`` is true."""
+        return attrs.evolve(self, actions=[a for a in self.actions if func(a)])
+
+    def describe(self) -> list[str]:
+        """Description of each action."""
+        return [action.describe() for action in self.actions]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary (for JSON output)."""
+        return {
+            "version": PLAN_VERSION,
+            "command": self.command,
+            "host": self.host,
+            "created": self.created,
+            "actions": [action.to_dict() for action in self.actions],
+        }
+
+    def to_json(self) -> str:
+        """JSON representation."""
+        return json.dumps(self.to_dict(), indent=2)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Plan:
+        """
+        Create from :meth:`to_dict` output.
+
+        Raises
+        ------
+        ValueError
+            If ``data`` is not a valid plan.
+        """
+        if (version := data.get("version")) != PLAN_VERSION:
+            msg = f"Unsupported plan version {version}"
+            raise ValueError(msg)
+        if not isinstance(actions := data.get("actions"), list):
+            msg = "Plan requires a list of actions"
+            raise ValueError(msg)  # ruff: ignore[type-check-without-type-error]
+
+        def _action(index: int, item: Any) -> Action:
+            try:
+                return Action(**item)
+            except (TypeError, ValueError) as e:
+                msg = f"Invalid action {index}: {e}"
+                raise ValueError(msg) from e
+
+        return cls(
+            actions=list(itertools.starmap(_action, enumerate(actions))),
+            command=data.get("command"),
+            host=data.get("host", ""),
+            created=data.get("created", ""),
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> Plan:
+        """Create from :meth:`to_json` output (see :meth:`from_dict`)."""
+        if not isinstance(data := json.loads(text), dict):
+            msg = "Plan must be a JSON object"
+            raise ValueError(msg)  # ruff: ignore[type-check-without-type-error]
+        return cls.from_dict(data)
+
+    def apply(self, jobs: int | None = None, dry_run: bool = False) -> list[Outcome]:
+        """
+        Execute all actions.
+
+        Link actions run concurrently using ``jobs`` worker threads. Kernel
+        install actions (which run subprocesses) run one at a time, unless
+        ``jobs`` is passed. Kernel removals run as a single batch. Errors are
+        collected in the returned outcomes (in order of :attr:`actions`) rather
+        than raised.
+        """
+        outcomes: dict[int, Outcome] = {}
+        for kinds, jobs_ in (
+            (_LINK_KINDS, jobs),
+            ({ActionKind.install_kernel}, 1 if jobs is None else jobs),
+        ):
+            outcomes.update({
+                id(outcome.action): outcome
+                for outcome in map_concurrent(
+                    lambda action: _apply_action(action, dry_run),
+                    (a for a in self.actions if a.kind in kinds),
+                    jobs=jobs_,
+                )
+            })
+        removals = [a for a in self.actions if a.kind == ActionKind.remove_kernel]
+        if removals:
+            outcomes.update({
+                id(o.action): o for o in _remove_kernels(removals, dry_run)
+            })
+        return [outcomes[id(action)] for action in self.actions]
+
+
+_LINK_KINDS = {ActionKind.create_link, ActionKind.replace_link, ActionKind.unlink}
+
+
+def _readlink(path: Path) -> str | None:
+    try:
+        return str(path.readlink())
+    except FileNotFoundError:
+        return None
+
+
+def _check_link(link: Path, action: Action) -> None:
+    current = _readlink(link)
+    if current is None and action.kind == ActionKind.unlink:
+        msg = f"{action.path} no longer exists"
+        raise PlanConflictError(msg)
+    if current is not None and current not in {action.previous, action.target}:
+        msg = f"{action.path} changed since plan was computed (now -> {current})"
+        raise PlanConflictError(msg)
+
+
+def _apply_action(action: Action, dry_run: bool) -> Outcome:
+    try:
+        return Outcome(action, output=_apply(action, dry_run))
+    except (OSError, subprocess.CalledProcessError, PlanConflictError) as e:
+        return Outcome(action, error=e)
+
+
+def _link_lock(link: Path, dry_run: bool) -> AbstractContextManager[None]:
+    """Lock ``link`` against concurrent changes (see :mod:`~uv_workon.locks`)."""
+    return nullcontext() if dry_run else link_lock(link)
+
+
+def _apply(action: Action, dry_run: bool) -> str | None:
+    link = Path(_require(action.path, "path", action))
+    if action.kind == ActionKind.unlink:
+        with _link_lock(link, dry_run):
+            _check_link(link, action)
+            logger.info("Remove symlink: %s -> %s", link, action.previous)
+            if not dry_run:
+                link.unlink(missing_ok=True)
+        return None
+
+    if action.kind == ActionKind.install_kernel:
+        from .kernels import get_ipykernel_install_script_path
+
+        command = uv_run(
+            link,
+            "python",
+            get_ipykernel_install_script_path(),
+            *(["--dry-run"] if dry_run else []),
+            *action.args,
+            dry_run=dry_run,
+        )
+        return command if dry_run else None
+
+    # create_link or replace_link
+    with _link_lock(link, dry_run):
+        _check_link(link, action)
+        logger.info("Creating symlink %s -> %s", link, action.target)
+        if not dry_run:
+            with span("symlink", action.path):
+                replace_symlink(link, _require(action.target, "target", action))
+    return None
+
+
+def _remove_kernels(actions: list[Action], dry_run: bool) -> list[Outcome]:
+    from . import kernels
+
+    names = sorted(a.name for a in actions if a.name is not None)
+    logger.info("Remove kernels: %s", ", ".join(names))
+    if dry_run:
+        return [Outcome(a) for a in actions]
+    try:
+        kernels.remove_kernelspecs(names)
+    except Exception as e:  # ruff: ignore[blind-except]  # pylint: disable=broad-exception-caught
+        return [Outcome(a, error=e) for a in actions]
+    return [Outcome(a) for a in actions]
@@ -0,0 +1,196 @@
+"""
+Filesystem probes with timeouts (:mod:`~uv_workon.probe`)
+=========================================================
+
+Support for virtual environments on network filesystems (NFS, autofs, etc).
+A stale mount can make a simple ``stat`` block indefinitely. With a
+:class:`Prober` having a ``timeout``, each probe runs in a daemon worker
+thread, and targets that do not respond in time are reported as unreachable.
+Unreachable targets are remembered (negative caching) for ``ttl`` seconds, so
+that subsequent commands skip them immediately. Workon homes themselves are
+never remembered as unreachable (see ``remember`` of :meth:`Prober.__call__`).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import TYPE_CHECKING, TypeVar
+
+import attrs
+
+from .utils import get_cache_dir
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from ._typing_compat import Self
+
+R = TypeVar("R")
+T = TypeVar("T")
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300.0
+
+
+def _float_from_env(name: str, default: T) -> float | T:
+    if not (value := os.environ.get(name)):
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning("Ignoring %s=%s (expected a number)", name, value)
+        return default
+
+
+class UnreachableError(TimeoutError):
+    """Error raised if a filesystem probe does not complete in time."""
+
+
+def _call_with_timeout(func: Callable[[Path], R], path: Path, timeout: float) -> R:
+    future: Future[R] = Future()
+
+    def target() -> None:
+        try:
+            future.set_result(func(path))
+        except BaseException as error:  # ruff: ignore[blind-except]  # pylint: disable=broad-exception-caught
+            future.set_exception(error)
+
+    # daemon thread, so a hung probe does not block interpreter exit.
+    threading.Thread(target=target, daemon=True).start()
+    try:
+        return future.result(timeout)
+    except FutureTimeoutError:
+        msg = f"{path} did not respond within {timeout} seconds"
+        raise UnreachableError(msg) from None
+
+
+@attrs.define
+class Prober:
+    """
+    Run filesystem probes with optional timeout and negative caching.
+
+    If ``timeout`` is ``None`` (the default) or not positive, probes are
+    called directly with no overhead.
+
+    Parameters
+    ----------
+    timeout : float, optional
+        Seconds to wait for each probe.
+    ttl : float
+        Seconds to remember unreachable paths.
+    cache_path : Path, optional
+        File to persist unreachable paths to. If ``None``, unreachable paths
+        are only remembered by this object.
+    """
+
+    timeout: float | None = None
+    ttl: float = DEFAULT_TTL
+    cache_path: Path | None = None
+    #: Paths found to be unreachable by this object.
+    unreachable: list[Path] = attrs.field(factory=list, init=False)
+    _cache: dict[str, float] | None = attrs.field(default=None, init=False)
+    _lock: threading.Lock = attrs.field(factory=threading.Lock, init=False)
+
+    @classmethod
+    def from_env(cls, timeout: float | None = None) -> Self:
+        """
+        Create object from environment variables.
+
+        ``timeout`` defaults to ``UV_WORKON_PROBE_TIMEOUT`` and ``ttl`` to
+        ``UV_WORKON_UNREACHABLE_TTL``. Invalid values are ignored (with a
+        warning). Unreachable paths are persisted in the user cache directory.
+        """
+        if timeout is None:
+            timeout = _float_from_env("UV_WORKON_PROBE_TIMEOUT", None)
+        return cls(
+            timeout=timeout,
+            ttl=_float_from_env("UV_WORKON_UNREACHABLE_TTL", DEFAULT_TTL),
+            cache_path=get_cache_dir() / "unreachable.json",
+        )
+
+    def _load_cache(self) -> dict[str, float]:
+        if self._cache is None:
+            cache: dict[str, float] = {}
+            if self.cache_path is not None and self.cache_path.exists():
+                try:
+                    cache = json.loads(self.cache_path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):  # pragma: no cover
+                    logger.debug("Could not read %s", self.cache_path)
+            now = time.time()
+            self._cache = {k: v for k, v in cache.items() if v > now}
+        return self._cache
+
+    def _save_cache(self, cache: dict[str, float]) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}")
+            _ = tmp.write_text(json.dumps(cache), encoding="utf-8")
+            _ = tmp.replace(self.cache_path)
+        except OSError:  # pragma: no cover
+            logger.debug("Could not write %s", self.cache_path)
+
+    def _mark_unreachable(self, path: Path, key: str, persist: bool) -> None:
+        with self._lock:
+            self.unreachable.append(path)
+            if persist:
+                cache = self._load_cache()
+                cache[key] = time.time() + self.ttl
+                self._save_cache(cache)
+
+    def __call__(
+        self, func: Callable[[Path], R], path: Path, remember: bool = True
+    ) -> R:
+        """
+        Call ``func(path)`` subject to timeout.
+
+        If the probe times out and ``remember`` is true, ``path`` is remembered
+        as unreachable for :attr:`ttl` seconds. Pass ``remember=False`` for
+        paths which must not be skipped by later commands (e.g., a workon
+        home).
+
+        Raises
+        ------
+        UnreachableError
+            If ``path`` is known to be unreachable or the probe times out.
+        """
+        if self.timeout is None or self.timeout <= 0:
+            return func(path)
+
+        key = os.path.abspath(path)  # ruff: ignore[os-path-abspath]
+        with self._lock:
+            cached = self._load_cache().get(key, 0.0) > time.time()
+        if cached:
+            logger.debug("Skipping unreachable path %s", path)
+            self._mark_unreachable(path, key, persist=False)
+            msg = f"{path} is unreachable (cached)"
+            raise UnreachableError(msg)
+
+        try:
+            return _call_with_timeout(func, path, self.timeout)
+        except UnreachableError:
+            logger.warning("Unreachable path %s", path)
+            self._mark_unreachable(path, key, persist=remember)
+            raise
+
+    def try_call(
+        self,
+        func: Callable[[Path], R],
+        path: Path,
+        default: R,
+        remember: bool = True,
+    ) -> R:
+        """Call ``func(path)``, returning ``default`` if path is unreachable."""
+        try:
+            return self(func, path, remember=remember)
+        except UnreachableError:
+            return default
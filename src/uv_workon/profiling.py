@@ -0,0 +1,130 @@
+"""
+Profiling hooks (:mod:`~uv_workon.profiling`)
+=============================================
+
+Profile a whole ``uv-workon`` invocation without editing code, by setting
+environment variables:
+
+- ``UV_WORKON_PROFILE=<path>``: run command under :mod:`cProfile`, and write
+  :mod:`pstats` output to ``path``.
+- ``UV_WORKON_PROFILE_COLLAPSED=<path>``: run a lightweight sampling tracer,
+  and write collapsed stacks (as used by ``flamegraph.pl`` and
+  `speedscope <https://www.speedscope.app>`_) to ``path``.
+- ``UV_WORKON_PROFILE_INTERVAL=<seconds>``: sampling interval (default
+  ``0.001``).
+
+These are checked by the ``uv-workon`` entry point, so there is no overhead
+if neither is set.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, ParamSpec, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import FrameType
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+PROFILE_ENV = "UV_WORKON_PROFILE"
+PROFILE_COLLAPSED_ENV = "UV_WORKON_PROFILE_COLLAPSED"
+PROFILE_INTERVAL_ENV = "UV_WORKON_PROFILE_INTERVAL"
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Sample stacks of a thread at a fixed interval.
+
+    Parameters
+    ----------
+    interval : float
+        Seconds between samples.
+    thread_id : int, optional
+        Thread to sample. Defaults to the thread calling :meth:`start`.
+    """
+
+    def __init__(self, interval: float = 0.001, thread_id: int | None = None) -> None:
+        self.interval = interval
+        self.thread_id = thread_id
+        self.counts: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _sample(self) -> None:
+        if self.thread_id is None:  # pragma: no cover
+            return
+        frame = sys._current_frames().get(self.thread_id)  # pyright: ignore[reportPrivateUsage]  # ruff: ignore[private-member-access]
+        stack: list[str] = []
+        while frame is not None:
+            stack.append(_frame_label(frame))
+            frame = frame.f_back
+        if stack:
+            self.counts[";".join(reversed(stack))] += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        """Start sampling."""
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, one ``frame;frame;... count`` per line."""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in sorted(self.counts.items())
+        )
+
+
+def run_profiled(func: Callable[P, R], *args: P.args, **kwargs: P.kwargs) -> R:
+    """
+    Call ``func(*args, **kwargs)`` under profilers requested by environment variables.
+
+    Output files are written even if ``func`` raises (including
+    :class:`SystemExit`).
+    """
+    profile_path = os.environ.get(PROFILE_ENV)
+    collapsed_path = os.environ.get(PROFILE_COLLAPSED_ENV)
+
+    sampler = None
+    if collapsed_path:
+        sampler = StackSampler(float(os.environ.get(PROFILE_INTERVAL_ENV, "0.001")))
+        sampler.start()
+
+    profiler = None
+    if profile_path:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    try:
+        return func(*args, **kwargs)
+    finally:
+        if profiler is not None and profile_path:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+        if sampler is not None and collapsed_path:
+            sampler.stop()
+            _ = Path(collapsed_path).write_text(sampler.collapsed(), encoding="utf-8")
@@ -0,0 +1,163 @@
+"""
+Background refresh of cached state (:mod:`~uv_workon.refresh`)
+==============================================================
+
+Latency critical commands (``activate``, ``cd``, ``run``, and shell completion)
+answer from the cached name index (see :mod:`~uv_workon.index`) immediately,
+even if it is stale (stale-while-revalidate). An index is stale if
+``WORKON_HOME`` changed since it was built, or if it is older than
+``UV_WORKON_REFRESH_AFTER`` seconds (default 300). For a stale index, a
+detached background process (``python -m uv_workon.refresh``) rebuilds it, so
+the next command gets fresh data with no foreground cost.
+
+At most one refresh per ``WORKON_HOME`` runs at a time. This is guarded by a
+lock file next to the cached index, created exclusively by the command which
+starts the refresh and removed by the refresh process when done. Lock files
+older than :data:`LOCK_TIMEOUT` seconds (e.g., from a killed refresh) are
+ignored.
+
+Set ``UV_WORKON_REFRESH=0`` to disable background refresh, in which case a
+stale index is rebuilt in the foreground.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+REFRESH_ENV = "UV_WORKON_REFRESH"
+REFRESH_AFTER_ENV = "UV_WORKON_REFRESH_AFTER"
+DEFAULT_REFRESH_AFTER = 300.0
+#: Seconds after which a lock file is considered abandoned.
+LOCK_TIMEOUT = 120.0
+
+
+def is_enabled() -> bool:
+    """Whether background refresh is enabled."""
+    return os.environ.get(REFRESH_ENV, "1").lower() not in {"0", "false", "no", "off"}
+
+
+def get_refresh_after() -> float:
+    """Age in seconds after which cached state is refreshed."""
+    return float(os.environ.get(REFRESH_AFTER_ENV, DEFAULT_REFRESH_AFTER))
+
+
+def get_lock_path(workon_home: Path) -> Path:
+    """Path to lock file for refreshing index of ``workon_home``."""
+    from .index import get_index_path
+
+    return get_index_path(workon_home).with_suffix(".lock")
+
+
+def _create_exclusive(path: Path) -> bool:
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+    except FileExistsError:
+        return False
+    _ = os.write(fd, str(os.getpid()).encode())
+    os.close(fd)
+    return True
+
+
+def _lock_age(path: Path) -> float:
+    try:
+        return time.time() - path.stat().st_mtime
+    except FileNotFoundError:
+        return float("inf")
+
+
+def acquire_lock(path: Path, timeout: float = LOCK_TIMEOUT) -> bool:
+    """
+    Create lock file ``path`` exclusively.
+
+    Returns ``False`` if the lock is held (and younger than ``timeout``
+    seconds).
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if _create_exclusive(path):
+        return True
+    if _lock_age(path) < timeout:
+        return False
+    logger.debug("Removing abandoned lock %s", path)
+    path.unlink(missing_ok=True)
+    return _create_exclusive(path)
+
+
+def release_lock(path: Path) -> None:
+    """Remove lock file ``path``."""
+    path.unlink(missing_ok=True)
+
+
+#: Started refresh processes (kept, as the command exits before them).
+_PROCESSES: list[subprocess.Popen[bytes]] = []
+
+
+def _spawn(args: Sequence[str]) -> None:  # pragma: no cover
+    _PROCESSES.append(
+        subprocess.Popen(
+            args,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            close_fds=True,
+            start_new_session=True,
+        )
+    )
+
+
+def schedule_refresh(workon_home: Path) -> bool:
+    """
+    Start detached background refresh of index of ``workon_home``.
+
+    Does nothing if a refresh is already running. Returns whether a refresh
+    was started.
+    """
+    lock = get_lock_path(workon_home)
+    try:
+        if not acquire_lock(lock):
+            logger.debug("Refresh of %s already running", workon_home)
+            return False
+    except OSError as e:
+        logger.debug("Could not lock %s: %s", lock, e)
+        return False
+
+    try:
+        _spawn([sys.executable, "-m", "uv_workon.refresh", str(workon_home.absolute())])
+    except OSError as e:
+        logger.debug("Could not start refresh of %s: %s", workon_home, e)
+        release_lock(lock)
+        return False
+    logger.debug("Started refresh of %s", workon_home)
+    return True
+
+
+def refresh(workon_home: Path) -> None:
+    """Rebuild index of ``workon_home`` and release its lock."""
+    from .index import build_name_index
+    from .probe import Prober
+
+    try:
+        _ = build_name_index(workon_home, Prober.from_env())
+    finally:
+        release_lock(get_lock_path(workon_home))
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Refresh indices of workon homes passed as arguments."""
+    for arg in sys.argv[1:] if argv is None else argv:
+        refresh(Path(arg))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,363 @@
+"""
+Fuzzy selector (:mod:`~uv_workon.selector`)
+===========================================
+
+Interactive selector which scales to thousands of options. Options are
+consumed from an iterator in a background thread, so the selector opens before
+discovery finishes. Typing filters options by fuzzy (subsequence) matching,
+ranked by :func:`fuzzy_score`. Filtering is incremental (extending the query
+only rescans previous matches and newly discovered options), and only the
+visible rows are ranked and drawn.
+
+The selector used by ``uv-workon`` commands is chosen with the
+``UV_WORKON_SELECTOR`` environment variable (``fuzzy``, the default, or
+``menu`` for :func:`~uv_workon.utils.select_option`). Only the ``fuzzy``
+selector streams options: ``simple-term-menu`` needs the complete list of
+options up front, so the ``menu`` selector opens after discovery finishes.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import os
+import shutil
+import sys
+import threading
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Literal
+
+import attrs
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+    from typing import IO
+
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+SELECTOR_ENV = "UV_WORKON_SELECTOR"
+SELECTORS = ("menu", "fuzzy")
+
+_BOUNDARY = frozenset(" -_./")
+
+
+def get_selector() -> Literal["menu", "fuzzy"]:
+    """
+    Selector kind from ``UV_WORKON_SELECTOR``, or default (``fuzzy``).
+
+    ``menu`` requires ``simple-term-menu``, and falls back to ``fuzzy`` if it
+    is not installed.
+    """
+    value = os.environ.get(SELECTOR_ENV, "").lower()
+    if value == "menu":
+        if find_spec("simple_term_menu") is not None:
+            return "menu"
+        logger.warning("simple-term-menu not installed, using fuzzy selector")
+    elif value and value != "fuzzy":
+        logger.warning(
+            "Ignoring %s=%s (expected one of %s)", SELECTOR_ENV, value, SELECTORS
+        )
+    return "fuzzy"
+
+
+def fuzzy_score(query: str, candidate: str) -> int | None:
+    """
+    Score of ``candidate`` containing ``query`` as a case-insensitive subsequence.
+
+    Higher is better. Matches at the start of the candidate or of a word, and
+    consecutive matches, score higher. Gaps between matches are penalized.
+    Returns ``None`` if ``candidate`` does not match.
+
+    Examples
+    --------
+    >>> fuzzy_score("xyz", "uv-workon") is None
+    True
+    >>> fuzzy_score("uvw", "uv-workon") > fuzzy_score("uvw", "a_u_v_w")
+    True
+    >>> fuzzy_score("wo", "uv-workon") > fuzzy_score("wo", "two")
+    True
+    """
+    lowered = candidate.lower()
+    score = 0
+    last = -1
+    for char in query.lower():
+        index = lowered.find(char, last + 1)
+        if index < 0:
+            return None
+        if index == 0:
+            score += 8
+        elif lowered[index - 1] in _BOUNDARY:
+            score += 6
+        if index == last + 1:
+            score += 4
+        else:
+            score -= min(index - last - 1, 5)
+        score += 1
+        last = index
+    return score
+
+
+def rank(
+    query: str,
+    candidates: Iterable[str],
+    limit: int | None = None,
+    priority: Mapping[str, float] | None = None,
+) -> list[str]:
+    """
+    Candidates matching ``query``, best first.
+
+    Ties are broken by ``priority`` (see :func:`~uv_workon.mru.get_scores`),
+    length, then name. With an empty query, candidates are ordered by
+    ``priority`` only. With ``limit``, only the best ``limit`` candidates are
+    returned, without sorting all matches.
+
+    Examples
+    --------
+    >>> rank("ab", ["xaxb", "ab_c", "ba", "abc"])
+    ['abc', 'ab_c', 'xaxb']
+    >>> rank("", ["b", "a", "c"], priority={"c": 1.0})
+    ['c', 'b', 'a']
+    """
+    priority = priority or {}
+
+    def _priority(candidate: str) -> float:
+        return -priority.get(candidate, 0.0)
+
+    if not query:
+        if not priority:
+            return list(candidates)[:limit]
+        if limit is None:
+            return sorted(candidates, key=_priority)
+        return heapq.nsmallest(limit, candidates, key=_priority)
+
+    scored = (
+        (-score, _priority(candidate), len(candidate), candidate)
+        for candidate in candidates
+        if (score := fuzzy_score(query, candidate)) is not None
+    )
+    best = sorted(scored) if limit is None else heapq.nsmallest(limit, scored)
+    return [candidate for *_, candidate in best]
+
+
+@attrs.define
+class Matcher:
+    """
+    Incremental matcher over a growing list of options.
+
+    Options may be appended to :attr:`options` (e.g., from another thread)
+    between calls to :meth:`matches`.
+    """
+
+    options: list[str] = attrs.field(factory=list)
+    #: Priority of options (see :func:`rank`).
+    priority: Mapping[str, float] = attrs.field(factory=dict)
+    _query: str = attrs.field(default="", init=False)
+    _matches: list[str] = attrs.field(factory=list, init=False)
+    _checked: int = attrs.field(default=0, init=False)
+
+    def matches(self, query: str) -> list[str]:
+        """All options matching ``query`` (unranked, in discovery order)."""
+        if query.lower().startswith(self._query.lower()):
+            previous = self._matches
+        else:
+            previous, self._checked = [], 0
+
+        def _keep(option: str) -> bool:
+            return fuzzy_score(query, option) is not None
+
+        count = len(self.options)
+        self._matches = [
+            *filter(_keep, previous),
+            *filter(_keep, self.options[self._checked : count]),
+        ]
+        self._query, self._checked = query, count
+        return self._matches
+
+    def top(self, query: str, limit: int) -> tuple[list[str], int]:
+        """Best ``limit`` matches of ``query``, and total number of matches."""
+        matches = self.matches(query)
+        return rank(query, matches, limit, self.priority), len(matches)
+
+
+def _make_matcher(selector: FuzzySelector) -> Matcher:
+    return Matcher(priority=selector.priority)
+
+
+@attrs.define
+class FuzzySelector:
+    """
+    Interactive fuzzy selector.
+
+    Keys are processed by :meth:`handle_key` and the screen is drawn from
+    :meth:`render`, so that the state machine can be used without a terminal.
+    :meth:`run` drives both from the terminal.
+    """
+
+    options: Iterable[str]
+    title: str = ""
+    #: Maximum number of rows shown.
+    height: int = 10
+    #: Priority of options (see :func:`rank`).
+    priority: Mapping[str, float] = attrs.field(factory=dict)
+    query: str = attrs.field(default="", init=False)
+    cursor: int = attrs.field(default=0, init=False)
+    #: Whether all options have been read from :attr:`options`.
+    done: bool = attrs.field(default=False, init=False)
+    _matcher: Matcher = attrs.field(
+        default=attrs.Factory(_make_matcher, takes_self=True), init=False
+    )
+    _visible: list[str] = attrs.field(factory=list, init=False)
+
+    def consume(self) -> None:
+        """Read all options (run in a background thread by :meth:`run`)."""
+        try:
+            for option in self.options:
+                self._matcher.options.append(option)
+        finally:
+            self.done = True
+
+    def render(self) -> list[str]:
+        """Prompt line followed by visible rows (the selected row marked ``>``)."""
+        limit = max(self.height, self.cursor + 1)
+        ranked, total = self._matcher.top(self.query, limit)
+        self.cursor = max(0, min(self.cursor, len(ranked) - 1))
+        start = max(0, self.cursor - self.height + 1)
+        self._visible = ranked[start : start + self.height]
+        status = f"{total}/{len(self._matcher.options)}{'' if self.done else '+'}"
+        prompt = f"{self.title}> " if self.title else "> "
+        return [
+            f"{prompt}{self.query}  [{status}]",
+            *(
+                f"{'>' if start + i == self.cursor else ' '} {option}"
+                for i, option in enumerate(self._visible)
+            ),
+        ]
+
+    @property
+    def selected(self) -> str | None:
+        """Option under the cursor (as of the last :meth:`render`)."""
+        if not self._visible:
+            return None
+        start = max(0, self.cursor - self.height + 1)
+        return self._visible[self.cursor - start]
+
+    def handle_key(self, key: str) -> bool:
+        """
+        Update state for ``key``.
+
+        Returns ``False`` once selection is finished (accepted or cancelled).
+        """
+        if key in {"\r", "\n"}:
+            return False
+        if key in {"\x1b", "\x03", "\x07"}:  # escape, ctrl-c, ctrl-g
+            self._visible = []
+            return False
+        if key in {"\x1b[A", "\x10"}:  # up, ctrl-p
+            self.cursor = max(0, self.cursor - 1)
+        elif key in {"\x1b[B", "\x0e"}:  # down, ctrl-n
+            self.cursor += 1
+        elif key in {"\x7f", "\x08"}:
+            self.query, self.cursor = self.query[:-1], 0
+        elif key == "\x15":  # ctrl-u
+            self.query, self.cursor = "", 0
+        elif key.isprintable():
+            self.query, self.cursor = self.query + key, 0
+        return True
+
+    def run(self, stream: IO[str] | None = None) -> str | None:  # pragma: no cover
+        """
+        Run selector on the terminal, drawing to ``stream`` (default standard error).
+
+        Returns selected option, or ``None`` if cancelled.
+        """
+        import select
+        import termios
+        import tty
+
+        stream = sys.stderr if stream is None else stream
+        self.height = max(1, min(self.height, shutil.get_terminal_size().lines - 2))
+        wake_r, wake_w = os.pipe()
+
+        def _consume() -> None:
+            try:
+                self.consume()
+            finally:
+                os.write(wake_w, b"x")
+
+        threading.Thread(target=_consume, daemon=True).start()
+
+        fd = sys.stdin.fileno()
+        saved = termios.tcgetattr(fd)
+        drawn = 0
+        try:
+            tty.setcbreak(fd)
+            _ = stream.write("\x1b[?25l")
+            while True:
+                lines = self.render()
+                _ = stream.write(
+                    ("\x1b[F" * drawn) + "\r\x1b[J" + "\n".join(lines) + "\r"
+                )
+                stream.flush()
+                drawn = len(lines) - 1
+                ready, _, _ = select.select(
+                    [fd, wake_r], [], [], None if self.done else 0.1
+                )
+                if wake_r in ready:
+                    _ = os.read(wake_r, 64)
+                if fd in ready and not self.handle_key(_read_key(fd)):
+                    return self.selected
+        finally:
+            _ = stream.write(("\x1b[F" * drawn) + "\r\x1b[J\x1b[?25h")
+            stream.flush()
+            termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+            os.close(wake_r)
+            os.close(wake_w)
+
+
+def _read_key(fd: int) -> str:  # pragma: no cover
+    import select
+
+    key = os.read(fd, 1).decode(errors="replace")
+    if key == "\x1b" and select.select([fd], [], [], 0.02)[0]:
+        key += os.read(fd, 2).decode(errors="replace")
+    return key
+
+
+def fuzzy_select(
+    options: Iterable[str],
+    title: str = "",
+    height: int = 10,
+    priority: Mapping[str, float] | None = None,
+) -> str | None:  # pragma: no cover
+    """
+    Select from ``options`` with :class:`FuzzySelector`.
+
+    ``options`` can be a lazy iterator. Returns ``None`` if cancelled.
+    """
+    return FuzzySelector(
+        options, title=title, height=height, priority=priority or {}
+    ).run()
+
+
+def interactive_select(
+    options: Iterable[str],
+    title: str = "",
+    priority: Mapping[str, float] | None = None,
+) -> str | None:
+    """
+    Select from ``options`` with the selector from :func:`get_selector`.
+
+    Options are ordered by ``priority`` (see :func:`rank`). The ``fuzzy``
+    selector consumes ``options`` lazily, while the ``menu`` selector reads
+    all of them before opening. Returns ``None`` if there are no options or
+    selection was cancelled.
+    """
+    if get_selector() == "fuzzy":
+        return fuzzy_select(options, title=title, priority=priority)
+
+    from .utils import select_option
+
+    if not (values := rank("", options, priority=priority)):
+        return None
+    return select_option(values, title=title)
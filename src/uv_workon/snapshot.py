@@ -0,0 +1,220 @@
+"""
+Published index snapshots (:mod:`~uv_workon.snapshot`)
+======================================================
+
+A shared, read-only ``WORKON_HOME`` (for example, a team-wide home on shared
+storage used by many users) can carry a prebuilt snapshot of its virtual
+environments, written by ``uv-workon publish``. The snapshot lists the name,
+resolved target, and basic metadata (:class:`VenvInfo`) of each virtual
+environment, and is stored next to the home (``.{name}.uv-workon-snapshot.json``
+in the parent directory of a home named ``name``, see
+:func:`get_snapshot_path`). As for lock files (see :mod:`~uv_workon.locks`),
+nothing is written inside the home, which only contains links.
+
+Readers (see :class:`~uv_workon.homes.WorkonHomes`) load the snapshot instead
+of walking and validating every entry of the home. A snapshot records the
+modification time of the home when it was published. If the home has changed
+since (links were added, removed, or renamed), the snapshot is ignored, and the
+home is scanned as usual, until the snapshot is republished. Checking this
+costs a single ``stat`` of the home.
+
+Per-user links are layered on top by listing a personal home before the shared
+home in ``WORKON_HOME`` (see :mod:`~uv_workon.homes`).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from itertools import starmap
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import attrs
+
+from .core import get_virtualenv_targets
+from .timing import count, span
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .probe import Prober
+
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".uv-workon-snapshot.json"
+
+
+def read_pyvenv_cfg(path: Path) -> dict[str, str]:
+    """Key/value pairs from ``pyvenv.cfg`` of virtual environment at ``path``."""
+    out: dict[str, str] = {}
+    try:
+        lines = (path / "pyvenv.cfg").read_text(encoding="utf-8").splitlines()
+    except (OSError, ValueError):
+        return out
+    for line in lines:
+        key, sep, value = line.partition("=")
+        if sep:
+            out[key.strip()] = value.strip()
+    return out
+
+
+@attrs.frozen
+class VenvInfo:
+    """Metadata of a virtual environment in a snapshot."""
+
+    name: str
+    #: Resolved target of the link (or path) in the home.
+    target: str | None = None
+    #: Python version, from ``pyvenv.cfg``.
+    python: str | None = None
+
+    @classmethod
+    def from_path(cls, path: Path, target: Path | None = None) -> VenvInfo:
+        """Create from path in home and its resolved target."""
+        # unreachable targets (``target is None``) are not read.
+        cfg = {} if target is None else read_pyvenv_cfg(target)
+        return cls(
+            name=path.name,
+            target=None if target is None else str(target),
+            python=cfg.get("version_info") or cfg.get("version") or None,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Dictionary (skipping ``None`` values)."""
+        return attrs.asdict(self, filter=lambda _, v: v is not None)
+
+
+def _converter_venvs(venvs: Iterable[VenvInfo]) -> tuple[VenvInfo, ...]:
+    return tuple(sorted(venvs, key=lambda v: v.name))
+
+
+@attrs.frozen
+class Snapshot:
+    """Immutable snapshot of virtual environments in a home."""
+
+    workon_home: Path = attrs.field(converter=Path)
+    #: Modification time of :attr:`workon_home` when published.
+    mtime_ns: int
+    #: Virtual environments, sorted by name.
+    venvs: tuple[VenvInfo, ...] = attrs.field(converter=_converter_venvs)
+    #: Time of publication (seconds since the epoch).
+    created: float = attrs.field(factory=time.time)
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        """Sorted names."""
+        return tuple(v.name for v in self.venvs)
+
+    def iter_targets(self) -> Iterable[tuple[Path, Path | None]]:
+        """
+        Iterate over paths in home and resolved targets.
+
+        Same as :func:`~uv_workon.core.get_virtualenv_targets`, without
+        touching the home.
+        """  # ruff: ignore[docstring-missing-yields]
+        for v in self.venvs:
+            yield (
+                self.workon_home / v.name,
+                None if v.target is None else Path(v.target),
+            )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Dictionary suitable for JSON."""
+        return {
+            "version": SNAPSHOT_VERSION,
+            "workon_home": str(self.workon_home),
+            "mtime_ns": self.mtime_ns,
+            "created": self.created,
+            "venvs": [v.to_dict() for v in self.venvs],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Snapshot:
+        """Create from :meth:`to_dict` output."""
+        if data.get("version") != SNAPSHOT_VERSION:
+            msg = f"Unsupported snapshot version {data.get('version')}"
+            raise ValueError(msg)
+        return cls(
+            workon_home=data["workon_home"],
+            mtime_ns=data["mtime_ns"],
+            venvs=(VenvInfo(**v) for v in data["venvs"]),
+            created=data["created"],
+        )
+
+
+def get_snapshot_path(workon_home: Path) -> Path:
+    """
+    Path to snapshot of ``workon_home``, next to it.
+
+    Examples
+    --------
+    >>> get_snapshot_path(Path("/shared/venvs")).as_posix()
+    '/shared/.venvs.uv-workon-snapshot.json'
+    """
+    home = workon_home.absolute()
+    return home.parent / f".{home.name}{SNAPSHOT_SUFFIX}"
+
+
+def publish_snapshot(
+    workon_home: Path,
+    jobs: int | None = None,
+    prober: Prober | None = None,
+) -> Snapshot:
+    """
+    Scan ``workon_home`` and write its snapshot.
+
+    The snapshot is written to a temporary file, made read-only, and renamed
+    into place, so readers never see a partial snapshot.
+    """
+    path = get_snapshot_path(workon_home)
+    mtime_ns = workon_home.stat().st_mtime_ns
+
+    with span("snapshot", "scan"):
+        snapshot = Snapshot(
+            workon_home=workon_home.absolute(),
+            mtime_ns=mtime_ns,
+            venvs=starmap(
+                VenvInfo.from_path,
+                get_virtualenv_targets(workon_home, jobs=jobs, prober=prober),
+            ),
+        )
+
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    _ = tmp.write_text(
+        json.dumps(snapshot.to_dict(), separators=(",", ":")), encoding="utf-8"
+    )
+    tmp.chmod(0o444)
+    _ = tmp.replace(path)
+    logger.info("Published snapshot of %s to %s", workon_home, path)
+    return snapshot
+
+
+def load_snapshot(workon_home: Path) -> Snapshot | None:
+    """
+    Load current snapshot of ``workon_home``.
+
+    Returns ``None`` if there is no snapshot, or if ``workon_home`` has changed
+    since the snapshot was published.
+    """
+    path = get_snapshot_path(workon_home)
+    try:
+        with span("snapshot", "load"):
+            snapshot = Snapshot.from_dict(json.loads(path.read_text(encoding="utf-8")))
+        mtime_ns = workon_home.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.debug("Ignoring snapshot %s: %s", path, e)
+        return None
+
+    if snapshot.mtime_ns != mtime_ns:
+        logger.debug("Ignoring stale snapshot %s", path)
+        count("snapshot_stale")
+        return None
+    count("snapshot_hit")
+    return attrs.evolve(snapshot, workon_home=workon_home)
@@ -0,0 +1,149 @@
+"""
+Blue/green switching of links (:mod:`~uv_workon.switch`)
+========================================================
+
+``uv-workon switch NAME PATH`` points the link ``NAME`` in the workon home to
+the virtual environment at ``PATH`` (for example, a newly built environment
+for a service run with ``uv-workon run -n NAME``). The link is replaced
+atomically (see :func:`~uv_workon.core.replace_symlink`), so running jobs
+never see a missing environment.
+
+Previous targets of each link are remembered (up to
+``UV_WORKON_SWITCH_HISTORY``, default 5) in the cache directory (see
+:func:`~uv_workon.utils.get_cache_dir`), so ``uv-workon switch NAME
+--rollback`` relinks the previous target instantly. A rollback remembers the
+target it replaced, so it can be undone with another rollback. Switches and
+rollbacks hold the lock of the link (see :mod:`~uv_workon.locks`), so
+concurrent switches of the same link are serialized. Dry runs take no lock.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
+
+from .core import replace_symlink
+from .locks import link_lock
+from .utils import get_cache_dir
+from .validate import NoVirtualEnvError, is_valid_virtualenv, validate_symlink
+
+if TYPE_CHECKING:
+    from contextlib import AbstractContextManager
+    from pathlib import Path
+
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+HISTORY_ENV = "UV_WORKON_SWITCH_HISTORY"
+DEFAULT_HISTORY = 5
+
+
+class NoHistoryError(NoVirtualEnvError):
+    """Error to raise if there is no previous target to roll back to."""
+
+
+def get_history_size() -> int:
+    """Number of previous targets to keep."""
+    return int(os.environ.get(HISTORY_ENV, DEFAULT_HISTORY))
+
+
+def get_history_path(link: Path) -> Path:
+    """Path to history of previous targets of ``link``."""
+    digest = hashlib.sha256(str(link.absolute()).encode()).hexdigest()
+    return get_cache_dir() / "switch" / f"{digest[:16]}.json"
+
+
+def read_history(link: Path) -> list[str]:
+    """Previous targets of ``link``, most recent first."""
+    try:
+        data = json.loads(get_history_path(link).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    if not isinstance(data, dict) or data.get("link") != str(link.absolute()):
+        return []
+    return [str(x) for x in data.get("targets", [])]
+
+
+def _write_history(link: Path, targets: list[str]) -> None:
+    path = get_history_path(link)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    _ = tmp.write_text(
+        json.dumps({"link": str(link.absolute()), "targets": targets}),
+        encoding="utf-8",
+    )
+    _ = tmp.replace(path)
+
+
+def _readlink(link: Path) -> str | None:
+    return str(link.readlink()) if link.is_symlink() else None
+
+
+def _push_history(link: Path, previous: str, history: list[str]) -> None:
+    """Save ``previous`` followed by ``history`` as previous targets of ``link``."""
+    targets = [previous, *(t for t in history if t != previous)]
+    _write_history(link, targets[: get_history_size()])
+
+
+def _lock(link: Path, dry_run: bool) -> AbstractContextManager[None]:
+    return nullcontext() if dry_run else link_lock(link)
+
+
+def switch(link: Path, target: str, dry_run: bool = False) -> str | None:
+    """
+    Atomically point ``link`` to ``target``, remembering the current target.
+
+    Returns the previous target (``None`` if ``link`` did not exist). An
+    existing ``link`` which is not a symlink is an error (see
+    :func:`~uv_workon.validate.validate_symlink`).
+    """
+    _ = validate_symlink(link)
+    with _lock(link, dry_run):
+        previous = _readlink(link)
+        logger.info("Switching %s -> %s (was %s)", link, target, previous)
+        if dry_run:
+            return previous
+        replace_symlink(link, target)
+        if previous is not None and previous != target:
+            _push_history(link, previous, read_history(link))
+    return previous
+
+
+def rollback(link: Path, dry_run: bool = False) -> str:
+    """
+    Atomically point ``link`` back to its most recent valid previous target.
+
+    Previous targets which are no longer virtual environments are skipped.
+    The replaced target is remembered, so a rollback can itself be rolled
+    back. Returns the restored target.
+
+    Raises
+    ------
+    NoHistoryError
+        If there is no valid previous target.
+    """
+    _ = validate_symlink(link)
+    with _lock(link, dry_run):
+        history = read_history(link)
+        for target in history:
+            if is_valid_virtualenv(link.parent / target):
+                break
+            logger.warning("Skipping %s: no longer a virtual environment", target)
+        else:
+            msg = f"No previous target of {link} to roll back to"
+            raise NoHistoryError(msg)
+
+        previous = _readlink(link)
+        logger.info("Rolling back %s -> %s (was %s)", link, target, previous)
+        if not dry_run:
+            replace_symlink(link, target)
+            rest = history[history.index(target) + 1 :]
+            if previous is None:
+                _write_history(link, rest)
+            else:
+                _push_history(link, previous, rest)
+    return target
@@ -0,0 +1,201 @@
+"""
+Timing instrumentation (:mod:`~uv_workon.timing`)
+=================================================
+
+Lightweight per-phase timing. Spans are only recorded if timing is enabled
+(``uv-workon --timings ...``). Otherwise, :func:`span` returns a shared no-op
+context manager and :func:`timed` calls the wrapped function directly.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar
+
+import attrs
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Iterable, Iterator
+    from contextlib import AbstractContextManager
+    from pathlib import Path
+
+P = ParamSpec("P")
+R = TypeVar("R")
+T = TypeVar("T")
+
+
+@attrs.frozen
+class Span:
+    """Single timed span."""
+
+    name: str
+    #: Start, in seconds relative to :attr:`Timings.origin`.
+    start: float
+    #: Duration in seconds.
+    duration: float
+    detail: str | None = None
+    thread: str = attrs.field(factory=lambda: threading.current_thread().name)
+
+
+@attrs.define
+class Timings:
+    """Collection of timed spans."""
+
+    enabled: bool = False
+    #: Reference time (``time.perf_counter``) for span start times.
+    origin: float = attrs.field(factory=time.perf_counter)
+    #: Name of command being timed.
+    command: str | None = None
+    spans: list[Span] = attrs.field(factory=list)
+    #: Event counters (e.g., ``cache_hit``).
+    counts: dict[str, int] = attrs.field(factory=dict)
+
+    def enable(self, origin: float | None = None) -> None:
+        """
+        Enable recording of spans.
+
+        If passed, ``origin`` is the time the process started importing
+        ``uv_workon``, and an ``import`` span is recorded up to now.
+        """
+        self.enabled = True
+        if origin is not None:
+            self.origin = origin
+            self.add("import", origin, time.perf_counter() - origin)
+
+    def add(
+        self, name: str, start: float, duration: float, detail: str | None = None
+    ) -> None:
+        """Add a span with ``start`` from ``time.perf_counter``."""
+        self.spans.append(Span(name, start - self.origin, duration, detail))
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Increment counter ``name`` (if enabled)."""
+        if self.enabled:
+            self.counts[name] = self.counts.get(name, 0) + n
+
+    @contextmanager
+    def _span(self, name: str, detail: str | None) -> Generator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter() - start, detail)
+
+    def span(
+        self, name: str, detail: str | None = None
+    ) -> AbstractContextManager[None]:
+        """Context manager recording a span (if enabled)."""
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._span(name, detail)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Count and total/max duration of spans by name, in order of first start."""
+        out: dict[str, dict[str, float]] = {}
+        for s in sorted(self.spans, key=lambda s: s.start):
+            d = out.setdefault(s.name, {"count": 0, "total": 0.0, "max": 0.0})
+            d["count"] += 1
+            d["total"] += s.duration
+            d["max"] = max(d["max"], s.duration)
+        return out
+
+    def elapsed(self) -> float:
+        """Seconds since :attr:`origin`."""
+        return time.perf_counter() - self.origin
+
+    def report(self) -> str:
+        """Human readable breakdown."""
+        header = [
+            "[uv-workon timings]",
+            *([self.command] if self.command else []),
+            f"total {self.elapsed() * 1000:.1f} ms",
+        ]
+        lines = [
+            " ".join(header),
+            f"  {'phase':<24} {'count':>6} {'total ms':>10} {'max ms':>10}",
+        ]
+        lines.extend(
+            f"  {name:<24} {d['count']:>6.0f} {d['total'] * 1000:>10.2f} {d['max'] * 1000:>10.2f}"
+            for name, d in self.summary().items()
+        )
+        if self.counts:
+            lines.append(
+                "  counts: "
+                + ", ".join(f"{k}={v}" for k, v in sorted(self.counts.items()))
+            )
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary (for JSON output)."""
+        return {
+            "command": self.command,
+            "total": self.elapsed(),
+            "summary": self.summary(),
+            "counts": self.counts,
+            "spans": [attrs.asdict(s) for s in self.spans],
+        }
+
+    def write_json(self, path: Path) -> None:
+        """Write JSON output to ``path``."""
+        _ = path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+
+_NULL_CONTEXT: AbstractContextManager[None] = nullcontext()
+
+#: Global timings instrument.
+TIMINGS = Timings()
+
+
+def span(name: str, detail: str | None = None) -> AbstractContextManager[None]:
+    """Record span in global :data:`TIMINGS` (if enabled)."""
+    return TIMINGS.span(name, detail)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Increment counter in global :data:`TIMINGS` (if enabled)."""
+    TIMINGS.count(name, n)
+
+
+def timed(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorator recording a span for each call (if enabled)."""
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if not TIMINGS.enabled:
+                return func(*args, **kwargs)
+            with TIMINGS.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def timed_iter(name: str, iterable: Iterable[T]) -> Iterator[T]:
+    """
+    Record a single span for time spent producing items of ``iterable``.
+
+    Time spent by the consumer between items is excluded.
+    """  # ruff: ignore[docstring-missing-yields]
+    if not TIMINGS.enabled:
+        yield from iterable
+        return
+
+    it = iter(iterable)
+    start = time.perf_counter()
+    total = 0.0
+    while True:
+        t0 = time.perf_counter()
+        try:
+            item = next(it)
+        except StopIteration:
+            break
+        finally:
+            total += time.perf_counter() - t0
+        yield item
+    TIMINGS.add(name, start, total)
@@ -5,10 +5,17 @@ Utilities (:mod:`~uv_workon.utils`)
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, cast
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, TypeVar, cast
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+    from typing import IO
+
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 
 def select_option(
@@ -33,3 +40,123 @@ def select_option(
     ])
     index = cast("int", TerminalMenu(options, title=title or None).show())
     return options[index]
+
+
+def select_options(
+    options: Sequence[str],
+    title: str = "",
+    usage: bool = True,
+) -> list[int]:
+    """
+    Use multi-select checklist, with all options initially selected.
+
+    Returns indices of selected options (empty if the menu was cancelled).
+    """
+    from simple_term_menu import (  # pyright: ignore[reportMissingTypeStubs]
+        TerminalMenu,
+    )
+
+    title = " ".join([
+        *([title] if title else []),
+        *(["uncheck items to skip, or press escape to cancel all"] if usage else []),
+    ])
+    selected = cast(
+        "tuple[int, ...] | None",
+        TerminalMenu(
+            options,
+            title=title or None,
+            multi_select=True,
+            multi_select_select_on_accept=False,
+            multi_select_empty_ok=True,
+            preselected_entries=list(range(len(options))),
+            show_multi_select_hint=True,
+        ).show(),
+    )
+    return sorted(selected or ())
+
+
+def get_cache_dir() -> Path:
+    """
+    Get the user cache directory for ``uv-workon``.
+
+    Uses, in order, the ``UV_WORKON_CACHE_DIR`` environment variable,
+    ``${XDG_CACHE_HOME}/uv-workon``, ``%LOCALAPPDATA%/uv-workon/cache`` on
+    windows, and ``~/.cache/uv-workon``. The directory is not created.
+    """
+    if path := os.environ.get("UV_WORKON_CACHE_DIR"):
+        return Path(path).expanduser()
+    if path := os.environ.get("XDG_CACHE_HOME"):
+        return Path(path).expanduser() / "uv-workon"
+    if os.name == "nt" and (path := os.environ.get("LOCALAPPDATA")):  # pragma: no cover
+        return Path(path) / "uv-workon" / "cache"
+    return Path.home() / ".cache" / "uv-workon"
+
+
+def iter_delimited(
+    stream: IO[str],
+    delimiter: str = "\n",
+    chunk_size: int = 65536,
+) -> Iterator[str]:
+    r"""
+    Lazily split text stream on delimiter.
+
+    Empty entries are skipped.  The stream is read in chunks of size
+    ``chunk_size``, so arbitrarily large input can be processed without
+    reading it all into memory.
+
+    Examples
+    --------
+    >>> from io import StringIO
+    >>> list(iter_delimited(StringIO("a\0b c\0\0d"), delimiter="\0"))
+    ['a', 'b c', 'd']
+    """  # ruff: ignore[docstring-missing-yields]
+    remainder = ""
+    while chunk := stream.read(chunk_size):
+        *items, remainder = (remainder + chunk).split(delimiter)
+        yield from filter(None, items)
+    if remainder:
+        yield remainder
+
+
+def map_concurrent(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    jobs: int | None = None,
+) -> Iterator[R]:
+    """
+    Map ``func`` over ``items`` using a thread pool.
+
+    Results are yielded in the order of ``items`` as soon as they are
+    available.  At most twice the number of workers of ``items`` are read
+    ahead of the yielded results, so ``items`` can be a lazy (or slow)
+    iterator, and results stream as items are produced.  If ``jobs == 1``, no
+    thread pool is used.  If ``jobs`` is ``None``, use the default number of
+    workers of :class:`~concurrent.futures.ThreadPoolExecutor`.
+
+    Examples
+    --------
+    >>> list(map_concurrent(str.upper, ["a", "b", "c"], jobs=2))
+    ['A', 'B', 'C']
+    """  # ruff: ignore[docstring-missing-yields]
+    if jobs == 1:
+        yield from map(func, items)
+        return
+
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+    from itertools import islice
+
+    workers = jobs or min(32, (os.cpu_count() or 1) + 4)
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque(
+            executor.submit(func, item) for item in islice(items, 2 * workers)
+        )
+        try:
+            while pending:
+                result = pending.popleft().result()
+                pending.extend(executor.submit(func, item) for item in islice(items, 1))
+                yield result
+        finally:
+            for future in pending:
+                _ = future.cancel()
@@ -8,6 +8,8 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from .timing import timed
+
 if TYPE_CHECKING:
     from collections.abc import Container, Iterable
 
@@ -34,9 +36,11 @@ def validate_venv_patterns(venv_patterns: VirtualEnvPattern) -> list[str]:
     return list(venv_patterns)
 
 
+@timed("validate")
 def is_valid_virtualenv(path: Path) -> bool:
     """Check if path is a valid venv"""
-    return path.is_dir() and (path / "pyvenv.cfg").exists()
+    # NOTE: single stat. `path / "pyvenv.cfg"` can only exist if path is a directory.
+    return (path / "pyvenv.cfg").exists()
 
 
 def validate_is_virtualenv(path: PathLike) -> Path:
@@ -0,0 +1,342 @@
+"""
+Watch parent directories for new virtual environments (:mod:`~uv_workon.watch`)
+===============================================================================
+
+``uv-workon watch --parent ~/projects`` keeps links in ``WORKON_HOME`` in sync
+with virtual environments under the parent directories. When ``pyvenv.cfg``
+appears in (or disappears from) a project under a parent, matching a virtual
+environment pattern (``.venv`` or ``venv`` by default), the link for that
+project is created (or removed).
+
+On Linux, changes are detected with inotify (:class:`InotifyWatcher`).
+Otherwise, or with ``--poll``, parents are rescanned periodically
+(:class:`PollingWatcher`). Changes are debounced, so the burst of events from
+creating a virtual environment (e.g., ``uv sync``) results in a single update
+per project.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, TypeAlias
+
+import attrs
+
+from .core import VirtualEnvPathAndLink
+from .plan import Action, ActionKind, Plan
+from .validate import (
+    infer_virtualenv_name,
+    infer_virtualenv_path,
+    is_valid_virtualenv,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+
+def _project_name(project: Path) -> str:
+    return project.resolve().name
+
+
+def _points_into(link: Path, project: Path) -> bool:
+    """Whether symlink ``link`` points to ``project`` or a path below it."""
+    target = Path(os.path.normpath(link.parent / link.readlink()))
+    return any(
+        target.is_relative_to(root)
+        for root in (Path(os.path.normpath(project.absolute())), project.resolve())
+    )
+
+
+@attrs.define
+class LinkSync:
+    """
+    Compute and apply link updates for projects under parent directories.
+
+    Existing links are only replaced if they no longer point to a virtual
+    environment, and only removed if they point into the project whose virtual
+    environment disappeared, so links to other virtual environments are never
+    touched.
+    """
+
+    workon_home: Path
+    venv_patterns: list[str]
+    resolve: bool = False
+    dry_run: bool = False
+
+    def plan_project(self, project: Path) -> Action | None:
+        """Action to bring link for ``project`` in sync, if any."""
+        if (venv := infer_virtualenv_path(project, self.venv_patterns)) is not None:
+            link = self.workon_home / infer_virtualenv_name(venv, self.venv_patterns)
+            if is_valid_virtualenv(link) or (link.exists() and not link.is_symlink()):
+                if link.resolve() != venv.resolve():
+                    logger.debug("Skipping %s: %s already exists", venv, link)
+                return None
+            return Action.for_link(
+                link,
+                VirtualEnvPathAndLink(path=venv, link=link).symlink_target(  # pyrefly: ignore[unexpected-keyword]
+                    self.resolve
+                ),
+            )
+
+        link = self.workon_home / _project_name(project)
+        if (
+            link.is_symlink()
+            and not is_valid_virtualenv(link)
+            and _points_into(link, project)
+        ):
+            return Action(
+                ActionKind.unlink, path=str(link), previous=str(link.readlink())
+            )
+        return None
+
+    def sync(self, projects: Iterable[Path]) -> Plan:
+        """Update links for ``projects``, returning the applied plan."""
+        plan = Plan(
+            [
+                action
+                for project in sorted(set(projects))
+                if (action := self.plan_project(project)) is not None
+            ],
+            command="watch",
+        )
+        for outcome in plan.apply(dry_run=self.dry_run):
+            if outcome.error is not None:
+                logger.error(
+                    "Failed to %s: %s", outcome.action.describe(), outcome.error
+                )
+        return plan
+
+
+def _list_dirs(parent: Path) -> list[Path]:
+    try:
+        return [p for p in parent.iterdir() if p.is_dir()]
+    except OSError as e:
+        logger.warning("Cannot read %s: %s", parent, e)
+        return []
+
+
+def iter_projects(parents: Iterable[Path]) -> Iterator[Path]:
+    """Iterate over directories directly under ``parents``."""  # ruff: ignore[docstring-missing-yields]
+    for parent in parents:
+        yield from _list_dirs(parent)
+
+
+@attrs.define
+class PollingWatcher:
+    """Detect changes by rescanning parents every ``interval`` seconds."""
+
+    parents: list[Path]
+    venv_patterns: list[str]
+    interval: float = 2.0
+    _state: dict[Path, Path | None] = attrs.field(factory=dict, init=False)
+
+    def __attrs_post_init__(self) -> None:
+        self._state = self._scan()
+
+    def _scan(self) -> dict[Path, Path | None]:
+        return {
+            project: infer_virtualenv_path(project, self.venv_patterns)
+            for project in iter_projects(self.parents)
+        }
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """Wait up to ``timeout`` seconds, returning projects which changed since the last call."""
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        old, self._state = self._state, self._scan()
+        return {
+            p
+            for p in old.keys() | self._state.keys()
+            if old.get(p) != self._state.get(p)
+        }
+
+    def close(self) -> None:
+        """Release resources (nothing to do)."""
+
+
+# inotify(7) constants
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = os.O_CLOEXEC
+_EVENT = struct.Struct("iIII")
+_MASK = _IN_CREATE | _IN_DELETE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_DELETE_SELF
+
+
+def inotify_available() -> bool:
+    """Whether inotify is available."""
+    return sys.platform.startswith("linux") and _load_libc() is not None
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    except OSError:  # pragma: no cover
+        return None
+    return libc if hasattr(libc, "inotify_init1") else None
+
+
+@attrs.define
+class InotifyWatcher:
+    """
+    Detect changes with inotify.
+
+    Watches each parent (for new projects), each project (for new virtual
+    environment directories), and each virtual environment directory matching
+    a pattern (for ``pyvenv.cfg``). Watches are added as directories appear.
+    """
+
+    parents: list[Path]
+    venv_patterns: list[str]
+    _libc: ctypes.CDLL = attrs.field(init=False)
+    _fd: int = attrs.field(init=False)
+    #: Watched directory and its project (``None`` for parents) by descriptor.
+    _watches: dict[int, tuple[Path, Path | None]] = attrs.field(
+        factory=dict, init=False
+    )
+
+    def __attrs_post_init__(self) -> None:
+        libc = _load_libc()
+        if libc is None:  # pragma: no cover
+            msg = "inotify is not available"
+            raise OSError(msg)
+        self._libc = libc
+        self._fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:  # pragma: no cover
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        for parent in self.parents:
+            self._add_watch(parent, None)
+            for project in iter_projects([parent]):
+                self._watch_project(project)
+
+    def _add_watch(self, path: Path, project: Path | None) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _MASK)
+        if wd < 0:
+            logger.debug("Cannot watch %s: %s", path, os.strerror(ctypes.get_errno()))
+        else:
+            self._watches[wd] = (path, project)
+
+    def _watch_project(self, project: Path) -> None:
+        self._add_watch(project, project)
+        for pattern in self.venv_patterns:
+            if (path := project / pattern).is_dir():
+                self._add_watch(path, project)
+
+    def _read_events(self) -> set[Path]:
+        changed: set[Path] = set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            name = os.fsdecode(
+                data[offset + _EVENT.size : offset + _EVENT.size + length].rstrip(b"\0")
+            )
+            offset += _EVENT.size + length
+
+            if mask & _IN_IGNORED:
+                _ = self._watches.pop(wd, None)
+                continue
+            if (watched := self._watches.get(wd)) is None:
+                continue
+            path, project = watched
+            if project is None:
+                if not name:
+                    continue
+                # event in parent: project created, removed or renamed
+                project = path / name
+                if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                    self._watch_project(project)
+            elif (
+                path == project
+                and mask & _IN_ISDIR
+                and mask & (_IN_CREATE | _IN_MOVED_TO)
+            ):
+                # possible virtual environment directory created in project
+                if name in self.venv_patterns:
+                    self._add_watch(path / name, project)
+            changed.add(project)
+        return changed
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        """Wait up to ``timeout`` seconds for events, returning changed projects."""
+        import select
+
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        return self._read_events() if ready else set()
+
+    def close(self) -> None:
+        """Close inotify file descriptor."""
+        os.close(self._fd)
+
+
+Watcher: TypeAlias = PollingWatcher | InotifyWatcher
+
+
+def get_watcher(
+    parents: list[Path],
+    venv_patterns: list[str],
+    poll: float | None = None,
+) -> Watcher:
+    """Watcher using inotify if available (and ``poll`` is ``None``), otherwise polling."""
+    if poll is None and inotify_available():
+        try:
+            return InotifyWatcher(parents, venv_patterns)
+        except OSError as e:  # pragma: no cover
+            logger.warning("Falling back to polling: %s", e)
+    return PollingWatcher(parents, venv_patterns, interval=poll or 2.0)
+
+
+def watch(
+    sync: LinkSync,
+    watcher: Watcher,
+    debounce: float = 1.0,
+    max_delay: float = 10.0,
+    stop: threading.Event | None = None,
+) -> None:
+    """
+    Apply ``sync`` to projects reported by ``watcher`` until ``stop`` is set.
+
+    Changed projects are collected until no new changes arrive for
+    ``debounce`` seconds (or for at most ``max_delay`` seconds since the first
+    change), and then updated at once.
+    """
+    stop = threading.Event() if stop is None else stop
+    pending: set[Path] = set()
+    first = last = 0.0
+    while not stop.is_set():
+        if pending:
+            now = time.monotonic()
+            due = min(last + debounce, first + max_delay)
+            if now >= due:
+                logger.debug("Updating %d project(s)", len(pending))
+                _ = sync.sync(pending)
+                pending.clear()
+                continue
+            timeout = due - now
+        else:
+            timeout = 1.0
+
+        if changed := watcher.wait(timeout):
+            last = time.monotonic()
+            if not pending:
+                first = last
+            pending |= changed
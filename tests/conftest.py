@@ -17,6 +17,15 @@ if TYPE_CHECKING:
     from typer import Typer
 
 
+@pytest.fixture(autouse=True)  # ruff: ignore[pytest-fixture-autouse]
+def _cache_dir(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # keep usage records, lock files etc out of user cache and shared locations
+    monkeypatch.setenv("UV_WORKON_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
+    monkeypatch.setenv("UV_WORKON_LOCK_DIR", str(tmp_path_factory.mktemp("locks")))
+
+
 @pytest.fixture(scope="session")
 def typer_app() -> Typer:
     from uv_workon.cli import app_typer
@@ -185,3 +194,23 @@ def mocked_get_kernelspec(
         autospec=True,
         return_value=dummy_kernelspec,
     )
+
+
+@pytest.fixture
+def jupyter_data_dir(
+    example_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    dummy_kernelspec: dict[str, Any],
+) -> Path:
+    """Isolated jupyter data directory with kernelspecs from ``dummy_kernelspec``"""
+    import json
+
+    data_dir = example_path / "jupyter"
+    for name, data in dummy_kernelspec.items():
+        (d := data_dir / "kernels" / name).mkdir(parents=True)
+        (d / "kernel.json").write_text(json.dumps(data["spec"]))
+
+    monkeypatch.setenv("JUPYTER_DATA_DIR", str(data_dir))
+    monkeypatch.setenv("JUPYTER_PATH", str(data_dir))
+    monkeypatch.setenv("JUPYTER_PREFER_ENV_PATH", "0")
+    return data_dir
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import contextlib
+import operator
 import os
 import shlex
 from functools import partial
@@ -62,7 +63,9 @@ def test__select_venv_path(
     venvs_parent_path: Path,
     workon_home_with_is_venv: Path,
     mocker: MockerFixture,
+    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
+    monkeypatch.setenv("UV_WORKON_SELECTOR", "menu")
     mock_terminalmenu = mocker.patch("simple_term_menu.TerminalMenu", autospec=True)
     func = partial(
         cli._select_virtualenv_path,
@@ -88,6 +91,44 @@ def test__select_venv_path(
     ]
 
 
+def test__select_venv_path_fuzzy(
+    workon_home_with_is_venv: Path,
+    mocker: MockerFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from collections.abc import Iterator
+
+    # default selector
+    monkeypatch.delenv("UV_WORKON_SELECTOR", raising=False)
+    mocked = mocker.patch(
+        "uv_workon.selector.fuzzy_select", autospec=True, return_value="is_venv_1"
+    )
+    path = cli._select_virtualenv_path(
+        venv_path=None,
+        venv_name=None,
+        workon_home=workon_home_with_is_venv,
+        venv_patterns=[".venv", "venv"],
+    )
+    assert path == workon_home_with_is_venv / "is_venv_1"
+    # options are streamed from discovery
+    options = mocked.call_args.args[0]
+    assert isinstance(options, Iterator)
+    assert sorted(options) == sorted(p.name for p in workon_home_with_is_venv.glob("*"))
+
+
+def test__select_venv_path_empty(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home: Path,
+    mocker: MockerFixture,
+) -> None:
+    mocked = mocker.patch("uv_workon.selector.fuzzy_select", autospec=True)
+    out = clirunner.invoke(typer_app, ["cd", "--workon-home", str(workon_home)])
+    assert not out.exit_code
+    assert out.output.strip() == "No virtual environment found"
+    assert mocked.mock_calls == []
+
+
 def test__get_venv_name_path_mapping(
     venvs_parent_path: Path,
     workon_home_with_is_venv: Path,
@@ -133,10 +174,38 @@ def test__confirm_action(
     assert func(yes, "hello") is expected
 
 
-def test__add_verbose_logger() -> None:
+@pytest.mark.parametrize(
+    ("yes", "checklist", "confirm", "expected"),
+    [
+        (None, True, False, [1]),
+        (None, False, True, [0, 1, 2]),
+        (None, False, False, []),
+        (True, True, False, [0, 1, 2]),
+        (False, True, True, []),
+    ],
+)
+def test__select_batch(
+    mocker: MockerFixture,
+    yes: bool | None,
+    checklist: bool,
+    confirm: bool,
+    expected: list[int],
+) -> None:
+    mocker.patch("uv_workon.cli._use_checklist", return_value=checklist)
+    mocked_select = mocker.patch(
+        "uv_workon.cli.select_options", autospec=True, return_value=[1]
+    )
+    mocker.patch("typer.confirm", autospec=True, return_value=confirm)
+
+    assert cli._select_batch(yes, "msg", ["a", "b", "c"]) == expected
+    assert bool(mocked_select.mock_calls) is (checklist and yes is None)
+    assert cli._select_batch(yes, "msg", []) == []
+
+
+def test__add_verbose_logger(mocker: MockerFixture) -> None:
     import logging
 
-    func = cli._callback_verbose
+    func = partial(cli._callback_verbose, mocker.MagicMock())
 
     func(verbose=-1)
     assert cli.logger.level == logging.ERROR
@@ -161,9 +230,8 @@ def workon_home_typer_app() -> Typer:
     app = typer.Typer()
 
     @app.command()
-    def dummy(workon_home: cli.WORKON_HOME_CLI) -> Path:  # pyright: ignore[reportUnusedFunction]
+    def dummy(workon_home: cli.WORKON_HOME_CLI) -> None:  # pyright: ignore[reportUnusedFunction]
         typer.echo(str(workon_home))
-        return workon_home
 
     return app
 
@@ -176,6 +244,8 @@ def workon_home_typer_app() -> Typer:
         (None, None, "~/.virtualenvs"),
         ("~/a", "~/b", "~/a"),
         ("a/b", None, "a/b"),
+        (None, f"~/b{os.pathsep}/c", f"~/b{os.pathsep}/c"),
+        (f"a{os.pathsep}{os.pathsep}a{os.pathsep}~/b", None, f"a{os.pathsep}~/b"),
     ],
 )
 def test_workon_home_option(
@@ -183,13 +253,15 @@ def test_workon_home_option(
     clirunner: CliRunner,
     environment_val: str | None,
     cli_val: str | None,
-    expected: Path,
+    expected: str,
 ) -> None:
     env = {"WORKON_HOME": environment_val} if environment_val else {}
     opts = [] if cli_val is None else ["--workon-home", cli_val]
     out = clirunner.invoke(workon_home_typer_app, opts, env=env)
     assert not out.exit_code
-    assert str(Path(expected).expanduser()) == out.output.strip()
+    assert out.output.strip() == os.pathsep.join(
+        str(Path(p).expanduser()) for p in expected.split(os.pathsep)
+    )
 
 
 @pytest.fixture(scope="session")
@@ -264,6 +336,78 @@ def test_version(
     assert f"uv-workon, version {__version__}" in out.output
 
 
+# * Timings
+def test_timings(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home_with_is_venv: Path,
+    example_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import json
+
+    from uv_workon import timing
+
+    monkeypatch.setattr(timing, "TIMINGS", timing.Timings())
+
+    timings_file = example_path / "timings.json"
+    out = clirunner.invoke(
+        typer_app,
+        [
+            "--timings",
+            "--timings-file",
+            str(timings_file),
+            "list",
+            "--workon-home",
+            str(workon_home_with_is_venv),
+        ],
+    )
+    assert not out.exit_code
+    assert "[uv-workon timings] list total" in out.stderr
+    assert "is_venv_0" in out.stdout
+    assert "timings" not in out.stdout
+
+    data = json.loads(timings_file.read_text())
+    assert data["command"] == "list"
+    assert {"import", "callback", "discovery", "validate"} <= set(data["summary"])
+
+
+def test_history_stats(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home_with_is_venv: Path,
+    example_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import json
+
+    from uv_workon import timing
+
+    monkeypatch.setenv("UV_WORKON_CACHE_DIR", str(example_path / "cache"))
+    out = clirunner.invoke(typer_app, ["stats"])
+    assert "No recorded history" in out.stderr
+
+    monkeypatch.setenv("UV_WORKON_HISTORY", "1")
+    for _ in range(2):
+        monkeypatch.setattr(timing, "TIMINGS", timing.Timings())
+        out = clirunner.invoke(
+            typer_app, ["list", "--workon-home", str(workon_home_with_is_venv)]
+        )
+        assert not out.exit_code
+
+    out = clirunner.invoke(typer_app, ["stats", "--format", "json", "-c", "list"])
+    (summary,) = json.loads(out.stdout)
+    assert summary["command"] == "list"
+    assert summary["count"] == 2  # ruff: ignore[magic-value-comparison]
+    assert summary["venvs"] > 0
+
+    out = clirunner.invoke(typer_app, ["stats"])
+    assert out.stdout.startswith("list: n=2 p50=")
+
+    out = clirunner.invoke(typer_app, ["stats", "--clear"])
+    assert not (example_path / "cache" / "history.ndjson").exists()
+
+
 # * Commands
 @pytest.mark.parametrize(
     ("pattern", "parts"),
@@ -374,6 +518,169 @@ def test_link_parent(
     assert expected_symlinks == set(workon_home.glob("*"))
 
 
+@pytest.mark.parametrize("confirm", [True, False])
+def test_link_confirm_once(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home: Path,
+    venvs_parent_path: Path,
+    mocker: MockerFixture,
+    confirm: bool,
+) -> None:
+    paths = sorted(venvs_parent_path.glob("is_venv_*"))
+    opts = ["link", "--workon-home", str(workon_home), "-j", "2"]
+    clirunner.invoke(typer_app, [*opts, *map(str, paths)])
+    assert {workon_home / p.name for p in paths} == set(workon_home.glob("*"))
+
+    # same venvs twice, with one through a different path.
+    for link in workon_home.glob("*"):
+        link.unlink()
+        link.symlink_to(venvs_parent_path / "is_venv_0")
+    mocked_confirm = mocker.patch("typer.confirm", autospec=True, return_value=confirm)
+    out = clirunner.invoke(
+        typer_app, [*opts, *map(str, paths), str(venvs_parent_path / "is_venv_0")]
+    )
+
+    assert not out.exit_code
+    assert mocked_confirm.mock_calls == [mocker.call("Overwrite 3 existing link(s)?")]
+    for p in paths:
+        assert f"{workon_home / p.name} -> " in out.output
+        assert (workon_home / p.name).resolve() == (
+            p if confirm else venvs_parent_path / "is_venv_0"
+        )
+
+
+def test_link_plan_apply(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home: Path,
+    venvs_parent_path: Path,
+    tmp_path: Path,
+) -> None:
+    import json
+
+    paths = sorted(venvs_parent_path.glob("is_venv_*"))
+    plan_path = tmp_path / "plan.json"
+    out = clirunner.invoke(
+        typer_app,
+        [
+            "link",
+            "--workon-home",
+            str(workon_home),
+            "--dry-run",
+            "--plan",
+            str(plan_path),
+            *map(str, paths),
+        ],
+    )
+    assert not out.exit_code
+    assert set(workon_home.glob("*")) == set()
+
+    data = json.loads(plan_path.read_text(encoding="utf-8"))
+    assert data["command"] == "link"
+    assert [a["kind"] for a in data["actions"]] == ["create_link"] * 3
+    assert [a["path"] for a in data["actions"]] == [
+        str(workon_home / p.name) for p in paths
+    ]
+
+    out = clirunner.invoke(typer_app, ["apply", str(plan_path), "--dry-run", "--yes"])
+    assert not out.exit_code
+    assert set(workon_home.glob("*")) == set()
+
+    out = clirunner.invoke(
+        typer_app, ["apply", "-", "--yes"], input=plan_path.read_text()
+    )
+    assert not out.exit_code
+    assert {p.resolve() for p in workon_home.glob("*")} == set(paths)
+
+    # applying again fails for links changed since plan was computed
+    (link := workon_home / paths[0].name).unlink()
+    link.symlink_to(paths[1])
+    out = clirunner.invoke(typer_app, ["apply", str(plan_path), "--yes"])
+    assert out.exit_code == 1
+    assert link.resolve() == paths[1]
+
+    out = clirunner.invoke(typer_app, ["apply", "-", "--yes"], input="[]")
+    assert out.exit_code == 2  # ruff: ignore[magic-value-comparison]
+
+
+def test_clean_plan_relative(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home_with_is_venv: Path,
+    venvs_parent_path: Path,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    link = workon_home_with_is_venv / "no_venv_0"
+    link.symlink_to(venvs_parent_path / "no_venv_0")
+    plan_path = tmp_path / "plan.json"
+
+    monkeypatch.chdir(workon_home_with_is_venv.parent)
+    out = clirunner.invoke(
+        typer_app,
+        [
+            "clean",
+            "--workon-home",
+            workon_home_with_is_venv.name,
+            "--dry-run",
+            "--plan",
+            str(plan_path),
+            "--yes",
+        ],
+    )
+    assert not out.exit_code
+
+    # applied from another directory with a link of the same relative path
+    (other := tmp_path / "other" / workon_home_with_is_venv.name).mkdir(parents=True)
+    (other_link := other / link.name).symlink_to(venvs_parent_path / "no_venv_0")
+    monkeypatch.chdir(other.parent)
+    out = clirunner.invoke(typer_app, ["apply", str(plan_path), "--yes"])
+    assert not out.exit_code
+    assert not link.is_symlink()
+    assert other_link.is_symlink()
+
+    # link removed since plan was computed
+    out = clirunner.invoke(typer_app, ["apply", str(plan_path), "--yes"])
+    assert out.exit_code == 1
+
+
+@pytest.mark.parametrize("null", [True, False])
+@pytest.mark.parametrize("stdin", [True, False])
+def test_link_from_file(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    example_path: Path,
+    workon_home: Path,
+    venvs_parent_path: Path,
+    null: bool,
+    stdin: bool,
+) -> None:
+    paths = sorted(venvs_parent_path.glob("has_dotvenv_*"))
+    text = ("\0" if null else "\n").join(map(str, paths))
+
+    if stdin:
+        opts, input_ = ["--from-file", "-"], text
+    else:
+        (path_file := example_path / "paths.txt").write_text(text)
+        opts, input_ = ["--from-file", str(path_file)], None
+
+    out = clirunner.invoke(
+        typer_app,
+        [
+            "link",
+            "--workon-home",
+            str(workon_home),
+            *opts,
+            *(["--null"] if null else []),
+        ],
+        input=input_,
+    )
+
+    assert not out.exit_code
+    assert {workon_home / p.name for p in paths} == set(workon_home.glob("*"))
+
+
 def test_link_help(
     typer_app: Typer,
     clirunner: CliRunner,
@@ -399,6 +706,111 @@ def test_list(
     assert expected == out.output.strip()
 
 
+@pytest.mark.parametrize("unsorted", [True, False])
+@pytest.mark.parametrize("fmt", ["json", "ndjson", "null"])
+def test_list_format(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home_with_is_venv: Path,
+    fmt: str,
+    unsorted: bool,
+) -> None:
+    import json
+
+    out = clirunner.invoke(
+        typer_app,
+        [
+            "list",
+            "--workon-home",
+            str(workon_home_with_is_venv),
+            "--format",
+            fmt,
+            *(["--unsorted"] if unsorted else []),
+        ],
+    )
+    assert not out.exit_code
+
+    links = sorted(workon_home_with_is_venv.glob("*"), key=lambda x: x.name)
+    expected = [
+        {
+            "name": p.name,
+            "path": str(p),
+            "target": str(p.resolve()),
+            "reachable": True,
+        }
+        for p in links
+    ]
+    if fmt == "json":
+        records = json.loads(out.output)
+    elif fmt == "ndjson":
+        records = [json.loads(line) for line in out.output.splitlines()]
+    else:
+        records = [{"name": name} for name in out.output.split("\0")[:-1]]
+        expected = [{"name": p.name} for p in links]
+
+    if unsorted:
+        records = sorted(records, key=operator.itemgetter("name"))
+    assert records == expected
+
+
+def test_list_unreachable(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home_with_is_venv: Path,
+    mocker: MockerFixture,
+    tmp_path: Path,
+) -> None:
+    import threading
+
+    from uv_workon.validate import is_valid_virtualenv
+
+    release = threading.Event()
+
+    def probe(path: Path) -> bool:
+        if path.name == "is_venv_1":
+            release.wait()
+        return is_valid_virtualenv(path)
+
+    mocker.patch("uv_workon.core.is_valid_virtualenv", side_effect=probe)
+    out = clirunner.invoke(
+        typer_app,
+        [
+            "list",
+            "--workon-home",
+            str(workon_home_with_is_venv),
+            "--probe-timeout",
+            "0.1",
+        ],
+        env={"UV_WORKON_CACHE_DIR": str(tmp_path / "cache")},
+    )
+    release.set()
+
+    assert not out.exit_code
+    lines = out.output.strip().splitlines()
+    assert lines[1] == f"{'is_venv_1':25}  <unreachable>"
+    assert (
+        lines[0]
+        == f"{'is_venv_0':25}  {(workon_home_with_is_venv / 'is_venv_0').resolve()}"
+    )
+
+
+def test_list_zero_probe_timeout(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home_with_is_venv: Path,
+    tmp_path: Path,
+) -> None:
+    env = {"UV_WORKON_CACHE_DIR": str(tmp_path / "cache")}
+    opts = ["list", "--workon-home", str(workon_home_with_is_venv)]
+    out = clirunner.invoke(typer_app, [*opts, "--probe-timeout", "0"], env=env)
+    assert not out.exit_code
+    assert "<unreachable>" not in out.output
+    assert not (tmp_path / "cache" / "unreachable.json").exists()
+
+    out = clirunner.invoke(typer_app, [*opts, "--probe-timeout", "5"], env=env)
+    assert "<unreachable>" not in out.output
+
+
 @pytest.mark.parametrize("dry_run", [False, True])
 def test_link_workon_home_to_venv(
     typer_app: Typer,
@@ -487,6 +899,48 @@ def test_name_completions(
     ]
 
 
+def test_name_resolution(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home_with_is_venv: Path,
+) -> None:
+    from uv_workon.index import AmbiguousNameError
+
+    cli._virtualenv_name_index.cache_clear()
+    opts = ["cd", "--workon-home", str(workon_home_with_is_venv), "--command"]
+    out = clirunner.invoke(typer_app, [*opts, "-n", "IS_VENV_1"])
+    assert not out.exit_code
+    assert out.output.strip() == str(
+        (workon_home_with_is_venv / "is_venv_1").resolve().parent
+    )
+
+    out = clirunner.invoke(typer_app, [*opts, "-n", "is_venv"])
+    assert isinstance(out.exception, AmbiguousNameError)
+
+
+def test_name_completions_mru(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home_with_is_venv: Path,
+) -> None:
+    for name in ("is_venv_2", "is_venv_1", "is_venv_2"):
+        out = clirunner.invoke(
+            typer_app,
+            ["cd", "-n", name, "--workon-home", str(workon_home_with_is_venv)],
+        )
+        assert not out.exit_code
+
+    d = cast(
+        "Context",
+        type("Dummy", (), {"params": {"workon_home": workon_home_with_is_venv}})(),
+    )
+    assert list(cli._complete_virtualenv_names(d, "is_")) == [
+        "is_venv_2",
+        "is_venv_1",
+        "is_venv_0",
+    ]
+
+
 @pytest.mark.parametrize("dry", [True, False])
 @pytest.mark.parametrize("yes", [True, False])
 def test_clean(
@@ -537,6 +991,92 @@ def test_clean(
         assert link.exists()
 
 
+@pytest.mark.parametrize("confirm", [True, False])
+def test_clean_confirm_once(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home_with_is_venv: Path,
+    venvs_parent_path: Path,
+    mocker: MockerFixture,
+    confirm: bool,
+) -> None:
+    links = [workon_home_with_is_venv / f"no_venv_{i}" for i in range(3)]
+    for i, link in enumerate(links):
+        link.symlink_to(venvs_parent_path / f"no_venv_{i}")
+
+    mocked_confirm = mocker.patch("typer.confirm", autospec=True, return_value=confirm)
+    out = clirunner.invoke(
+        typer_app, ["clean", "--workon-home", str(workon_home_with_is_venv)]
+    )
+
+    assert not out.exit_code
+    assert mocked_confirm.mock_calls == [mocker.call("Remove 3 broken link(s)?")]
+    for i, link in enumerate(links):
+        assert f"{link.name}  -> {venvs_parent_path / f'no_venv_{i}'}" in out.output
+        assert link.is_symlink() is not confirm
+    for i in range(3):
+        assert (workon_home_with_is_venv / f"is_venv_{i}").exists()
+
+
+def test_clean_checklist(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home_with_is_venv: Path,
+    venvs_parent_path: Path,
+    mocker: MockerFixture,
+) -> None:
+    links = [workon_home_with_is_venv / f"no_venv_{i}" for i in range(3)]
+    for i, link in enumerate(links):
+        link.symlink_to(venvs_parent_path / f"no_venv_{i}")
+
+    mocker.patch("uv_workon.cli._use_checklist", return_value=True)
+    mocked_select = mocker.patch(
+        "uv_workon.cli.select_options", autospec=True, return_value=[0, 2]
+    )
+    out = clirunner.invoke(
+        typer_app, ["clean", "--workon-home", str(workon_home_with_is_venv)]
+    )
+
+    assert not out.exit_code
+    items = mocked_select.call_args.args[0]
+    kept = items[1].split()[0]
+    assert sorted(link.name for link in links if link.is_symlink()) == [kept]
+
+
+def test_clean_format(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home_with_is_venv: Path,
+    venvs_parent_path: Path,
+) -> None:
+    import json
+
+    link = workon_home_with_is_venv / "no_venv_0"
+    link.symlink_to(venvs_parent_path / "no_venv_0")
+
+    opts = [
+        "clean",
+        "--workon-home",
+        str(workon_home_with_is_venv),
+        "--format",
+        "ndjson",
+    ]
+    out = clirunner.invoke(typer_app, [*opts, "--dry-run"])
+    assert not out.exit_code
+    assert [json.loads(line) for line in out.output.splitlines()] == [
+        {
+            "name": "no_venv_0",
+            "link": str(link),
+            "target": str(venvs_parent_path / "no_venv_0"),
+        }
+    ]
+    assert link.is_symlink()
+
+    out = clirunner.invoke(typer_app, opts)
+    assert out.exit_code == 2  # ruff: ignore[magic-value-comparison]
+    assert link.is_symlink()
+
+
 def test_run_help(
     typer_app: Typer,
     clirunner: CliRunner,
@@ -728,6 +1268,35 @@ def test_install_ipykernels(
     )
 
 
+@skip_if_no_jupyter_client
+def test_install_ipykernels_from_file(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home_with_is_venv: Path,
+    venvs_parent_path: Path,
+) -> None:
+    paths = [venvs_parent_path / f"has_dotvenv_{i}" for i in range(2)]
+    out = clirunner.invoke(
+        typer_app,
+        [
+            "kernels",
+            "install",
+            "--workon-home",
+            str(workon_home_with_is_venv),
+            "--dry-run",
+            "--from-file",
+            "-",
+            "-0",
+        ],
+        input="\0".join(map(str, paths)),
+    )
+
+    assert not out.exit_code
+    for i in range(2):
+        assert f"--name has_dotvenv_{i} " in out.output
+    assert "has_dotvenv_2" not in out.output
+
+
 @skip_if_no_jupyter_client
 @pytest.mark.parametrize("yes", [True, False])
 def test_install_ipykernels_replace(
@@ -745,7 +1314,7 @@ def test_install_ipykernels_replace(
         return_value=dummy_kernelspec_with_replace,
     )
     mocker.patch("typer.confirm", autospec=True, return_value=False)
-    mocked_uv_run = mocker.patch("uv_workon.cli.uv_run", autospec=True)
+    mocked_uv_run = mocker.patch("uv_workon.plan.uv_run", autospec=True)
 
     out = clirunner.invoke(
         typer_app,
@@ -782,6 +1351,33 @@ def test_install_ipykernels_replace(
         assert mocked_uv_run.mock_calls == []
 
 
+@skip_if_no_jupyter_client
+def test_install_ipykernels_replace_confirm_once(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home_with_is_venv: Path,
+    dummy_kernelspec_with_replace: dict[str, Any],
+    mocker: MockerFixture,
+) -> None:
+    spec = dummy_kernelspec_with_replace["is_venv_0"]
+    mocker.patch(
+        "uv_workon.kernels.get_kernelspecs",
+        autospec=True,
+        return_value={"is_venv_0": spec, "is_venv_1": spec},
+    )
+    mocked_confirm = mocker.patch("typer.confirm", autospec=True, return_value=False)
+    mocked_uv_run = mocker.patch("uv_workon.plan.uv_run", autospec=True)
+
+    out = clirunner.invoke(
+        typer_app,
+        ["kernels", "install", "--workon-home", str(workon_home_with_is_venv), "--all"],
+    )
+
+    assert not out.exit_code
+    assert mocked_confirm.mock_calls == [mocker.call("Reinstall 2 existing kernel(s)?")]
+    assert [c.args[0].name for c in mocked_uv_run.mock_calls] == ["is_venv_2"]
+
+
 @skip_if_no_jupyter_client
 @pytest.mark.parametrize("yes", [True, False])
 @pytest.mark.parametrize(
@@ -862,3 +1458,146 @@ def test__main__(
         import uv_workon.__main__  # ruff:ignore[unused-import]
 
         mocked_app.assert_called_once_with(prog_name="uv-workon")
+
+
+@skip_if_no_jupyter_client
+def test_list_kernels_format(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    jupyter_data_dir: Path,
+) -> None:
+    import json
+
+    out = clirunner.invoke(typer_app, ["kernels", "list", "--format", "ndjson"])
+    assert not out.exit_code
+
+    records = {r["name"]: r for r in map(json.loads, out.output.splitlines())}
+    assert {name: r["broken"] for name, r in records.items()} == {
+        "dummy0": True,
+        "dummy1": True,
+        "good": False,
+    }
+    assert records["good"]["resource_dir"] == str(jupyter_data_dir / "kernels" / "good")
+
+
+def test_multiple_workon_homes(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    tmp_path: Path,
+    workon_home_with_is_venv: Path,
+    venvs_parent_path: Path,
+) -> None:
+    local = tmp_path / "local"
+    local.mkdir()
+    (local / "is_venv_1").symlink_to(venvs_parent_path / "has_venv_1" / "venv")
+    homes = os.pathsep.join([str(local), str(workon_home_with_is_venv)])
+
+    cli._virtualenv_name_index.cache_clear()
+    opts = ["cd", "--workon-home", homes, "--command"]
+    # local home shadows shared home
+    out = clirunner.invoke(typer_app, [*opts, "-n", "is_venv_1"])
+    assert out.output.strip() == str(venvs_parent_path / "has_venv_1")
+    out = clirunner.invoke(typer_app, [*opts, "-n", "is_venv_0"])
+    assert out.output.strip() == str(venvs_parent_path)
+
+    # new links go to first writable home
+    out = clirunner.invoke(
+        typer_app,
+        ["link", "--workon-home", homes, str(venvs_parent_path / "has_venv_0")],
+    )
+    assert not out.exit_code
+    assert (local / "has_venv_0").is_symlink()
+    assert not (workon_home_with_is_venv / "has_venv_0").exists()
+
+
+def test_publish(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home_with_is_venv: Path,
+) -> None:
+    import json
+
+    from uv_workon.snapshot import get_snapshot_path
+
+    out = clirunner.invoke(
+        typer_app, ["publish", "--workon-home", str(workon_home_with_is_venv)]
+    )
+    assert not out.exit_code
+    path = get_snapshot_path(workon_home_with_is_venv)
+    assert out.output.strip() == f"Published 3 virtual environment(s) to {path}"
+    assert path.exists()
+
+    out = clirunner.invoke(
+        typer_app,
+        ["list", "--workon-home", str(workon_home_with_is_venv), "--format", "json"],
+    )
+    assert [r["name"] for r in json.loads(out.stdout)] == [
+        f"is_venv_{i}" for i in range(3)
+    ]
+
+
+def test_watch_once(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home: Path,
+    venvs_parent_path: Path,
+) -> None:
+    out = clirunner.invoke(typer_app, ["watch", "--workon-home", str(workon_home)])
+    assert out.exit_code == 2  # ruff: ignore[magic-value-comparison]
+
+    out = clirunner.invoke(
+        typer_app,
+        [
+            "watch",
+            "--once",
+            "--parent",
+            str(venvs_parent_path),
+            "--workon-home",
+            str(workon_home),
+        ],
+    )
+    assert not out.exit_code
+    assert sorted(p.name for p in workon_home.iterdir()) == sorted(
+        f"{kind}_{i}"
+        for kind in ("has_dotvenv", "has_venv", "is_venv")
+        for i in range(3)
+    )
+
+
+def test_switch(
+    typer_app: Typer,
+    clirunner: CliRunner,
+    workon_home: Path,
+    venvs_parent_path: Path,
+) -> None:
+    opts = ["--workon-home", str(workon_home)]
+    out = clirunner.invoke(typer_app, ["switch", "prod", *opts])
+    assert out.exit_code == 2  # ruff: ignore[magic-value-comparison]
+
+    for name in ("has_venv_0", "has_dotvenv_0"):
+        out = clirunner.invoke(
+            typer_app, ["switch", "prod", str(venvs_parent_path / name), *opts]
+        )
+        assert not out.exit_code
+    assert (
+        workon_home / "prod"
+    ).resolve() == venvs_parent_path / "has_dotvenv_0" / ".venv"
+
+    out = clirunner.invoke(typer_app, ["switch", "prod", "--history", *opts])
+    assert out.output.strip() == os.path.relpath(
+        venvs_parent_path / "has_venv_0" / "venv", workon_home
+    )
+
+    out = clirunner.invoke(typer_app, ["switch", "prod", "--rollback", *opts])
+    assert not out.exit_code
+    assert (workon_home / "prod").resolve() == venvs_parent_path / "has_venv_0" / "venv"
+
+    # existing directory is not replaced
+    (workon_home / "real").mkdir()
+    out = clirunner.invoke(
+        typer_app, ["switch", "real", str(venvs_parent_path / "has_venv_0"), *opts]
+    )
+    assert out.exit_code == 2  # ruff: ignore[magic-value-comparison]
+    assert "not a symlink" in out.output
+    assert (workon_home / "real").is_dir()
+    (workon_home / "real").rmdir()
@@ -11,7 +11,10 @@ import pytest
 
 from uv_workon.core import (
     VirtualEnvPathAndLink,
+    deduplicate_virtualenv_links,
     generate_shell_config,
+    get_virtualenv_targets,
+    replace_symlink,
     uv_run,
 )
 
@@ -100,6 +103,62 @@ def test_find_venvs_with_name(venvs_parent_path: Path, workon_home: Path) -> Non
         )
 
 
+def test_deduplicate_virtualenv_links(
+    venvs_parent_path: Path, workon_home: Path
+) -> None:
+    path = venvs_parent_path / "has_dotvenv_0"
+    (other := workon_home.parent / "other").symlink_to(path)
+
+    objs = list(
+        VirtualEnvPathAndLink.from_paths_and_workon(
+            [path, path / ".venv", other, venvs_parent_path / "is_venv_0"],
+            names=["a", "b", "c", "a"],
+            workon_home=workon_home,
+            venv_patterns=[".venv", "venv"],
+        )
+    )
+
+    unique, rejected = deduplicate_virtualenv_links(objs)
+    assert unique == objs[:1]
+    assert rejected == objs[-1:]
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_get_virtualenv_targets(
+    workon_home_with_is_venv: Path, venvs_parent_path: Path, jobs: int
+) -> None:
+    (workon_home_with_is_venv / "a_bad").symlink_to(venvs_parent_path / "no_venv_0")
+
+    out = list(get_virtualenv_targets(workon_home_with_is_venv, jobs=jobs))
+    assert out == [
+        (workon_home_with_is_venv / f"is_venv_{i}", venvs_parent_path / f"is_venv_{i}")
+        for i in range(3)
+    ]
+
+
+def test_get_virtualenv_targets_streaming(
+    workon_home_with_is_venv: Path, mocker: MockerFixture
+) -> None:
+    import threading
+
+    from uv_workon.validate import is_valid_virtualenv
+
+    release = threading.Event()
+
+    def probe(path: Path) -> bool:
+        if path.name == "is_venv_2":
+            assert release.wait(5)
+        return is_valid_virtualenv(path)
+
+    mocker.patch("uv_workon.core.is_valid_virtualenv", side_effect=probe)
+
+    out = get_virtualenv_targets(workon_home_with_is_venv, jobs=3)
+    # first results available before last finishes
+    assert [next(out)[0].name for _ in range(2)] == ["is_venv_0", "is_venv_1"]
+    release.set()
+    assert [x[0].name for x in out] == ["is_venv_2"]
+
+
 def test_generate_shell_config() -> None:
     assert "uv-workon" in generate_shell_config()
 
@@ -153,3 +212,35 @@ def test_uv_run(mocker: MockerFixture) -> None:
             },
         )
     ]
+
+
+def test_replace_symlink(tmp_path: Path) -> None:
+    link = tmp_path / "link"
+    replace_symlink(link, "a")
+    assert link.readlink() == Path("a")
+
+    # observer never sees a missing link while replacing
+    import threading
+
+    stop = threading.Event()
+    missing: list[bool] = []
+
+    def _observe() -> None:
+        while not stop.is_set():
+            missing.append(not link.is_symlink())
+
+    thread = threading.Thread(target=_observe)
+    thread.start()
+    for i in range(200):
+        replace_symlink(link, f"target_{i}")
+    stop.set()
+    thread.join()
+    assert not any(missing)
+    assert link.readlink() == Path("target_199")
+    assert [p.name for p in tmp_path.iterdir()] == ["link"]
+
+    # failure leaves no temporary link
+    (directory := tmp_path / "dir").mkdir()
+    with pytest.raises(OSError):  # ruff: ignore[pytest-raises-too-broad]
+        replace_symlink(directory, "a")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["dir", "link"]
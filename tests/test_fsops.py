@@ -0,0 +1,185 @@
+"""Filesystem operation budgets for discovery and validation."""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections import Counter
+from typing import TYPE_CHECKING
+
+import pytest
+
+from uv_workon import cli
+from uv_workon.core import (
+    VirtualEnvPathAndLink,
+    get_invalid_symlinks,
+    get_virtualenv_paths,
+    get_virtualenv_targets,
+)
+from uv_workon.fsops import count_fs_operations, patch_fs_operations
+from uv_workon.validate import is_valid_virtualenv
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+    from typing import Any
+
+    from typer import Typer
+    from typer.testing import CliRunner
+
+NUM_VALID = 50
+NUM_BROKEN = 5
+
+
+@pytest.fixture(scope="module")
+def synthetic_home(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    root = tmp_path_factory.mktemp("synthetic")
+    home = root / "workon_home"
+    home.mkdir()
+    for i in range(NUM_VALID):
+        venv = root / f"project_{i}" / ".venv"
+        venv.mkdir(parents=True)
+        (venv / "pyvenv.cfg").write_text("home = /usr/bin\n")
+        (home / f"project_{i}").symlink_to(venv)
+    for i in range(NUM_BROKEN):
+        (home / f"broken_{i}").symlink_to(root / f"missing_{i}")
+    return home
+
+
+def test_patch_fs_operations(tmp_path: Path) -> None:
+    calls: list[str] = []
+
+    def hook(
+        category: str,
+        func: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> Any:
+        calls.append(category)
+        return func(*args, **kwargs)
+
+    stat = os.stat
+    with patch_fs_operations(hook):
+        assert os.stat is not stat
+        (tmp_path / "a").symlink_to(tmp_path / "b")
+        assert (tmp_path / "a").is_symlink()
+        _ = (tmp_path / "a").lstat()
+        _ = list(tmp_path.iterdir())
+        (tmp_path / "a").unlink()
+    assert os.stat is stat
+    assert calls == ["symlink", "lstat", "lstat", "readdir", "unlink"]
+
+
+def test_is_valid_virtualenv_single_stat(synthetic_home: Path) -> None:
+    with count_fs_operations() as counts:
+        assert is_valid_virtualenv(synthetic_home / "project_0")
+        assert not is_valid_virtualenv(synthetic_home / "broken_0")
+    assert counts == {"stat": 2}
+
+
+@pytest.mark.parametrize(
+    ("func", "budget"),
+    [
+        (
+            lambda home: list(get_virtualenv_paths(home)),
+            {"readdir": 1, "stat": NUM_VALID + NUM_BROKEN},
+        ),
+        (
+            lambda home: list(get_invalid_symlinks(home, jobs=1)),
+            {
+                "readdir": 1,
+                "lstat": NUM_VALID + NUM_BROKEN,
+                "stat": NUM_VALID + NUM_BROKEN,
+            },
+        ),
+        (
+            # cold index: stat of workon_home, discovery, and saving index
+            cli._virtualenv_name_index.__wrapped__,
+            {"readdir": 1, "stat": 1 + NUM_VALID + NUM_BROKEN, "rename": 1},
+        ),
+    ],
+)
+def test_discovery_budget(
+    synthetic_home: Path, func: Callable[[Path], Any], budget: dict[str, int]
+) -> None:
+    with count_fs_operations() as counts:
+        func(synthetic_home)
+    assert counts == budget
+
+
+def test_targets_budget(synthetic_home: Path) -> None:
+    with count_fs_operations() as counts:
+        out = list(get_virtualenv_targets(synthetic_home, jobs=1))
+    assert len(out) == NUM_VALID
+
+    # one validation stat per link, resolve only valid links
+    assert counts["readdir"] == 1
+    assert counts["stat"] == NUM_VALID + NUM_BROKEN
+    assert counts["readlink"] == NUM_VALID
+    assert set(counts) <= {"readdir", "stat", "lstat", "readlink"}
+
+
+def test_link_parent_budget(synthetic_home: Path, tmp_path: Path) -> None:
+    parents = [synthetic_home.parent / f"project_{i}" for i in range(NUM_VALID)]
+    with count_fs_operations() as counts:
+        objs = list(
+            VirtualEnvPathAndLink.from_paths_and_workon(
+                parents, workon_home=tmp_path, venv_patterns=[".venv", "venv"]
+            )
+        )
+    assert len(objs) == NUM_VALID
+    # at most a handful of operations per parent, and no directory scans
+    assert "readdir" not in counts
+    assert sum(counts.values()) <= 10 * NUM_VALID
+
+
+def test_verbose_logs_fs_operations(
+    clirunner: CliRunner,
+    typer_app: Typer,
+    synthetic_home: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    stat = os.stat
+    with caplog.at_level(logging.DEBUG, logger=cli.logger.name):
+        out = clirunner.invoke(
+            typer_app, ["list", "--workon-home", str(synthetic_home), "-vv"]
+        )
+    assert out.exit_code == 0
+    assert os.stat is stat
+    assert any(
+        record.getMessage().startswith("Filesystem operations: {")
+        for record in caplog.records
+    )
+
+
+def test_cli_list_budget(
+    clirunner: CliRunner,
+    typer_app: Typer,
+    workon_home_with_is_venv: Path,
+    venvs_parent_path: Path,
+) -> None:
+    home = workon_home_with_is_venv
+    (home / "no_venv_0").symlink_to(venvs_parent_path / "no_venv_0")
+    valid = sorted(home.glob("is_venv_*"))
+    with count_fs_operations() as resolve_counts:
+        for path in valid:
+            _ = path.resolve()
+
+    with count_fs_operations() as counts:
+        out = clirunner.invoke(typer_app, ["list", "--workon-home", str(home)])
+    assert out.exit_code == 0
+    assert [line.split()[0] for line in out.output.splitlines()] == [
+        p.name for p in valid
+    ]
+    # one scan of workon_home, one validation stat per link, and resolving
+    # valid links (the missing snapshot is not stat'ed)
+    assert counts == Counter(readdir=1, stat=len(valid) + 1) + resolve_counts
+
+    # with published snapshot, only a stat of workon_home
+    assert not clirunner.invoke(
+        typer_app, ["publish", "--workon-home", str(home)]
+    ).exit_code
+    with count_fs_operations() as counts:
+        snapshot_out = clirunner.invoke(typer_app, ["list", "--workon-home", str(home)])
+    assert snapshot_out.output == out.output
+    assert counts == {"stat": 1}
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from uv_workon import history, timing
+from uv_workon.history import Record
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def history_path(tmp_path: Path) -> Path:
+    return tmp_path / "cache" / "history.ndjson"
+
+
+def test_record_from_timings() -> None:
+    timings = timing.Timings()
+    timings.enable()
+    timings.command = "list"
+    for _ in range(3):
+        with timings.span("validate"):
+            pass
+    timings.count("cache_hit")
+
+    record = Record.from_timings(timings, workon_home="/a/b")
+    assert record.command == "list"
+    assert record.venvs == 3  # ruff: ignore[magic-value-comparison]
+    assert record.workon_home == "/a/b"
+    assert record.cache == "hit"
+
+    timings.count("cache_stale")
+    assert Record.from_timings(timings).cache == "stale"
+
+    timings.count("cache_miss")
+    assert Record.from_timings(timings).cache == "miss"
+
+
+def test_append_read(history_path: Path) -> None:
+    assert list(history.read_records(history_path)) == []
+
+    records = [Record("list", 0.1, time=1.0), Record("cd", 0.2, time=2.0)]
+    for record in records:
+        history.append_record(record, history_path)
+    with history_path.open("a", encoding="utf-8") as f:
+        _ = f.write("not json\n")
+    assert list(history.read_records(history_path)) == records
+
+    history.clear_history(history_path)
+    assert not history_path.exists()
+
+
+def test_rotate(history_path: Path) -> None:
+    line_size = len(Record("list", 0.1, time=1.0).to_json()) + 1
+    for i in range(5):
+        history.append_record(
+            Record("list", 0.1, time=float(i)), history_path, max_bytes=line_size
+        )
+
+    rotated = history_path.with_name("history.ndjson.1")
+    assert rotated.exists()
+    # bounded, and most recent records kept
+    assert [r.time for r in history.read_records(history_path)] == [2.0, 3.0, 4.0]
+
+
+def test_append_error(tmp_path: Path) -> None:
+    (tmp_path / "file").touch()
+    # parent is a file, so error is ignored
+    history.append_record(Record("list", 0.1), tmp_path / "file" / "history.ndjson")
+
+
+def test_format_summary() -> None:
+    (summary,) = history.summarize([
+        Record("list", 0.005, cache="hit"),
+        Record("list", 0.005, cache="miss"),
+        Record("list", 0.005, cache="stale"),
+        Record("list", 6.0),
+    ])
+    assert summary["cache_stale"] == 1
+    out = history.format_summary(summary, width=10)
+    assert out.splitlines() == [
+        "list: n=4 p50=5.0ms p90=6000.0ms p99=6000.0ms max=6000.0ms cache=1/3 stale=1",
+        "       < 10 ms | ########## 3",
+        "    >= 5000 ms | ####       1",
+    ]
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from uv_workon.homes import WorkonHomes
+
+
+@pytest.fixture
+def homes(
+    tmp_path: Path, workon_home_with_is_venv: Path, venvs_parent_path: Path
+) -> WorkonHomes:
+    local = tmp_path / "local"
+    local.mkdir()
+    (local / "is_venv_1").symlink_to(venvs_parent_path / "is_venv_2")
+    (local / "local_only").symlink_to(venvs_parent_path / "is_venv_0")
+    return WorkonHomes([local, workon_home_with_is_venv])
+
+
+def test_from_value(tmp_path: Path) -> None:
+    value = os.pathsep.join([str(tmp_path / "a"), "", "~/b"])
+    homes = WorkonHomes.from_value(value)
+    assert homes.roots == (tmp_path / "a", Path("~/b").expanduser())
+    assert str(homes) == os.pathsep.join(map(str, homes.roots))
+    assert WorkonHomes.from_value(homes) is homes
+    assert len(WorkonHomes.from_value(tmp_path)) == 1
+
+    with pytest.raises(ValueError, match="Length of 'roots'"):
+        _ = WorkonHomes.from_value("")
+
+
+def test_primary(tmp_path: Path) -> None:
+    missing, existing = tmp_path / "missing", tmp_path / "existing"
+    existing.mkdir()
+    assert WorkonHomes([missing, existing]).primary == existing
+    assert WorkonHomes([missing]).primary == missing
+
+
+def test_find(homes: WorkonHomes, venvs_parent_path: Path) -> None:
+    local, shared = homes.roots
+    assert homes.find("is_venv_1") == local / "is_venv_1"
+    assert (
+        homes.find("is_venv_1") or local
+    ).resolve() == venvs_parent_path / "is_venv_2"
+    assert homes.find("is_venv_0") == shared / "is_venv_0"
+    assert homes.find("local_only") == local / "local_only"
+    assert homes.find("missing") is None
+
+
+def test_iter_virtualenv_paths(homes: WorkonHomes) -> None:
+    local, shared = homes.roots
+    assert sorted(homes.iter_virtualenv_paths()) == sorted([
+        local / "is_venv_1",
+        local / "local_only",
+        shared / "is_venv_0",
+        shared / "is_venv_2",
+    ])
+
+
+def test_iter_virtualenv_targets(homes: WorkonHomes, venvs_parent_path: Path) -> None:
+    local, shared = homes.roots
+    assert list(homes.iter_virtualenv_targets()) == [
+        (shared / "is_venv_0", venvs_parent_path / "is_venv_0"),
+        (local / "is_venv_1", venvs_parent_path / "is_venv_2"),
+        (shared / "is_venv_2", venvs_parent_path / "is_venv_2"),
+        (local / "local_only", venvs_parent_path / "is_venv_0"),
+    ]
+    assert sorted(homes.iter_virtualenv_targets(sort=False)) == sorted(
+        homes.iter_virtualenv_targets()
+    )
+
+
+def test_name_index(homes: WorkonHomes) -> None:
+    assert homes.name_index().names == (
+        "is_venv_0",
+        "is_venv_1",
+        "is_venv_2",
+        "local_only",
+    )
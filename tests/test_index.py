@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from uv_workon import index, timing
+from uv_workon.fsops import count_fs_operations
+from uv_workon.index import AmbiguousNameError, NameIndex
+from uv_workon.validate import NoVirtualEnvError
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def names() -> NameIndex:
+    return NameIndex.from_names([
+        "numpy-dev",
+        "numba",
+        "Pandas",
+        "pandas2",
+        "scipy",
+        "Scipy-old",
+    ])
+
+
+def test_prefix(names: NameIndex) -> None:
+    assert names.prefix("") == list(names.names)
+    assert names.prefix("num") == ["numba", "numpy-dev"]
+    assert names.prefix("numpy-dev") == ["numpy-dev"]
+    assert names.prefix("x") == []
+    assert names.prefix("pa") == ["pandas2"]
+    assert names.prefix("PA", ignore_case=True) == ["Pandas", "pandas2"]
+    assert "scipy" in names
+    assert "sci" not in names
+
+
+@pytest.mark.parametrize(
+    ("name", "expected"),
+    [
+        ("scipy", "scipy"),
+        ("SCIPY", "scipy"),
+        ("numpy", "numpy-dev"),
+        ("Scipy-", "Scipy-old"),
+        ("scipy-o", "Scipy-old"),
+        ("pandas", "Pandas"),
+        ("pandas2", "pandas2"),
+    ],
+)
+def test_resolve(names: NameIndex, name: str, expected: str) -> None:
+    assert names.resolve(name) == expected
+
+
+def test_match(names: NameIndex) -> None:
+    assert names.match("scipy-o") == "Scipy-old"
+    assert names.match("other") is None
+    with pytest.raises(AmbiguousNameError):
+        _ = names.match("nu")
+
+
+def test_resolve_errors(names: NameIndex) -> None:
+    with pytest.raises(AmbiguousNameError, match="numba, numpy-dev"):
+        _ = names.resolve("nu")
+    with pytest.raises(NoVirtualEnvError, match="No virtual environment matching"):
+        _ = names.resolve("other")
+
+
+def test_load_name_index(
+    workon_home_with_is_venv: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(timing, "TIMINGS", timings := timing.Timings())
+    timings.enable()
+
+    out = index.load_name_index(workon_home_with_is_venv)
+    assert out.names == tuple(f"is_venv_{i}" for i in range(3))
+    assert timings.counts == {"cache_miss": 1}
+
+    # current index is loaded without discovery
+    with count_fs_operations() as counts:
+        assert index.load_name_index(workon_home_with_is_venv) == out
+    assert counts == {"stat": 1}
+    assert timings.counts == {"cache_miss": 1, "cache_hit": 1}
+
+    # adding a link invalidates index
+    (workon_home_with_is_venv / "is_venv_3").symlink_to(
+        workon_home_with_is_venv / "is_venv_0"
+    )
+    assert "is_venv_3" in index.load_name_index(workon_home_with_is_venv)
+    assert timings.counts["cache_miss"] == 2  # ruff: ignore[magic-value-comparison]
@@ -8,6 +8,7 @@ import pytest
 from uv_workon import kernels
 
 if TYPE_CHECKING:
+    from pathlib import Path
     from typing import Any
 
     from pytest_mock import MockerFixture
@@ -84,3 +85,17 @@ def test_remove_kernelspecs(mocker: MockerFixture) -> None:
         mocker.call(spec_names=["a", "b"], force=True),
         mocker.call().start(),
     ]
+
+
+@skip_if_no_jupyter_client
+@pytest.mark.parametrize("sort", [True, False])
+def test_iter_kernelspecs(
+    jupyter_data_dir: Path, dummy_kernelspec: dict[str, Any], sort: bool
+) -> None:
+    out = dict(kernels.iter_kernelspecs(sort=sort))
+    if sort:
+        assert list(out) == sorted(out)
+    for name, data in dummy_kernelspec.items():
+        assert out[name]["resource_dir"] == str(jupyter_data_dir / "kernels" / name)
+        assert out[name]["spec"]["argv"] == data["spec"]["argv"]
+        assert kernels.is_broken_kernelspec(out[name]) is (name != "good")
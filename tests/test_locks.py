@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import logging
+import os
+import stat
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from uv_workon import locks, timing
+from uv_workon.core import VirtualEnvPathAndLink
+
+
+def test_get_link_lock_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    a = locks.get_link_lock_path(tmp_path / "home_a" / "name")
+    assert a.name == "name.lock"
+    assert a != locks.get_link_lock_path(tmp_path / "home_b" / "name")
+    assert a.parent == locks.get_link_lock_path(tmp_path / "home_a" / "other").parent
+
+    monkeypatch.setenv(locks.LOCK_DIR_ENV, str(tmp_path / "shared"))
+    assert locks.get_link_lock_path(tmp_path / "home_a" / "name").is_relative_to(
+        tmp_path / "shared"
+    )
+
+
+def test_get_lock_dir(monkeypatch: pytest.MonkeyPatch) -> None:
+    import tempfile
+
+    monkeypatch.delenv(locks.LOCK_DIR_ENV)
+    # shared by all users
+    assert locks.get_lock_dir().parent == Path(tempfile.gettempdir())
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="no file modes")
+def test_link_lock_permissions(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv(locks.LOCK_DIR_ENV, str(lock_dir := tmp_path / "locks"))
+    lock = locks.get_link_lock_path(tmp_path / "home" / "name")
+    umask = os.umask(0o077)
+    try:
+        with locks.link_lock(tmp_path / "home" / "name"):
+            pass
+    finally:
+        _ = os.umask(umask)
+    assert stat.S_IMODE(lock.stat().st_mode) == 0o666  # ruff: ignore[magic-value-comparison]
+    for path in (lock_dir, lock.parent):
+        assert stat.S_IMODE(path.stat().st_mode) == 0o1777  # ruff: ignore[magic-value-comparison]
+
+    # existing lock file is reused
+    with locks.link_lock(tmp_path / "home" / "name"):
+        pass
+
+
+def test_link_lock_contention(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    monkeypatch.setattr(timing, "TIMINGS", timings := timing.Timings())
+    timings.enable()
+    link = tmp_path / "home" / "name"
+    held = threading.Event()
+
+    def _hold() -> None:
+        with locks.link_lock(link):
+            held.set()
+            time.sleep(0.1)
+
+    thread = threading.Thread(target=_hold)
+    thread.start()
+    _ = held.wait()
+
+    # other names are not blocked
+    with locks.link_lock(tmp_path / "home" / "other"):
+        pass
+    assert timings.counts == {}
+
+    with caplog.at_level(logging.DEBUG, logger="uv_workon.locks"):
+        start = time.perf_counter()
+        with locks.link_lock(link):
+            assert time.perf_counter() - start > 0.05  # ruff: ignore[magic-value-comparison]
+    thread.join()
+
+    assert timings.counts["lock_contended"] == 1
+    assert timings.counts["lock_wait_us"] > 0
+    assert "Waited" in caplog.text
+
+
+def test_concurrent_create_symlink(tmp_path: Path) -> None:
+    targets = [tmp_path / f"target_{i}" for i in range(8)]
+    for target in targets:
+        target.mkdir()
+    (home := tmp_path / "home").mkdir()
+
+    def _link(target: Path) -> None:
+        for _ in range(20):
+            VirtualEnvPathAndLink(path=target, link=home / "link").create_symlink()  # pyrefly: ignore[unexpected-keyword]
+
+    with ThreadPoolExecutor(len(targets)) as executor:
+        # raises FileExistsError if symlink creation races
+        _ = list(executor.map(_link, targets))
+    assert (home / "link").resolve() in targets
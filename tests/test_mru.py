@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from uv_workon import mru
+from uv_workon.mru import Usage
+
+
+@pytest.fixture
+def mru_path(tmp_path: Path) -> Path:
+    return tmp_path / "cache" / "mru.log"
+
+
+def test_record_read(mru_path: Path) -> None:
+    home = Path("/a/home")
+    for name in ("x", "y", "x"):
+        mru.record_use(home, name, path=mru_path)
+    mru.record_use(Path("/other"), "x", path=mru_path)
+
+    usage = mru.read_usage(mru_path)
+    assert {k: u.count for k, u in usage.items()} == {
+        "/a/home\tx": 2,
+        "/a/home\ty": 1,
+        "/other\tx": 1,
+    }
+    scores = mru.get_scores(home, mru_path)
+    assert set(scores) == {"x", "y"}
+    assert scores["x"] > scores["y"]
+    assert mru.order_names(["a", "y", "x"], scores) == ["x", "y", "a"]
+
+
+def test_compaction(mru_path: Path) -> None:
+    home = Path("/a/home")
+    mru.record_use(home, "x", path=mru_path)
+    line_size = mru_path.stat().st_size
+    for _ in range(10):
+        mru.record_use(home, "x", path=mru_path, max_bytes=3 * line_size)
+        mru.record_use(home, "y", path=mru_path, max_bytes=3 * line_size)
+
+    lines = mru_path.read_text(encoding="utf-8").splitlines()
+    assert len(lines) <= 3  # ruff: ignore[magic-value-comparison]
+    usage = mru.read_usage(mru_path)
+    assert usage["/a/home\tx"].count == 11  # ruff: ignore[magic-value-comparison]
+    assert usage["/a/home\ty"].count == 10  # ruff: ignore[magic-value-comparison]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="locks are no-ops")
+def test_concurrent_compaction(mru_path: Path) -> None:
+    home = Path("/a/home")
+    mru.record_use(home, "x", path=mru_path)
+    max_bytes = 2 * mru_path.stat().st_size
+
+    def _record(i: int) -> None:
+        for _ in range(20):
+            mru.record_use(home, f"name{i % 3}", path=mru_path, max_bytes=max_bytes)
+
+    with ThreadPoolExecutor(8) as executor:
+        _ = list(executor.map(_record, range(8)))
+    mru.compact(mru_path)
+
+    usage = mru.read_usage(mru_path)
+    assert sum(u.count for u in usage.values()) == 1 + 8 * 20
+    assert len(mru_path.read_text(encoding="utf-8").splitlines()) == len(usage)
+
+
+def test_malformed_and_disabled(
+    mru_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    mru_path.parent.mkdir(parents=True)
+    _ = mru_path.write_text("bad line\n1\t/a\tx\tnan-count\n", encoding="utf-8")
+    assert mru.read_usage(mru_path) == {}
+
+    monkeypatch.setenv(mru.MRU_ENV, "0")
+    mru.record_use(Path("/a"), "x", path=mru_path)
+    assert mru.read_usage(mru_path) == {}
+
+
+def test_frecency() -> None:
+    recent = mru.frecency(Usage(last=100.0, count=1), now=200.0)
+    frequent_old = mru.frecency(Usage(last=0.0, count=5), now=2 * 86400.0)
+    assert frequent_old > recent
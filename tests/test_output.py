@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from uv_workon.output import OutputFormat, write_records
+
+if TYPE_CHECKING:
+    from typing import Any
+
+RECORDS: list[dict[str, Any]] = [{"name": "a", "value": 1}, {"name": "b", "value": 2}]
+
+
+@pytest.mark.parametrize(
+    ("fmt", "expected"),
+    [
+        (OutputFormat.text, "a=1\nb=2\n"),
+        (OutputFormat.ndjson, "".join(json.dumps(r) + "\n" for r in RECORDS)),
+        (OutputFormat.json, json.dumps(RECORDS, indent=2) + "\n"),
+        (OutputFormat.null, "a\0b\0"),
+    ],
+)
+def test_write_records(
+    capsys: pytest.CaptureFixture[str], fmt: OutputFormat, expected: str
+) -> None:
+    write_records(
+        iter(RECORDS), fmt, key="name", text=lambda r: f"{r['name']}={r['value']}"
+    )
+    assert capsys.readouterr().out == expected
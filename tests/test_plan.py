@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from uv_workon.plan import Action, ActionKind, Plan, PlanConflictError
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+
+@pytest.fixture
+def targets(tmp_path: Path) -> list[Path]:
+    out = [tmp_path / "targets" / f"target_{i}" for i in range(3)]
+    for target in out:
+        target.mkdir(parents=True)
+    return out
+
+
+def test_action_for_link(tmp_path: Path, targets: list[Path]) -> None:
+    link = tmp_path / "link"
+    action = Action.for_link(link, str(targets[0]))
+    assert action.kind == ActionKind.create_link
+    assert action.previous is None
+
+    link.symlink_to(targets[1])
+    action = Action.for_link(link, str(targets[0]))
+    assert action.kind == ActionKind.replace_link
+    assert action.previous == str(targets[1])
+
+
+def test_json_roundtrip() -> None:
+    plan = Plan(
+        [
+            Action(ActionKind.create_link, path="/a/link", target="../b"),
+            Action(ActionKind.unlink, path="/a/other", previous="/c"),
+            Action(
+                ActionKind.install_kernel,
+                path="/a/venv",
+                name="venv",
+                args=["--", "--name", "venv"],
+            ),
+            Action(ActionKind.remove_kernel, name="old"),
+        ],
+        command="test",
+    )
+    data = plan.to_dict()
+    assert data["actions"][0] == {
+        "kind": "create_link",
+        "path": "/a/link",
+        "target": "../b",
+    }
+    assert data["actions"][2]["args"] == ["--", "--name", "venv"]
+
+    assert Plan.from_json(plan.to_json()) == plan
+
+    with pytest.raises(ValueError, match="Unsupported plan version"):
+        _ = Plan.from_dict({**data, "version": 0})
+
+
+@pytest.mark.parametrize(
+    ("text", "match"),
+    [
+        ("[]", "must be a JSON object"),
+        ('{"version": 1}', "requires a list of actions"),
+        ('{"version": 1, "actions": [{"kind": "other"}]}', "Invalid action 0"),
+        ('{"version": 1, "actions": [{"kind": "unlink", "bad": 1}]}', "Invalid action"),
+        (
+            '{"version": 1, "actions": [{"kind": "create_link", "path": "/a"}]}',
+            "'target'",
+        ),
+        ("not json", "Expecting value"),
+    ],
+)
+def test_from_json_malformed(text: str, match: str) -> None:
+    with pytest.raises(ValueError, match=match):
+        _ = Plan.from_json(text)
+
+
+@pytest.mark.parametrize("dry_run", [False, True])
+def test_apply_links(tmp_path: Path, targets: list[Path], dry_run: bool) -> None:
+    new, replace, remove = (tmp_path / name for name in ("new", "replace", "remove"))
+    replace.symlink_to(targets[0])
+    remove.symlink_to(targets[0])
+
+    plan = Plan([
+        Action.for_link(new, str(targets[1])),
+        Action.for_link(replace, str(targets[2])),
+        Action(ActionKind.unlink, path=str(remove), previous=str(targets[0])),
+    ])
+    outcomes = plan.apply(jobs=2, dry_run=dry_run)
+
+    assert [o.action for o in outcomes] == plan.actions
+    assert all(o.error is None for o in outcomes)
+    if dry_run:
+        assert not new.is_symlink()
+        assert replace.readlink() == targets[0]
+        assert remove.is_symlink()
+    else:
+        assert new.readlink() == targets[1]
+        assert replace.readlink() == targets[2]
+        assert not remove.is_symlink()
+
+
+def test_apply_conflict(tmp_path: Path, targets: list[Path]) -> None:
+    link = tmp_path / "link"
+    link.symlink_to(targets[0])
+    plan = Plan([Action.for_link(link, str(targets[1]))])
+
+    # changed after plan was computed
+    link.unlink()
+    link.symlink_to(targets[2])
+
+    (outcome,) = plan.apply()
+    assert isinstance(outcome.error, PlanConflictError)
+    assert link.readlink() == targets[2]
+
+
+def test_apply_unlink_missing(tmp_path: Path, targets: list[Path]) -> None:
+    link = tmp_path / "link"
+    plan = Plan([Action(ActionKind.unlink, path=str(link), previous=str(targets[0]))])
+    (outcome,) = plan.apply()
+    assert isinstance(outcome.error, PlanConflictError)
+
+
+def test_action_absolute(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    action = Action.for_link((tmp_path / "home" / "link").relative_to(tmp_path), "t")
+    assert action.path == str(tmp_path / "home" / "link")
+
+
+@pytest.mark.parametrize(("jobs", "expected"), [(None, 1), (4, 4)])
+def test_apply_install_kernels_serial(
+    mocker: MockerFixture, jobs: int | None, expected: int
+) -> None:
+    from uv_workon.utils import map_concurrent
+
+    _ = mocker.patch("uv_workon.plan.uv_run", autospec=True)
+    mocked = mocker.patch("uv_workon.plan.map_concurrent", wraps=map_concurrent)
+    plan = Plan([Action(ActionKind.install_kernel, path="/a/venv", name="venv")])
+    outcomes = plan.apply(jobs=jobs)
+    assert all(o.error is None for o in outcomes)
+    assert [c.kwargs["jobs"] for c in mocked.mock_calls] == [jobs, expected]
+
+
+def test_apply_remove_kernels(mocker: MockerFixture) -> None:
+    mocked = mocker.patch("uv_workon.kernels.remove_kernelspecs", autospec=True)
+    plan = Plan([Action(ActionKind.remove_kernel, name=name) for name in "ba"])
+
+    _ = plan.apply(dry_run=True)
+    assert mocked.mock_calls == []
+
+    outcomes = plan.apply()
+    assert mocked.mock_calls == [mocker.call(["a", "b"])]
+    assert [o.action.name for o in outcomes] == ["b", "a"]
+
+    mocked.side_effect = ValueError("bad")
+    assert all(isinstance(o.error, ValueError) for o in plan.apply())
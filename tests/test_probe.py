@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from uv_workon.core import get_invalid_symlinks, get_virtualenv_paths
+from uv_workon.probe import Prober, UnreachableError
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from pytest_mock import MockerFixture
+
+
+@pytest.fixture
+def release() -> Generator[threading.Event]:
+    event = threading.Event()
+    yield event
+    # release any hung probes
+    event.set()
+
+
+def test_prober_no_timeout(mocker: MockerFixture) -> None:
+    mocked_thread = mocker.patch("threading.Thread")
+    prober = Prober()
+    assert prober(str, Path("a")) == "a"
+    assert mocked_thread.mock_calls == []
+
+
+def test_prober_error() -> None:
+    def func(path: Path) -> None:
+        raise FileNotFoundError(path)
+
+    with pytest.raises(FileNotFoundError):
+        Prober(timeout=1.0)(func, Path("a"))
+
+
+def test_prober_timeout(tmp_path: Path, release: threading.Event) -> None:
+    cache_path = tmp_path / "cache" / "unreachable.json"
+    calls: list[Path] = []
+
+    def hang(path: Path) -> bool:
+        calls.append(path)
+        release.wait()
+        return True
+
+    prober = Prober(timeout=0.05, cache_path=cache_path)
+    assert prober(str, Path("a")) == "a"
+    with pytest.raises(UnreachableError, match=r"did not respond"):
+        prober(hang, Path("b"))
+    assert prober.unreachable == [Path("b")]
+    assert cache_path.exists()
+
+    # cached, so skip calling ...
+    with pytest.raises(UnreachableError, match=r"cached"):
+        prober(hang, Path("b"))
+    assert calls == [Path("b")]
+
+    # new prober reads persisted cache
+    other = Prober(timeout=0.05, cache_path=cache_path)
+    assert other.try_call(hang, Path("b"), False) is False
+    assert calls == [Path("b")]
+
+    # zero ttl always expires
+    other = Prober(timeout=0.05, ttl=0, cache_path=tmp_path / "other.json")
+    for _ in range(2):
+        assert other.try_call(hang, Path("c"), False) is False
+    assert calls == [Path("b"), Path("c"), Path("c")]
+
+    # not remembered
+    other = Prober(timeout=0.05, cache_path=tmp_path / "home.json")
+    assert other.try_call(hang, Path("home"), False, remember=False) is False
+    assert other.unreachable == [Path("home")]
+    assert not (tmp_path / "home.json").exists()
+
+
+def test_prober_zero_timeout(tmp_path: Path) -> None:
+    cache_path = tmp_path / "unreachable.json"
+    prober = Prober(timeout=0, cache_path=cache_path)
+    assert prober(str, Path("a")) == "a"
+    assert prober.unreachable == []
+    assert not cache_path.exists()
+
+
+def test_prober_from_env(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("UV_WORKON_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("UV_WORKON_PROBE_TIMEOUT", raising=False)
+    assert Prober.from_env().timeout is None
+    assert Prober.from_env(2.0).timeout == pytest.approx(2.0)
+
+    monkeypatch.setenv("UV_WORKON_PROBE_TIMEOUT", "0.5")
+    monkeypatch.setenv("UV_WORKON_UNREACHABLE_TTL", "10")
+    prober = Prober.from_env()
+    assert prober.timeout == pytest.approx(0.5)
+    assert prober.ttl == pytest.approx(10)
+    assert prober.cache_path == tmp_path / "unreachable.json"
+
+    # invalid values are ignored
+    monkeypatch.setenv("UV_WORKON_PROBE_TIMEOUT", "x")
+    monkeypatch.setenv("UV_WORKON_UNREACHABLE_TTL", "bad")
+    prober = Prober.from_env()
+    assert prober.timeout is None
+    assert prober.ttl == pytest.approx(300)
+
+
+def test_discovery_unreachable(
+    workon_home_with_is_venv: Path,
+    venvs_parent_path: Path,
+    mocker: MockerFixture,
+    release: threading.Event,
+) -> None:
+    from uv_workon.validate import is_valid_virtualenv
+
+    (workon_home_with_is_venv / "no_venv_0").symlink_to(venvs_parent_path / "no_venv_0")
+
+    def probe(path: Path) -> bool:
+        if path.name == "is_venv_1":
+            release.wait()
+        return is_valid_virtualenv(path)
+
+    mocker.patch("uv_workon.core.is_valid_virtualenv", side_effect=probe)
+
+    prober = Prober(timeout=0.1)
+    assert sorted(
+        p.name for p in get_virtualenv_paths(workon_home_with_is_venv, prober)
+    ) == [
+        "is_venv_0",
+        "is_venv_2",
+    ]
+    assert prober.unreachable == [workon_home_with_is_venv / "is_venv_1"]
+
+    prober = Prober(timeout=0.1)
+    assert list(get_invalid_symlinks(workon_home_with_is_venv, prober=prober)) == [
+        workon_home_with_is_venv / "no_venv_0"
+    ]
+    assert prober.unreachable == [workon_home_with_is_venv / "is_venv_1"]
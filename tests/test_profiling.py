@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import pstats
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from uv_workon.profiling import StackSampler, run_profiled
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from typer import Typer
+
+
+def _busy(seconds: float) -> str:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+    return "done"
+
+
+def test_stack_sampler() -> None:
+    sampler = StackSampler(interval=0.001)
+    sampler.start()
+    _busy(0.05)
+    sampler.stop()
+
+    collapsed = sampler.collapsed()
+    assert "_busy (test_profiling.py:" in collapsed
+    for line in collapsed.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        assert stack
+
+
+def test_run_profiled(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setenv("UV_WORKON_PROFILE", str(profile := tmp_path / "out.prof"))
+    monkeypatch.setenv(
+        "UV_WORKON_PROFILE_COLLAPSED", str(collapsed := tmp_path / "out.folded")
+    )
+
+    assert run_profiled(_busy, 0.02) == "done"
+
+    stats = pstats.Stats(str(profile))
+    assert any(func == "_busy" for (_, _, func) in stats.stats)  # type: ignore[attr-defined]
+    assert "_busy" in collapsed.read_text()
+
+
+def test_app_profiled(
+    typer_app: Typer,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    monkeypatch.setenv("UV_WORKON_PROFILE", str(profile := tmp_path / "out.prof"))
+
+    with pytest.raises(SystemExit):
+        typer_app(["--version"], prog_name="uv-workon")
+
+    assert "uv-workon, version" in capsys.readouterr().out
+    assert pstats.Stats(str(profile)).total_calls > 0  # type: ignore[attr-defined]
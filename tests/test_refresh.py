@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import TYPE_CHECKING
+
+import pytest
+
+from uv_workon import index, refresh, timing
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+
+@pytest.fixture
+def timings(monkeypatch: pytest.MonkeyPatch) -> timing.Timings:
+    monkeypatch.setattr(timing, "TIMINGS", out := timing.Timings())
+    out.enable()
+    return out
+
+
+def test_lock(tmp_path: Path) -> None:
+    lock = tmp_path / "sub" / "a.lock"
+    assert refresh.acquire_lock(lock)
+    assert lock.read_text() == str(os.getpid())
+    assert not refresh.acquire_lock(lock)
+
+    # abandoned lock
+    os.utime(lock, (0, 0))
+    assert refresh.acquire_lock(lock)
+    assert not refresh.acquire_lock(lock)
+
+    refresh.release_lock(lock)
+    assert not lock.exists()
+    refresh.release_lock(lock)
+
+
+def test_stale_while_revalidate(
+    workon_home_with_is_venv: Path,
+    venvs_parent_path: Path,
+    mocker: MockerFixture,
+    timings: timing.Timings,
+) -> None:
+    spawn = mocker.patch("uv_workon.refresh._spawn", autospec=True)
+    home = workon_home_with_is_venv
+    names = index.load_name_index(home, stale_ok=True).names
+    assert timings.counts == {"cache_miss": 1}
+
+    (home / "new").symlink_to(venvs_parent_path / "is_venv_0")
+
+    # stale index returned, and refreshed in background (once)
+    for _ in range(2):
+        assert index.load_name_index(home, stale_ok=True).names == names
+    assert timings.counts["cache_stale"] == 2  # ruff: ignore[magic-value-comparison]
+    assert spawn.call_count == 1
+    (args,) = spawn.call_args.args
+    assert args[-2:] == ["uv_workon.refresh", str(home.absolute())]
+    lock = refresh.get_lock_path(home)
+    assert lock.exists()
+
+    # without stale_ok, rebuilt in foreground
+    assert "new" in index.load_name_index(home).names
+
+    refresh.main([str(home)])
+    assert not lock.exists()
+    assert "new" in index.load_name_index(home, stale_ok=True).names
+    assert timings.counts["cache_hit"] == 1
+
+
+def test_refresh_after(
+    workon_home_with_is_venv: Path,
+    mocker: MockerFixture,
+    monkeypatch: pytest.MonkeyPatch,
+    timings: timing.Timings,
+) -> None:
+    spawn = mocker.patch("uv_workon.refresh._spawn", autospec=True)
+    _ = index.load_name_index(workon_home_with_is_venv)
+
+    monkeypatch.setenv(refresh.REFRESH_AFTER_ENV, "0")
+    _ = index.load_name_index(workon_home_with_is_venv, stale_ok=True)
+    assert timings.counts == {"cache_miss": 1, "cache_stale": 1}
+    assert spawn.call_count == 1
+
+    # disabled
+    monkeypatch.setenv(refresh.REFRESH_ENV, "0")
+    _ = index.load_name_index(workon_home_with_is_venv, stale_ok=True)
+    assert timings.counts == {"cache_miss": 1, "cache_stale": 1, "cache_hit": 1}
+
+
+def test_schedule_refresh_error(tmp_path: Path, mocker: MockerFixture) -> None:
+    _ = mocker.patch("uv_workon.refresh._spawn", side_effect=OSError("bad"))
+    assert not refresh.schedule_refresh(tmp_path)
+    assert not refresh.get_lock_path(tmp_path).exists()
+
+
+def test_schedule_refresh_process(workon_home_with_is_venv: Path) -> None:
+    lock = refresh.get_lock_path(workon_home_with_is_venv)
+    assert refresh.schedule_refresh(workon_home_with_is_venv)
+
+    deadline = time.monotonic() + 30
+    while lock.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not lock.exists()
+    assert index.get_index_path(workon_home_with_is_venv).exists()
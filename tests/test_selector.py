@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from uv_workon import selector
+from uv_workon.selector import FuzzySelector, Matcher, fuzzy_score, rank
+
+if TYPE_CHECKING:
+    from pytest_mock import MockerFixture
+
+
+@pytest.mark.parametrize(
+    ("value", "has_menu", "expected"),
+    [
+        ("", True, "fuzzy"),
+        ("", False, "fuzzy"),
+        ("FUZZY", True, "fuzzy"),
+        ("menu", True, "menu"),
+        ("menu", False, "fuzzy"),
+        ("other", True, "fuzzy"),
+    ],
+)
+def test_get_selector(
+    monkeypatch: pytest.MonkeyPatch, value: str, has_menu: bool, expected: str
+) -> None:
+    monkeypatch.setenv(selector.SELECTOR_ENV, value)
+    monkeypatch.setattr(selector, "find_spec", lambda _: object() if has_menu else None)
+    assert selector.get_selector() == expected
+
+
+def test_interactive_select(
+    monkeypatch: pytest.MonkeyPatch, mocker: MockerFixture
+) -> None:
+    monkeypatch.setenv(selector.SELECTOR_ENV, "menu")
+    monkeypatch.setattr(selector, "find_spec", lambda _: object())
+    mocked_menu = mocker.patch(
+        "uv_workon.utils.select_option", autospec=True, return_value="c"
+    )
+    mocked_fuzzy = mocker.patch(
+        "uv_workon.selector.fuzzy_select", autospec=True, return_value="b"
+    )
+
+    # menu reads all options, ordered by priority
+    options = iter(["a", "b", "c"])
+    assert selector.interactive_select(options, title="t", priority={"c": 1}) == "c"
+    assert mocked_menu.mock_calls == [mocker.call(["c", "a", "b"], title="t")]
+    assert list(options) == []
+
+    assert selector.interactive_select(iter([])) is None
+    assert len(mocked_menu.mock_calls) == 1
+
+    # default fuzzy selector gets the options unread
+    monkeypatch.delenv(selector.SELECTOR_ENV)
+    options = iter(["a", "b"])
+    assert selector.interactive_select(options, title="t") == "b"
+    assert mocked_fuzzy.mock_calls == [mocker.call(options, title="t", priority=None)]
+    assert list(options) == ["a", "b"]
+
+
+def test_fuzzy_score() -> None:
+    assert fuzzy_score("", "abc") == 0
+    assert fuzzy_score("ABC", "xaxbxc") is not None
+    assert fuzzy_score("abcd", "abc") is None
+    # prefix > word start > middle
+    scores = [fuzzy_score("ab", x) for x in ("abx", "x-abx", "xabx")]
+    assert scores == sorted(scores, key=lambda x: -(x or 0))
+    assert len(set(scores)) == 3  # ruff: ignore[magic-value-comparison]
+
+
+def test_rank_limit() -> None:
+    candidates = [f"venv_{i:04d}" for i in range(1000)]
+    assert rank("0999", candidates, limit=1) == ["venv_0999"]
+    assert rank("v_00", candidates, limit=3) == rank("v_00", candidates)[:3]
+    assert rank("", candidates, limit=2) == candidates[:2]
+
+
+def test_matcher_incremental() -> None:
+    matcher = Matcher(["alpha", "beta"])
+    assert matcher.matches("a") == ["alpha", "beta"]
+
+    matcher.options.append("gamma")
+    assert matcher.matches("al") == ["alpha"]
+    # new options are checked when query extends previous query
+    matcher.options.append("palm")
+    assert matcher.matches("alm") == ["palm"]
+    # shorter query rescans
+    assert matcher.matches("a") == ["alpha", "beta", "gamma", "palm"]
+
+    assert matcher.top("a", 2) == (["alpha", "palm"], 4)
+
+
+def test_fuzzy_selector() -> None:
+    s = FuzzySelector(iter(["proj-a", "proj-b", "other"]), title="venv", height=2)
+    assert s.render() == ["venv>   [0/0+]"]
+
+    s.consume()
+    assert s.done
+    assert s.render() == ["venv>   [3/3]", "> proj-a", "  proj-b"]
+
+    # scroll past visible rows
+    for key in ("\x1b[B", "\x1b[B", "\x1b[B"):
+        assert s.handle_key(key)
+    assert s.render() == ["venv>   [3/3]", "  proj-b", "> other"]
+    assert s.selected == "other"
+
+    for key in "pb":
+        assert s.handle_key(key)
+    assert s.render() == ["venv> pb  [1/3]", "> proj-b"]
+    assert s.selected == "proj-b"
+
+    assert s.handle_key("\x7f")
+    assert s.render()[0] == "venv> p  [2/3]"
+    assert not s.handle_key("\r")
+    assert s.selected == "proj-a"
+
+    assert not s.handle_key("\x1b")
+    assert s.selected is None
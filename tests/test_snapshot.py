@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from uv_workon import timing
+from uv_workon.fsops import count_fs_operations
+from uv_workon.homes import WorkonHomes
+from uv_workon.snapshot import (
+    Snapshot,
+    VenvInfo,
+    get_snapshot_path,
+    load_snapshot,
+    publish_snapshot,
+    read_pyvenv_cfg,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_read_pyvenv_cfg(tmp_path: Path) -> None:
+    assert read_pyvenv_cfg(tmp_path) == {}
+    (tmp_path / "pyvenv.cfg").write_text(
+        "home = /usr/bin\nversion_info = 3.12.1\nbad line\n"
+    )
+    assert read_pyvenv_cfg(tmp_path) == {"home": "/usr/bin", "version_info": "3.12.1"}
+
+    info = VenvInfo.from_path(tmp_path / "link", tmp_path)
+    assert info == VenvInfo("link", str(tmp_path), "3.12.1")
+    assert VenvInfo.from_path(tmp_path / "link").to_dict() == {"name": "link"}
+
+
+def test_publish_and_load(
+    workon_home_with_is_venv: Path,
+    venvs_parent_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    assert load_snapshot(workon_home_with_is_venv) is None
+
+    published = publish_snapshot(workon_home_with_is_venv)
+    assert published.names == ("is_venv_0", "is_venv_1", "is_venv_2")
+    assert published.venvs[0].target == str(venvs_parent_path / "is_venv_0")
+
+    path = get_snapshot_path(workon_home_with_is_venv)
+    # written next to the home, which only contains links
+    assert path.parent == workon_home_with_is_venv.parent
+    assert all(p.is_symlink() for p in workon_home_with_is_venv.iterdir())
+    data = json.loads(path.read_text())
+    assert Snapshot.from_dict(data) == published
+    assert not path.stat().st_mode & 0o222
+
+    monkeypatch.setattr(timing, "TIMINGS", timings := timing.Timings())
+    timings.enable()
+    with count_fs_operations() as counts:
+        loaded = load_snapshot(workon_home_with_is_venv)
+    assert counts == {"stat": 1}
+    assert loaded == published
+    assert timings.counts == {"snapshot_hit": 1}
+
+    # readers of homes use snapshot (without validating entries)
+    homes = WorkonHomes([workon_home_with_is_venv])
+    with count_fs_operations() as counts:
+        assert list(homes.iter_virtualenv_targets()) == list(published.iter_targets())
+        assert homes.name_index().names == published.names
+    assert "readdir" not in counts
+
+    # adding a link makes snapshot stale
+    (workon_home_with_is_venv / "new").symlink_to(venvs_parent_path / "is_venv_0")
+    assert load_snapshot(workon_home_with_is_venv) is None
+    assert timings.counts["snapshot_stale"] == 1
+    assert "new" in homes.name_index().names
+
+    # bad snapshots are ignored
+    path.unlink()
+    path.write_text(json.dumps({**data, "version": 0}))
+    assert load_snapshot(workon_home_with_is_venv) is None
+    with pytest.raises(ValueError, match="Unsupported snapshot version"):
+        _ = Snapshot.from_dict({**data, "version": 0})
+
+
+def test_overlay(
+    tmp_path: Path, workon_home_with_is_venv: Path, venvs_parent_path: Path
+) -> None:
+    _ = publish_snapshot(workon_home_with_is_venv)
+
+    local = tmp_path / "local"
+    local.mkdir()
+    (local / "is_venv_0").symlink_to(venvs_parent_path / "is_venv_2")
+
+    homes = WorkonHomes([local, workon_home_with_is_venv])
+    assert list(homes.iter_virtualenv_targets()) == [
+        (local / "is_venv_0", venvs_parent_path / "is_venv_2"),
+        *(
+            (workon_home_with_is_venv / name, venvs_parent_path / name)
+            for name in ("is_venv_1", "is_venv_2")
+        ),
+    ]
+    assert [p.name for p in homes.iter_virtualenv_paths()] == [
+        "is_venv_0",
+        "is_venv_1",
+        "is_venv_2",
+    ]
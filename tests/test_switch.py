@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from uv_workon import locks, switch
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def venvs(tmp_path: Path) -> list[Path]:
+    out = [tmp_path / "venvs" / f"env_{i}" for i in range(3)]
+    for venv in out:
+        venv.mkdir(parents=True)
+        (venv / "pyvenv.cfg").touch()
+    return out
+
+
+@pytest.fixture
+def link(tmp_path: Path) -> Path:
+    (tmp_path / "home").mkdir()
+    return tmp_path / "home" / "prod"
+
+
+def test_switch_and_rollback(link: Path, venvs: list[Path]) -> None:
+    assert switch.switch(link, str(venvs[0])) is None
+    assert switch.read_history(link) == []
+
+    assert switch.switch(link, str(venvs[1])) == str(venvs[0])
+    assert switch.switch(link, str(venvs[2])) == str(venvs[1])
+    assert link.resolve() == venvs[2]
+    assert switch.read_history(link) == [str(venvs[1]), str(venvs[0])]
+
+    # switching to same target does not change history
+    _ = switch.switch(link, str(venvs[2]))
+    assert switch.read_history(link) == [str(venvs[1]), str(venvs[0])]
+
+    assert switch.rollback(link, dry_run=True) == str(venvs[1])
+    assert link.resolve() == venvs[2]
+
+    assert switch.rollback(link) == str(venvs[1])
+    assert link.resolve() == venvs[1]
+    assert switch.read_history(link) == [str(venvs[2]), str(venvs[0])]
+
+    # rollback of rollback
+    assert switch.rollback(link) == str(venvs[2])
+    assert switch.read_history(link) == [str(venvs[1]), str(venvs[0])]
+
+    # invalid previous targets are skipped
+    (venvs[1] / "pyvenv.cfg").unlink()
+    assert switch.rollback(link) == str(venvs[0])
+    assert switch.read_history(link) == [str(venvs[2])]
+
+    link.unlink()
+    assert switch.rollback(link) == str(venvs[2])
+    assert switch.read_history(link) == []
+
+    with pytest.raises(switch.NoHistoryError):
+        _ = switch.rollback(link)
+
+
+def test_switch_not_symlink(link: Path, venvs: list[Path]) -> None:
+    link.mkdir()
+    with pytest.raises(ValueError, match="not a symlink"):
+        _ = switch.switch(link, str(venvs[0]))
+    assert link.is_dir()
+
+
+def test_switch_dry_run_no_lock(
+    link: Path, venvs: list[Path], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(locks.LOCK_DIR_ENV, str(lock_dir := tmp_path / "locks"))
+    assert switch.switch(link, str(venvs[0]), dry_run=True) is None
+    with pytest.raises(switch.NoHistoryError):
+        _ = switch.rollback(link, dry_run=True)
+    assert not link.is_symlink()
+    assert not lock_dir.exists()
+
+
+def test_switch_history_size(
+    link: Path, venvs: list[Path], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(switch.HISTORY_ENV, "1")
+    for venv in venvs:
+        _ = switch.switch(link, str(venv))
+    assert switch.read_history(link) == [str(venvs[1])]
+
+    assert switch.switch(link, str(venvs[0]), dry_run=True) == str(venvs[2])
+    assert link.resolve() == venvs[2]
+
+    switch.get_history_path(link).write_text("bad")
+    assert switch.read_history(link) == []
+
+
+def test_list_during_switch(link: Path, venvs: list[Path]) -> None:
+    import threading
+
+    from uv_workon.core import get_invalid_symlinks, get_virtualenv_targets
+
+    _ = switch.switch(link, str(venvs[0]))
+    stop = threading.Event()
+
+    def _switch() -> None:
+        i = 0
+        while not stop.is_set():
+            _ = switch.switch(link, str(venvs[i % len(venvs)]))
+            i += 1
+
+    thread = threading.Thread(target=_switch)
+    thread.start()
+    try:
+        for _ in range(200):
+            assert [p.name for p, _ in get_virtualenv_targets(link.parent)] == ["prod"]
+            assert list(get_invalid_symlinks(link.parent)) == []
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_clean_leftover_tmp_link(link: Path, venvs: list[Path]) -> None:
+    import os
+
+    from uv_workon.core import (
+        TMP_LINK_MAX_AGE,
+        TMP_LINK_PREFIX,
+        get_invalid_symlinks,
+        get_virtualenv_targets,
+    )
+
+    # left behind by crashed process
+    tmp = link.with_name(f"{TMP_LINK_PREFIX}prod.1.2")
+    tmp.symlink_to(venvs[0])
+    assert list(get_virtualenv_targets(link.parent)) == []
+    assert list(get_invalid_symlinks(link.parent)) == []
+
+    old = tmp.lstat().st_mtime - TMP_LINK_MAX_AGE - 1
+    os.utime(tmp, (old, old), follow_symlinks=False)
+    assert list(get_invalid_symlinks(link.parent)) == [tmp]
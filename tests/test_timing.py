@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from uv_workon import timing
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def timings(monkeypatch: pytest.MonkeyPatch) -> timing.Timings:
+    out = timing.Timings()
+    monkeypatch.setattr(timing, "TIMINGS", out)
+    return out
+
+
+def test_disabled(timings: timing.Timings) -> None:
+    @timing.timed("func")
+    def func(x: int) -> int:
+        return x + 1
+
+    with timing.span("a"):
+        pass
+    assert func(1) == 2  # ruff: ignore[magic-value-comparison]
+    assert list(timing.timed_iter("it", range(3))) == [0, 1, 2]
+    timing.count("hit")
+    assert timings.spans == []
+    assert timings.counts == {}
+
+
+def test_enabled(timings: timing.Timings, tmp_path: Path) -> None:
+    timings.enable(origin=timings.origin)
+    timings.command = "cmd"
+
+    @timing.timed("func")
+    def func(x: int) -> int:
+        return x + 1
+
+    with timing.span("a", "detail"):
+        pass
+    assert func(1) == 2  # ruff: ignore[magic-value-comparison]
+    assert list(timing.timed_iter("it", range(3))) == [0, 1, 2]
+    timing.count("hit")
+    timing.count("hit", 2)
+
+    assert [(s.name, s.detail) for s in timings.spans] == [
+        ("import", None),
+        ("a", "detail"),
+        ("func", None),
+        ("it", None),
+    ]
+    assert list(timings.summary()) == ["import", "a", "func", "it"]
+    assert all(d["count"] == 1 for d in timings.summary().values())
+
+    report = timings.report()
+    assert report.startswith("[uv-workon timings] cmd total")
+    for name in ("import", "a", "func", "it"):
+        assert f"  {name} " in report
+    assert "counts: hit=3" in report
+
+    timings.write_json(path := tmp_path / "timings.json")
+    data = json.loads(path.read_text())
+    assert data["command"] == "cmd"
+    assert data["counts"] == {"hit": 3}
+    assert [s["name"] for s in data["spans"]] == ["import", "a", "func", "it"]
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
 from importlib.util import find_spec
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pytest
 
-from uv_workon.utils import select_option
+from uv_workon.utils import (
+    get_cache_dir,
+    iter_delimited,
+    map_concurrent,
+    select_option,
+    select_options,
+)
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from pytest_mock import MockerFixture
 
 
@@ -23,3 +32,73 @@ def test_select_option(mocker: MockerFixture) -> None:
         mocker.call().show(),
         mocker.call().show().__index__(),
     ]
+
+
+@pytest.mark.skipif(
+    not find_spec("simple_term_menu"), reason="missing simple_term_menu"
+)
+@pytest.mark.parametrize(("selected", "expected"), [((2, 0), [0, 2]), (None, [])])
+def test_select_options(
+    mocker: MockerFixture, selected: tuple[int, ...] | None, expected: list[int]
+) -> None:
+    mock_terminalmenu = mocker.patch("simple_term_menu.TerminalMenu", autospec=True)
+    mock_terminalmenu.return_value.show.return_value = selected
+    options = ["a", "b", "c"]
+    assert select_options(options, title="pick", usage=False) == expected
+    assert mock_terminalmenu.mock_calls[0] == mocker.call(
+        options,
+        title="pick",
+        multi_select=True,
+        multi_select_select_on_accept=False,
+        multi_select_empty_ok=True,
+        preselected_entries=[0, 1, 2],
+        show_multi_select_hint=True,
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 1000])
+@pytest.mark.parametrize(
+    ("text", "delimiter", "expected"),
+    [
+        ("a\nb c\n\nd\n", "\n", ["a", "b c", "d"]),
+        ("a\0b c\0\0d", "\0", ["a", "b c", "d"]),
+        ("a\nb\0c\n", "\0", ["a\nb", "c\n"]),
+        ("", "\n", []),
+    ],
+)
+def test_iter_delimited(
+    text: str, delimiter: str, expected: list[str], chunk_size: int
+) -> None:
+    from io import StringIO
+
+    out = iter_delimited(StringIO(text), delimiter=delimiter, chunk_size=chunk_size)
+    assert list(out) == expected
+
+
+def test_get_cache_dir(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.delenv("UV_WORKON_CACHE_DIR", raising=False)
+    monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+    assert get_cache_dir() == Path.home() / ".cache" / "uv-workon"
+
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert get_cache_dir() == tmp_path / "uv-workon"
+
+    monkeypatch.setenv("UV_WORKON_CACHE_DIR", str(tmp_path / "a"))
+    assert get_cache_dir() == tmp_path / "a"
+
+
+@pytest.mark.parametrize("jobs", [None, 1, 2])
+def test_map_concurrent_streams(jobs: int | None) -> None:
+    import itertools
+
+    consumed: list[int] = []
+
+    def _items() -> Iterator[int]:
+        for i in itertools.count():
+            consumed.append(i)
+            yield i
+
+    out = map_concurrent(str, _items(), jobs=jobs)
+    assert list(itertools.islice(out, 3)) == ["0", "1", "2"]
+    # items are read ahead by a bounded window only
+    assert len(consumed) <= 3 + 2 * 36
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING
+
+import attrs
+import pytest
+
+from uv_workon.plan import ActionKind
+from uv_workon.watch import (
+    InotifyWatcher,
+    LinkSync,
+    PollingWatcher,
+    inotify_available,
+    watch,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_mock import MockerFixture
+
+
+def _make_venv(project: Path, pattern: str = ".venv") -> Path:
+    venv = project / pattern
+    venv.mkdir(parents=True)
+    (venv / "pyvenv.cfg").write_text("version_info = 3.13.0\n")
+    return venv
+
+
+@pytest.fixture
+def parent(tmp_path: Path) -> Path:
+    out = tmp_path / "projects"
+    out.mkdir()
+    return out
+
+
+@pytest.fixture
+def sync(tmp_path: Path) -> LinkSync:
+    home = tmp_path / "home"
+    home.mkdir()
+    return LinkSync(workon_home=home, venv_patterns=[".venv", "venv"])
+
+
+def test_link_sync(parent: Path, sync: LinkSync) -> None:
+    venv = _make_venv(parent / "a")
+    (parent / "b").mkdir()
+    _ = _make_venv(parent / "c", "venv")
+    other = _make_venv(parent.parent / "other")
+    (sync.workon_home / "c").symlink_to(other)
+
+    plan = sync.sync(parent.iterdir())
+    assert [(a.kind, a.path) for a in plan] == [
+        (ActionKind.create_link, str(sync.workon_home / "a"))
+    ]
+    assert (sync.workon_home / "a").resolve() == venv
+    # link to another environment is kept
+    assert (sync.workon_home / "c").resolve() == other
+
+    # up to date
+    assert not sync.sync(parent.iterdir())
+
+    # removed environment removes link
+    (venv / "pyvenv.cfg").unlink()
+    plan = sync.sync([parent / "a"])
+    assert [a.kind for a in plan] == [ActionKind.unlink]
+    assert not (sync.workon_home / "a").is_symlink()
+
+    # link to removed environment is replaced
+    (other / "pyvenv.cfg").unlink()
+    plan = sync.sync([parent / "c"])
+    assert [a.kind for a in plan] == [ActionKind.replace_link]
+    assert (sync.workon_home / "c").resolve() == parent / "c" / "venv"
+
+    # broken link to another project is not removed
+    (sync.workon_home / "b").symlink_to(other)
+    assert not sync.sync([parent / "b"])
+    assert (sync.workon_home / "b").is_symlink()
+
+
+def test_link_sync_dry_run(parent: Path, sync: LinkSync) -> None:
+    _ = _make_venv(parent / "a")
+    sync = attrs.evolve(sync, dry_run=True)
+    assert len(sync.sync([parent / "a"])) == 1
+    assert not (sync.workon_home / "a").is_symlink()
+
+
+def test_polling_watcher(parent: Path) -> None:
+    (parent / "a").mkdir()
+    watcher = PollingWatcher([parent], [".venv"], interval=0)
+    assert watcher.wait() == set()
+
+    _ = _make_venv(parent / "a")
+    _ = _make_venv(parent / "b")
+    assert watcher.wait() == {parent / "a", parent / "b"}
+    assert watcher.wait() == set()
+
+    (parent / "a" / ".venv" / "pyvenv.cfg").unlink()
+    assert watcher.wait(0) == {parent / "a"}
+    watcher.close()
+
+
+def _wait_for(watcher: InotifyWatcher, expected: set[Path]) -> set[Path]:
+    changed: set[Path] = set()
+    deadline = time.monotonic() + 5
+    while not expected <= changed and time.monotonic() < deadline:
+        changed |= watcher.wait(0.1)
+    return changed
+
+
+@pytest.mark.skipif(not inotify_available(), reason="requires inotify")
+def test_inotify_watcher(parent: Path) -> None:
+    (parent / "a").mkdir()
+    watcher = InotifyWatcher([parent], [".venv"])
+    try:
+        assert watcher.wait(0) == set()
+
+        # existing and new projects
+        _ = _make_venv(parent / "a")
+        _ = _make_venv(parent / "b")
+        assert _wait_for(watcher, {parent / "a", parent / "b"}) == {
+            parent / "a",
+            parent / "b",
+        }
+
+        # pyvenv.cfg in environment created after watch started
+        (parent / "b" / ".venv" / "pyvenv.cfg").unlink()
+        assert _wait_for(watcher, {parent / "b"}) == {parent / "b"}
+
+        # unrelated changes in the environment are not watched
+        (parent / "b" / ".venv" / "lib").mkdir()
+        (parent / "b" / ".venv" / "lib" / "x").touch()
+        assert watcher.wait(0.1) == {parent / "b"}
+        assert watcher.wait(0.1) == set()
+    finally:
+        watcher.close()
+
+
+@attrs.define
+class _ScriptedWatcher:
+    events: list[set[Path]]
+    stop: threading.Event
+
+    def wait(self, timeout: float | None = None) -> set[Path]:
+        if self.events:
+            return self.events.pop(0)
+        time.sleep(min(timeout or 0.01, 0.01))
+        return set()
+
+    def close(self) -> None:
+        pass
+
+
+def test_watch_debounce(tmp_path: Path, mocker: MockerFixture) -> None:
+    sync = mocker.create_autospec(LinkSync, instance=True)
+    stop = threading.Event()
+    watcher = _ScriptedWatcher(
+        [{tmp_path / "a"}, {tmp_path / "a", tmp_path / "b"}, {tmp_path / "b"}], stop
+    )
+
+    def _sync(projects: set[Path]) -> None:
+        assert projects == {tmp_path / "a", tmp_path / "b"}
+        stop.set()
+
+    sync.sync.side_effect = _sync
+    watch(sync, watcher, debounce=0.05, stop=stop)  # type: ignore[arg-type]
+    assert sync.sync.call_count == 1
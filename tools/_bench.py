@@ -0,0 +1,265 @@
+"""
+Shared helpers for benchmark scripts (``tools/bench_*.py``).
+
+Results are stored as json under ``.benchmarks/`` (by default), tagged with
+the git revision, so that runs can be compared across commits with
+``--compare``.
+"""
+# ruff:file-ignore[print]
+
+from __future__ import annotations
+
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import attrs
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser
+    from collections.abc import Callable, Iterable
+
+BENCHMARK_DIR = Path(".benchmarks")
+
+
+# * Synthetic trees -----------------------------------------------------------
+@attrs.frozen
+class SyntheticTree:
+    """Synthetic ``WORKON_HOME`` with mixed entries."""
+
+    #: Directory holding project directories.
+    root: Path
+    #: Directory holding links.
+    workon_home: Path
+    #: Project directories containing a ``.venv``.
+    projects: list[Path]
+
+    @property
+    def venvs(self) -> list[Path]:
+        """Virtual environments under :attr:`projects`."""
+        return [project / ".venv" for project in self.projects]
+
+
+def make_tree(
+    base: Path,
+    size: int,
+    valid: float = 0.8,
+    dangling: float = 0.1,
+    seed: int = 0,
+) -> SyntheticTree:
+    """
+    Create (or reuse) a synthetic tree with ``size`` entries in ``workon_home``.
+
+    Entries are a random mix of links to valid virtual environments (fraction
+    ``valid``), dangling links (fraction ``dangling``), and links to
+    directories which are not virtual environments (the rest). Trees are
+    reused if ``base`` already contains a complete tree of the same size.
+    """
+    root = base.absolute() / f"tree-{size}"
+    workon_home = root / "workon_home"
+    projects_dir = root / "projects"
+    done = root / ".complete"
+
+    rng = random.Random(seed)  # ruff: ignore[suspicious-non-cryptographic-random-usage]
+    kinds = rng.choices(
+        ["valid", "dangling", "other"],
+        weights=[valid, dangling, max(0.0, 1.0 - valid - dangling)],
+        k=size,
+    )
+    projects = [
+        projects_dir / f"project_{i:06d}"
+        for i, kind in enumerate(kinds)
+        if kind == "valid"
+    ]
+    tree = SyntheticTree(root=root, workon_home=workon_home, projects=projects)
+    if done.exists():
+        return tree
+
+    workon_home.mkdir(parents=True, exist_ok=True)
+    for i, kind in enumerate(kinds):
+        project = projects_dir / f"project_{i:06d}"
+        link = workon_home / project.name
+        if kind == "valid":
+            venv = project / ".venv"
+            venv.mkdir(parents=True, exist_ok=True)
+            (venv / "pyvenv.cfg").write_text("home = /usr/bin\n")
+            target = venv
+        elif kind == "dangling":
+            target = project / ".venv"
+        else:
+            project.mkdir(parents=True, exist_ok=True)
+            target = project
+        link.unlink(missing_ok=True)
+        link.symlink_to(target)
+    done.touch()
+    return tree
+
+
+# * Measurement ---------------------------------------------------------------
+def measure(
+    func: Callable[[], Any],
+    repeat: int = 5,
+    warmup: int = 1,
+    setup: Callable[[], Any] | None = None,
+) -> dict[str, float | int]:
+    """
+    Time ``func`` and return summary statistics in seconds.
+
+    If passed, ``setup`` is called (untimed) before every call to ``func``.
+    """
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        func()
+    times: list[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return summarize(times)
+
+
+def summarize(times: Iterable[float]) -> dict[str, float | int]:
+    """Summary statistics of ``times``."""
+    times = sorted(times)
+    return {
+        "runs": len(times),
+        "min": times[0],
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "p95": percentile(times, 95),
+        "max": times[-1],
+    }
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest rank percentile of sorted values."""
+    index = max(0, min(len(sorted_values) - 1, round(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+# * Results -------------------------------------------------------------------
+def git_revision() -> tuple[str, bool]:
+    """Current git revision and whether the tree is dirty."""
+    try:
+        rev = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+        dirty = bool(
+            subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=no"],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return rev, dirty
+
+
+def make_results(suite: str, results: list[dict[str, Any]]) -> dict[str, Any]:
+    """Wrap benchmark results with metadata."""
+    rev, dirty = git_revision()
+    return {
+        "suite": suite,
+        "revision": rev,
+        "dirty": dirty,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def default_output(suite: str, revision: str) -> Path:
+    """Default path for results of ``suite`` at ``revision``."""
+    return BENCHMARK_DIR / f"{suite}-{revision}.json"
+
+
+def save_results(data: dict[str, Any], path: Path | None = None) -> Path:
+    """Save results as json."""
+    if path is None:
+        path = default_output(data["suite"], data["revision"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _ = path.write_text(json.dumps(data, indent=2) + "\n")
+    return path
+
+
+def _key(result: dict[str, Any]) -> tuple[str, str]:
+    return result["name"], str(result["params"])
+
+
+def _format_params(params: dict[str, Any]) -> str:
+    return " ".join(f"{k}={v}" for k, v in params.items() if v)
+
+
+def report(data: dict[str, Any], baseline: dict[str, Any] | None = None) -> None:
+    """Print table of results (median and p95, in ms), optionally with ratio to baseline."""
+    base = {_key(r): r for r in baseline["results"]} if baseline else {}
+    header = f"{'benchmark':30} {'params':30} {'median ms':>10} {'p95 ms':>10}"
+    if baseline:
+        header += f" {'vs ' + baseline['revision']:>12}"
+    print(header)
+    for result in data["results"]:
+        line = (
+            f"{result['name']:30} {_format_params(result['params']):30} "
+            f"{result['stats']['median'] * 1000:10.2f} "
+            f"{result['stats']['p95'] * 1000:10.2f}"
+        )
+        if (other := base.get(_key(result))) is not None:
+            ratio = result["stats"]["median"] / other["stats"]["median"]
+            line += f" {ratio:11.2f}x"
+        print(line)
+
+
+def add_common_arguments(parser: ArgumentParser) -> ArgumentParser:
+    """Add options shared by benchmark scripts."""
+    _ = parser.add_argument(
+        "--repeat", type=int, default=5, help="Timed runs per benchmark."
+    )
+    _ = parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help=f"Results file (default: {BENCHMARK_DIR}/<suite>-<revision>.json).",
+    )
+    _ = parser.add_argument(
+        "--compare",
+        type=Path,
+        default=None,
+        help="Results file of baseline to compare against.",
+    )
+    _ = parser.add_argument(
+        "--no-save", action="store_true", help="Do not save results."
+    )
+    return parser
+
+
+def finish(
+    suite: str,
+    results: list[dict[str, Any]],
+    output: Path | None,
+    compare: Path | None,
+    no_save: bool,
+) -> dict[str, Any]:
+    """Report and save results."""
+    data = make_results(suite, results)
+    baseline = json.loads(compare.read_text()) if compare is not None else None
+    report(data, baseline)
+    if not no_save:
+        path = save_results(data, output)
+        print(f"Results saved to {path}", file=sys.stderr)
+    return data
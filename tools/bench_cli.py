@@ -0,0 +1,279 @@
+"""
+End-to-end latency benchmarks of the ``uv-workon`` command line.
+
+Each run invokes the installed entry point in a fresh process against a
+synthetic ``WORKON_HOME`` (see :func:`tools._bench.make_tree`), including
+through the shell functions from ``uv-workon shell-config`` (``shell-*``
+cases) and as a bash completion request (``complete``).
+
+Runs are either
+
+* cold: fresh bytecode cache (``PYTHONPYCACHEPREFIX``) and fresh uv-workon cache
+  directory for every run, as after an install or upgrade, or
+* warm: shared bytecode and uv-workon caches, after a warmup run. The shared
+  uv-workon cache is a temporary directory, removed afterwards.
+
+The p95 of warm runs is checked against per-case budgets (in ms), and the
+script exits with non-zero status if any budget is exceeded. For example::
+
+    python -m tools.bench_cli --size 1000 --budget list=300 --budget complete=200
+"""
+# ruff:file-ignore[print]
+
+from __future__ import annotations
+
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING, Any
+
+import attrs
+
+from tools._bench import (
+    BENCHMARK_DIR,
+    add_common_arguments,
+    finish,
+    make_tree,
+    summarize,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+#: Default warm p95 budgets in ms.
+DEFAULT_BUDGETS: dict[str, float] = {
+    "list": 500.0,
+    "activate": 400.0,
+    "cd": 400.0,
+    "complete": 400.0,
+    "shell-activate": 400.0,
+    "shell-cd": 400.0,
+}
+
+
+@attrs.frozen
+class Case:
+    """Command to benchmark."""
+
+    name: str
+    args: list[str]
+    env: dict[str, str] = attrs.field(factory=dict)
+
+
+def _get_cases(
+    entry_point: list[str], venv_name: str, shell_config: Path
+) -> list[Case]:
+    completion_words = f"uv-workon activate -n {venv_name[:-2]}"
+
+    def _shell(line: str) -> list[str]:
+        return [
+            "bash",
+            "--norc",
+            "--noprofile",
+            "-c",
+            f"source {shlex.quote(str(shell_config))} && {line}",
+        ]
+
+    return [
+        Case("list", [*entry_point, "list"]),
+        Case("activate", [*entry_point, "activate", "-n", venv_name]),
+        Case("cd", [*entry_point, "cd", "-n", venv_name]),
+        Case(
+            "complete",
+            entry_point,
+            env={
+                "_UV_WORKON_COMPLETE": "complete_bash",
+                "_TYPER_COMPLETE_ARGS": completion_words,
+                "COMP_WORDS": completion_words,
+                "COMP_CWORD": "3",
+            },
+        ),
+        Case("shell-activate", _shell(f"uv-workon activate -n {venv_name}")),
+        Case("shell-cd", _shell(f"uv-workon cd -n {venv_name}")),
+    ]
+
+
+def _run(case: Case, env: Mapping[str, str]) -> float:
+    start = time.perf_counter()
+    proc = subprocess.run(
+        case.args,
+        env={**env, **case.env},
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        msg = f"{case.name} failed ({proc.returncode}):\n{proc.stderr}"
+        raise RuntimeError(msg)
+    return elapsed
+
+
+def _cold_times(case: Case, env: Mapping[str, str], repeat: int) -> list[float]:
+    times: list[float] = []
+    for _ in range(repeat):
+        with TemporaryDirectory() as tmp:
+            times.append(
+                _run(
+                    case,
+                    {
+                        **env,
+                        "PYTHONPYCACHEPREFIX": str(Path(tmp) / "pycache"),
+                        "UV_WORKON_CACHE_DIR": str(Path(tmp) / "cache"),
+                    },
+                )
+            )
+    return times
+
+
+def _warm_times(case: Case, env: Mapping[str, str], repeat: int) -> list[float]:
+    _ = _run(case, env)
+    return [_run(case, env) for _ in range(repeat)]
+
+
+def _parse_budgets(values: Sequence[str]) -> dict[str, float]:
+    budgets = dict(DEFAULT_BUDGETS)
+    for value in values:
+        name, _, ms = value.partition("=")
+        budgets[name] = float(ms)
+    return budgets
+
+
+def _get_entry_point(value: str | None) -> list[str]:
+    if value is not None:
+        return shlex.split(value)
+    if (path := shutil.which("uv-workon")) is not None:
+        return [path]
+    return [sys.executable, "-m", "uv_workon"]
+
+
+def _get_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Benchmark uv-workon command latency.")
+    _ = parser.add_argument(
+        "--size", type=int, default=100, help="Number of entries in WORKON_HOME."
+    )
+    _ = parser.add_argument(
+        "--tree-dir",
+        type=Path,
+        default=BENCHMARK_DIR / "trees",
+        help="Where to create (and reuse) synthetic trees.",
+    )
+    _ = parser.add_argument(
+        "--entry-point",
+        default=None,
+        help="Command to run (default: uv-workon on path, or python -m uv_workon).",
+    )
+    _ = parser.add_argument(
+        "-k",
+        "--select",
+        action="append",
+        choices=list(DEFAULT_BUDGETS),
+        help="Cases to run (can be repeated). Default is all.",
+    )
+    _ = parser.add_argument(
+        "--cold-repeat", type=int, default=3, help="Number of cold runs per case."
+    )
+    _ = parser.add_argument(
+        "--budget",
+        action="append",
+        default=[],
+        metavar="CASE=MS",
+        help="Warm p95 latency budget (can be repeated).",
+    )
+    _ = parser.add_argument(
+        "--no-budgets", action="store_true", help="Do not check budgets."
+    )
+    parser = add_common_arguments(parser)
+    parser.set_defaults(repeat=20)
+    return parser
+
+
+def main(args: Sequence[str] | None = None) -> int:
+    """Main script"""
+    options = _get_parser().parse_args(args)
+    budgets = _parse_budgets(options.budget)
+    entry_point = _get_entry_point(options.entry_point)
+
+    tree = make_tree(options.tree_dir, options.size)
+    if not tree.projects:
+        print("No valid virtual environments in tree", file=sys.stderr)
+        return 1
+    venv = tree.venvs[0]
+    (activate := venv / "bin" / "activate").parent.mkdir(exist_ok=True)
+    _ = activate.write_text(f"VIRTUAL_ENV={venv}\nexport VIRTUAL_ENV\n")
+
+    env = {**os.environ, "WORKON_HOME": str(tree.workon_home)}
+    for key in (
+        "UV_WORKON_TIMINGS",
+        "UV_WORKON_PROFILE",
+        "UV_WORKON_PROFILE_COLLAPSED",
+        "UV_WORKON_LOCK_DIR",
+    ):
+        _ = env.pop(key, None)
+
+    with TemporaryDirectory() as tmp:
+        # keep state of the synthetic tree out of the user cache (warm runs
+        # share this cache, cold runs each get their own)
+        env["UV_WORKON_CACHE_DIR"] = str(Path(tmp) / "cache")
+        env["UV_WORKON_LOCK_DIR"] = str(Path(tmp) / "locks")
+
+        # generate config from bash, so shell detection picks bash, and call
+        # the entry point directly from the shell functions
+        shell_config = Path(tmp) / "shell-config.sh"
+        _ = shell_config.write_text(
+            subprocess.run(
+                [
+                    "bash",
+                    "--norc",
+                    "--noprofile",
+                    "-c",
+                    f"{shlex.join(entry_point)} shell-config",
+                ],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.replace("command uv-workon", shlex.join(entry_point))
+        )
+
+        results: list[dict[str, Any]] = []
+        failed: list[str] = []
+        for case in _get_cases(entry_point, venv.parent.name, shell_config):
+            if options.select and case.name not in options.select:
+                continue
+            print(f"Running {case.name}", file=sys.stderr)
+            for mode, times in (
+                ("cold", _cold_times(case, env, options.cold_repeat)),
+                ("warm", _warm_times(case, env, options.repeat)),
+            ):
+                stats = summarize(times)
+                results.append({
+                    "name": case.name,
+                    "params": {"mode": mode, "size": options.size},
+                    "stats": stats,
+                })
+                if (
+                    mode == "warm"
+                    and not options.no_budgets
+                    and (budget := budgets.get(case.name)) is not None
+                    and (p95 := stats["p95"] * 1000) > budget
+                ):
+                    failed.append(
+                        f"{case.name}: warm p95 {p95:.1f} ms > {budget:.1f} ms"
+                    )
+
+        _ = finish("cli", results, options.output, options.compare, options.no_save)
+
+    for line in failed:
+        print(f"Budget exceeded: {line}", file=sys.stderr)
+    return int(bool(failed))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,170 @@
+"""
+Microbenchmarks of discovery and validation in :mod:`uv_workon.core`.
+
+Runs against synthetic ``WORKON_HOME`` trees (see :func:`tools._bench.make_tree`)
+mixing valid, dangling and non-venv links. For example::
+
+    python -m tools.bench_core --sizes 10 1000 10000 100000
+    python -m tools.bench_core --compare .benchmarks/core-abc1234.json
+
+Pass ``--latency`` (and ``--jitter``) to run under simulated network filesystem
+latency (see :mod:`tools.fs_latency`).
+"""
+# ruff:file-ignore[print]
+
+from __future__ import annotations
+
+import sys
+from argparse import ArgumentParser
+from contextlib import nullcontext
+from functools import partial
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING, Any
+
+from tools._bench import (
+    BENCHMARK_DIR,
+    SyntheticTree,
+    add_common_arguments,
+    finish,
+    make_tree,
+    measure,
+)
+from tools.fs_latency import simulated_latency
+from uv_workon.core import (
+    VirtualEnvPathAndLink,
+    get_invalid_symlinks,
+    get_virtualenv_paths,
+    get_virtualenv_targets,
+)
+from uv_workon.validate import infer_virtualenv_name, infer_virtualenv_path
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+VENV_PATTERNS = [".venv", "venv"]
+
+
+def _bench_get_virtualenv_paths(tree: SyntheticTree, jobs: int | None) -> None:  # ruff: ignore[unused-function-argument]
+    _ = list(get_virtualenv_paths(tree.workon_home))
+
+
+def _bench_get_invalid_symlinks(tree: SyntheticTree, jobs: int | None) -> None:
+    _ = list(get_invalid_symlinks(tree.workon_home, jobs=jobs))
+
+
+def _bench_get_virtualenv_targets(tree: SyntheticTree, jobs: int | None) -> None:
+    _ = list(get_virtualenv_targets(tree.workon_home, jobs=jobs))
+
+
+def _bench_infer_virtualenv_path(tree: SyntheticTree, jobs: int | None) -> None:  # ruff: ignore[unused-function-argument]
+    for project in tree.projects:
+        _ = infer_virtualenv_path(project, VENV_PATTERNS)
+
+
+def _bench_infer_virtualenv_name(tree: SyntheticTree, jobs: int | None) -> None:  # ruff: ignore[unused-function-argument]
+    for venv in tree.venvs:
+        _ = infer_virtualenv_name(venv, VENV_PATTERNS)
+
+
+def _bench_from_paths_and_workon(tree: SyntheticTree, jobs: int | None) -> None:  # ruff: ignore[unused-function-argument]
+    with TemporaryDirectory() as workon_home:
+        _ = list(
+            VirtualEnvPathAndLink.from_paths_and_workon(
+                tree.projects, workon_home=workon_home, venv_patterns=VENV_PATTERNS
+            )
+        )
+
+
+BENCHMARKS: dict[str, Callable[[SyntheticTree, int | None], None]] = {
+    "get_virtualenv_paths": _bench_get_virtualenv_paths,
+    "get_invalid_symlinks": _bench_get_invalid_symlinks,
+    "get_virtualenv_targets": _bench_get_virtualenv_targets,
+    "infer_virtualenv_path": _bench_infer_virtualenv_path,
+    "infer_virtualenv_name": _bench_infer_virtualenv_name,
+    "from_paths_and_workon": _bench_from_paths_and_workon,
+}
+
+
+def _get_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Benchmark uv_workon discovery.")
+    _ = parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 1_000, 10_000, 100_000],
+        help="Number of entries in synthetic trees.",
+    )
+    _ = parser.add_argument(
+        "--tree-dir",
+        type=Path,
+        default=BENCHMARK_DIR / "trees",
+        help="Where to create (and reuse) synthetic trees.",
+    )
+    _ = parser.add_argument(
+        "-k",
+        "--select",
+        action="append",
+        choices=list(BENCHMARKS),
+        help="Benchmarks to run (can be repeated). Default is all.",
+    )
+    _ = parser.add_argument(
+        "-j", "--jobs", type=int, default=None, help="Worker threads."
+    )
+    _ = parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Simulated per call filesystem latency (ms).",
+    )
+    _ = parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.0,
+        help="Simulated per call filesystem jitter (ms).",
+    )
+    return add_common_arguments(parser)
+
+
+def main(args: Sequence[str] | None = None) -> int:
+    """Main script"""
+    options = _get_parser().parse_args(args)
+
+    results: list[dict[str, Any]] = []
+    for size in options.sizes:
+        print(f"Creating tree of size {size}", file=sys.stderr)
+        tree = make_tree(options.tree_dir, size)
+        latency = (
+            partial(
+                simulated_latency,
+                latency=options.latency / 1000,
+                jitter=options.jitter / 1000,
+                roots=[tree.root],
+                seed=0,
+            )
+            if options.latency or options.jitter
+            else nullcontext
+        )
+        for name in options.select or BENCHMARKS:
+            with latency():
+                stats = measure(
+                    partial(BENCHMARKS[name], tree, options.jobs),
+                    repeat=options.repeat,
+                )
+            results.append({
+                "name": name,
+                "params": {
+                    "size": size,
+                    "jobs": options.jobs,
+                    "latency_ms": options.latency,
+                    "jitter_ms": options.jitter,
+                },
+                "stats": stats,
+            })
+
+    _ = finish("core", results, options.output, options.compare, options.no_save)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
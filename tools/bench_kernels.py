@@ -0,0 +1,175 @@
+"""
+Benchmarks of kernelspec handling in :mod:`uv_workon.kernels`.
+
+Runs offline against a synthetic jupyter data directory (``JUPYTER_DATA_DIR``)
+with many kernelspecs, a fraction of which are broken (the kernel executable
+does not exist). Neither ``ipykernel`` nor network access is needed. For
+example::
+
+    python -m tools.bench_kernels --sizes 100 1000 5000
+
+Kernelspecs installed outside the synthetic directory (e.g., in
+``sys.prefix``) are also found by jupyter, but are left untouched.
+"""
+# ruff:file-ignore[print]
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import shutil
+import sys
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from functools import partial
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING, Any
+
+from tools._bench import add_common_arguments, finish, make_tree, measure
+from uv_workon.kernels import (
+    get_broken_kernelspecs,
+    get_kernelspecs,
+    iter_kernelspecs,
+    remove_kernelspecs,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+KERNEL_PREFIX = "bench_kernel_"
+
+
+def make_kernelspecs(
+    data_dir: Path, size: int, broken: float = 0.2, seed: int = 0
+) -> list[str]:
+    """
+    Write ``size`` kernelspecs to ``data_dir / "kernels"``.
+
+    Returns names of broken kernelspecs.
+    """
+    rng = random.Random(seed)  # ruff: ignore[suspicious-non-cryptographic-random-usage]
+    kernels = data_dir / "kernels"
+    shutil.rmtree(kernels, ignore_errors=True)
+    broken_names: list[str] = []
+    for i in range(size):
+        name = f"{KERNEL_PREFIX}{i:06d}"
+        if is_broken := rng.random() < broken:
+            broken_names.append(name)
+        exe = (
+            str(data_dir / "missing" / name / "bin" / "python")
+            if is_broken
+            else sys.executable
+        )
+        (d := kernels / name).mkdir(parents=True)
+        _ = (d / "kernel.json").write_text(
+            json.dumps({
+                "argv": [exe, "-m", "ipykernel_launcher", "-f", "{connection_file}"],
+                "display_name": f"Python [venv: {name}]",
+                "language": "python",
+                "env": {},
+                "metadata": {"debugger": True},
+            })
+        )
+    return broken_names
+
+
+def _uncached(func: Callable[[], Any]) -> Callable[[], Any]:
+    def wrapper() -> Any:
+        get_kernelspecs.cache_clear()
+        return func()
+
+    return wrapper
+
+
+def _remove(names: list[str]) -> None:
+    with redirect_stdout(StringIO()):
+        remove_kernelspecs(names)
+
+
+def _install_dry_run(workon_home: Path) -> None:
+    from typer.testing import CliRunner
+
+    from uv_workon.cli import app_typer
+
+    result = CliRunner().invoke(
+        app_typer,
+        [
+            "kernels",
+            "install",
+            "--all",
+            "--dry-run",
+            "--yes",
+            "--workon-home",
+            str(workon_home),
+        ],
+    )
+    if result.exit_code != 0:
+        msg = f"kernels install failed:\n{result.output}"
+        raise RuntimeError(msg)
+
+
+def _get_parser() -> ArgumentParser:
+    parser = ArgumentParser(description="Benchmark uv_workon kernel handling.")
+    _ = parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 1_000],
+        help="Number of kernelspecs (and virtual environments for install).",
+    )
+    _ = parser.add_argument(
+        "--broken", type=float, default=0.2, help="Fraction of broken kernelspecs."
+    )
+    return add_common_arguments(parser)
+
+
+def main(args: Sequence[str] | None = None) -> int:
+    """Main script"""
+    options = _get_parser().parse_args(args)
+
+    results: list[dict[str, Any]] = []
+    with TemporaryDirectory() as tmp:
+        data_dir = Path(tmp) / "jupyter"
+        os.environ.update({
+            "JUPYTER_DATA_DIR": str(data_dir),
+            "JUPYTER_PATH": str(data_dir),
+            "JUPYTER_PREFER_ENV_PATH": "0",
+        })
+
+        for size in options.sizes:
+            print(f"Creating {size} kernelspecs", file=sys.stderr)
+            broken = make_kernelspecs(data_dir, size, options.broken)
+            tree = make_tree(Path(tmp) / "trees", size, valid=1.0, dangling=0.0)
+
+            benchmarks: dict[
+                str, tuple[Callable[[], Any], Callable[[], Any] | None]
+            ] = {
+                "get_kernelspecs": (_uncached(get_kernelspecs), None),
+                "iter_kernelspecs": (lambda: list(iter_kernelspecs()), None),
+                "get_broken_kernelspecs": (_uncached(get_broken_kernelspecs), None),
+                "remove_kernelspecs": (
+                    partial(_remove, broken),
+                    partial(make_kernelspecs, data_dir, size, options.broken),
+                ),
+                "install_dry_run": (
+                    _uncached(partial(_install_dry_run, tree.workon_home)),
+                    None,
+                ),
+            }
+            for name, (func, setup) in benchmarks.items():
+                stats = measure(func, repeat=options.repeat, setup=setup)
+                results.append({
+                    "name": name,
+                    "params": {"size": size, "broken": options.broken},
+                    "stats": stats,
+                })
+
+    _ = finish("kernels", results, options.output, options.compare, options.no_save)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,211 @@
+"""
+Simulate network filesystem latency for benchmarks.
+
+Routes the filesystem primitives used by :mod:`uv_workon.validate`,
+:mod:`uv_workon.core` and :mod:`uv_workon.kernels` (see
+:data:`uv_workon.fsops.FS_OPERATIONS`) through a hook which adds per-call
+latency, jitter, and occasional hangs. Only calls on paths under ``--root``
+are delayed, so imports and the interpreter itself run at full speed.
+
+For example, to time ``list`` against a tree under ``/tmp/bench`` with 5 ms
+per call, up to 2 ms jitter, and 1 % of calls hanging for 2 s::
+
+    python -m tools.fs_latency --root /tmp/bench --latency 5 --jitter 2 \
+        --hang-probability 0.01 --hang 2000 -- \
+        list --workon-home /tmp/bench/workon_home --probe-timeout 0.5
+
+Use from benchmarks with :func:`simulated_latency`.
+"""
+# ruff:file-ignore[print]
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+import threading
+import time
+from argparse import ArgumentParser
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+import attrs
+
+from uv_workon.fsops import FS_OPERATIONS, count_fs_operations, patch_fs_operations
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Iterable, Sequence
+
+
+def _abspaths(paths: Iterable[str]) -> tuple[str, ...]:
+    return tuple(os.path.abspath(path) for path in paths)  # ruff: ignore[os-path-abspath]
+
+
+@attrs.define
+class LatencyHook:
+    """
+    Filesystem hook adding latency to calls (see :func:`uv_workon.fsops.patch_fs_operations`).
+
+    Parameters
+    ----------
+    latency : float
+        Fixed delay per call in seconds.
+    jitter : float
+        Maximum additional uniformly distributed delay per call in seconds.
+    hang_probability : float
+        Probability that a call hangs.
+    hang : float
+        Duration of a hang in seconds.
+    roots : tuple of str
+        Only delay calls on paths under these roots. If empty, delay all calls.
+    categories : frozenset of str
+        Operation categories to delay.
+    seed : int, optional
+        Seed for reproducible jitter and hangs.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    hang_probability: float = 0.0
+    hang: float = 0.0
+    roots: tuple[str, ...] = attrs.field(
+        default=(),
+        converter=_abspaths,
+    )
+    categories: frozenset[str] = attrs.field(
+        default=frozenset(FS_OPERATIONS), converter=frozenset
+    )
+    seed: int | None = None
+    hangs: int = attrs.field(init=False, default=0)
+    _random: random.Random = attrs.field(init=False)
+    _lock: threading.Lock = attrs.field(init=False, factory=threading.Lock)
+
+    @_random.default  # pyright: ignore[reportUntypedFunctionDecorator, reportAttributeAccessIssue, reportUnknownMemberType]
+    def _random_default(self) -> random.Random:
+        return random.Random(self.seed)  # ruff: ignore[suspicious-non-cryptographic-random-usage]
+
+    def _applies(self, category: str, args: tuple[Any, ...]) -> bool:
+        if category not in self.categories:
+            return False
+        if not self.roots:
+            return True
+        if not args or not isinstance(args[0], (str, os.PathLike)):
+            # e.g., scandir on a file descriptor
+            return False
+        # NOTE: pure string operations. Path.resolve would recurse into patched os functions.
+        path = os.path.abspath(os.fspath(args[0]))  # ruff: ignore[os-path-abspath] # pyright: ignore[reportUnknownArgumentType]
+        return any(
+            path == root or path.startswith(root + os.sep) for root in self.roots
+        )
+
+    def delay(self) -> float:
+        """Draw the delay for a single call."""
+        with self._lock:
+            delay = self.latency + self._random.uniform(0.0, self.jitter)
+            if self.hang_probability and self._random.random() < self.hang_probability:
+                self.hangs += 1
+                delay += self.hang
+        return delay
+
+    def __call__(
+        self,
+        category: str,
+        func: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> Any:
+        """Call ``func(*args, **kwargs)`` after a delay, if applicable."""
+        if self._applies(category, args) and (delay := self.delay()) > 0:
+            time.sleep(delay)
+        return func(*args, **kwargs)
+
+
+@contextmanager
+def simulated_latency(**kwargs: Any) -> Generator[LatencyHook]:
+    """
+    Apply a :class:`LatencyHook` while active.
+
+    Keyword arguments are passed to :class:`LatencyHook`.
+    """  # ruff: ignore[docstring-missing-yields]
+    hook = LatencyHook(**kwargs)
+    with patch_fs_operations(hook):
+        yield hook
+
+
+def _get_parser() -> ArgumentParser:
+    parser = ArgumentParser(
+        description="Run uv-workon command under simulated filesystem latency."
+    )
+    _ = parser.add_argument(
+        "--latency", type=float, default=5.0, help="Per call latency (ms)."
+    )
+    _ = parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Maximum per call jitter (ms)."
+    )
+    _ = parser.add_argument(
+        "--hang-probability",
+        type=float,
+        default=0.0,
+        help="Probability that a call hangs.",
+    )
+    _ = parser.add_argument(
+        "--hang", type=float, default=5000.0, help="Duration of hangs (ms)."
+    )
+    _ = parser.add_argument(
+        "--root",
+        dest="roots",
+        action="append",
+        default=[],
+        help="Only delay calls under this path (can be repeated).",
+    )
+    _ = parser.add_argument(
+        "--category",
+        dest="categories",
+        action="append",
+        choices=list(FS_OPERATIONS),
+        help="Only delay these operations (can be repeated). Default is all.",
+    )
+    _ = parser.add_argument("--seed", type=int, default=None)
+    _ = parser.add_argument(
+        "command", nargs="+", help="Arguments to ``uv-workon`` (after ``--``)."
+    )
+    return parser
+
+
+def main(args: Sequence[str] | None = None) -> int:
+    """Main script"""
+    from uv_workon.cli import app_typer
+
+    options = _get_parser().parse_args(args)
+
+    with (
+        count_fs_operations() as counts,
+        simulated_latency(
+            latency=options.latency / 1000,
+            jitter=options.jitter / 1000,
+            hang_probability=options.hang_probability,
+            hang=options.hang / 1000,
+            roots=options.roots,
+            categories=options.categories or FS_OPERATIONS,
+            seed=options.seed,
+        ) as hook,
+    ):
+        start = time.perf_counter()
+        try:
+            app_typer(args=options.command, prog_name="uv-workon")
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else int(e.code is not None)
+        else:  # pragma: no cover
+            code = 0
+        elapsed = time.perf_counter() - start
+
+    print(
+        f"[fs_latency] {' '.join(options.command)}: {elapsed * 1000:.1f} ms, "
+        f"{hook.hangs} hang(s), operations {dict(sorted(counts.items()))}",
+        file=sys.stderr,
+    )
+    return code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())